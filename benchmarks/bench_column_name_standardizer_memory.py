@@ -0,0 +1,60 @@
+"""
+Measures the peak resident memory of column_name_standardizer with copy=True and copy=False.
+
+Each mode runs in a fresh interpreter so that its peak RSS is not hidden by an earlier run.
+Run from the repository root:
+
+    python benchmarks/bench_column_name_standardizer_memory.py --rows 2000000 --cols 50
+"""
+import argparse
+import resource
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+
+from wrangle_in_py.column_name_standardizer import column_name_standardizer
+
+
+def peak_rss_mb():
+    """Returns the peak resident set size of this process in megabytes (ru_maxrss is in kilobytes on Linux)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_child(n_rows, n_cols, copy):
+    """Builds the frame, standardizes its headers once and prints the peak RSS before and after."""
+    # copy=False wraps the array instead of copying it, so the peak before the call is about one copy of the data
+    df = pd.DataFrame(np.ones((n_rows, n_cols)), columns=[f"Sensor Reading {i}" for i in range(n_cols)], copy=False)
+    before = peak_rss_mb()
+    result = column_name_standardizer(df, copy=copy)
+    after = peak_rss_mb()
+    assert result.columns[0] == "sensor_reading_0"
+    print(f"{before:.1f} {after:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--cols", type=int, default=50)
+    parser.add_argument("--child", choices=["copy", "no-copy"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.rows, args.cols, copy=args.child == "copy")
+        return
+
+    data_mb = args.rows * args.cols * 8 / 1024 ** 2
+    print(f"data size: {data_mb:.1f} MB")
+    print(f"{'mode':>8} {'peak RSS before (MB)':>21} {'peak RSS after (MB)':>20} {'growth (MB)':>12}")
+    for mode in ["copy", "no-copy"]:
+        output = subprocess.run(
+            [sys.executable, __file__, "--rows", str(args.rows), "--cols", str(args.cols), "--child", mode],
+            check=True, capture_output=True, text=True,
+        ).stdout.split()
+        before, after = float(output[0]), float(output[1])
+        print(f"{mode:>8} {before:>21.1f} {after:>20.1f} {after - before:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Measures the peak resident memory of the standardize, drop, deduplicate and extract chain, eagerly and as a Pipeline.
+
+Each mode runs in a fresh interpreter so that its peak RSS is not hidden by an earlier run.
+Run from the repository root:
+
+    python benchmarks/bench_pipeline_memory.py --rows 2000000 --cols 20
+"""
+import argparse
+import contextlib
+import io
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from wrangle_in_py.column_drop_threshold import column_drop_threshold
+from wrangle_in_py.column_name_standardizer import column_name_standardizer
+from wrangle_in_py.extracting_ymd_hms import extracting_ymd
+from wrangle_in_py.pipeline import Pipeline
+from wrangle_in_py.remove_duplicates import remove_duplicates
+
+
+def peak_rss_mb():
+    """Returns the peak resident set size of this process in megabytes (ru_maxrss is in kilobytes on Linux)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def make_frame(n_rows, n_cols):
+    """Float sensor columns (a third of them mostly missing), a timestamp column and about 10% duplicate rows."""
+    rng = np.random.default_rng(0)
+    values = rng.random((n_rows, n_cols))
+    values[rng.random((n_rows, n_cols)) < np.where(np.arange(n_cols) % 3 == 0, 0.9, 0.01)] = np.nan
+    values[1::10] = values[::10][:len(values[1::10])]
+    df = pd.DataFrame(values, columns=[f"Sensor Reading {i}" for i in range(n_cols)], copy=False)
+    df["Time Stamp"] = pd.to_datetime(rng.integers(1.6e18, 1.7e18, n_rows))
+    df.loc[1::10, "Time Stamp"] = df["Time Stamp"].to_numpy()[::10][:len(df) // 10]
+    return df
+
+
+def run_child(n_rows, n_cols, mode):
+    """Builds the frame, runs the chain once and prints the peak RSS before and after, and the run time."""
+    df = make_frame(n_rows, n_cols)
+    before = peak_rss_mb()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if mode == "eager":
+            result = extracting_ymd(remove_duplicates(column_drop_threshold(column_name_standardizer(df), 0.5)),
+                                    "time_stamp")
+        else:
+            result = (Pipeline(df).column_name_standardizer().column_drop_threshold(0.5)
+                      .remove_duplicates().extracting_ymd("time_stamp").collect())
+    seconds = time.perf_counter() - start
+    after = peak_rss_mb()
+    assert "time_stamp_year" in result.columns
+    print(f"{before:.1f} {after:.1f} {seconds:.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--cols", type=int, default=20)
+    parser.add_argument("--child", choices=["eager", "pipeline"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.rows, args.cols, args.child)
+        return
+
+    data_mb = args.rows * (args.cols + 1) * 8 / 1024 ** 2
+    print(f"data size: {data_mb:.1f} MB")
+    print(f"{'mode':>8} {'peak RSS before (MB)':>21} {'peak RSS after (MB)':>20} {'growth (MB)':>12} {'time (s)':>9}")
+    for mode in ["eager", "pipeline"]:
+        output = subprocess.run(
+            [sys.executable, __file__, "--rows", str(args.rows), "--cols", str(args.cols), "--child", mode],
+            check=True, capture_output=True, text=True,
+        ).stdout.split()
+        before, after, seconds = float(output[0]), float(output[1]), float(output[2])
+        print(f"{mode:>8} {before:>21.1f} {after:>20.1f} {after - before:>12.1f} {seconds:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
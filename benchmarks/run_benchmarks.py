@@ -0,0 +1,347 @@
+"""
+Runs every public function of wrangle_in_py on synthetic frames and records wall time and peak memory,
+then compares the results with the committed baseline. It exits with status 1 if the peak memory of any case
+regressed, and only warns about slower cases, since wall times vary too much between runs to fail on.
+
+Each axis (row count, column count, null density, duplicate ratio and dtype mix) is swept on its own
+around a base frame, so the number of cases grows with the sum of the axis lengths rather than their product.
+Wall time is the median of several repeats, divided by the time of a fixed NumPy calibration workload
+so that baselines recorded on one machine can be compared on another. Peak memory is the tracemalloc peak
+of one extra run, which covers the NumPy and pandas buffers the function allocates (pyarrow's own allocator
+is not traced).
+
+The baseline records the pandas and NumPy versions it was measured with, since their dtypes and allocators
+decide how much memory is traced: pandas 3 stores strings in pyarrow, which tracemalloc does not see,
+while pandas 2 stores them in object arrays, which it does. The comparison fails straight away when
+the versions differ; record the baseline again in the environment that runs the check (the locked CI one).
+
+Run from the repository root:
+
+    python benchmarks/run_benchmarks.py                     # quick preset, compared with benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --save-baseline     # record a new baseline
+    python benchmarks/run_benchmarks.py --preset full --filter remove_duplicates
+    python benchmarks/run_benchmarks.py --preset full --max-cells 2e8  # skip the frames that would not fit in memory
+
+The full preset sweeps up to 100 million rows and 10,000 columns, which needs tens of GB of memory.
+Frames skipped by --max-cells are listed at the end of the output.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from wrangle_in_py.column_drop_threshold import column_drop_threshold, column_drop_threshold_chunked, column_statistics
+from wrangle_in_py.column_name_standardizer import (
+    column_name_standardizer, resulting_duplicates, standardize_strings, string_standardizer
+)
+from wrangle_in_py.downcast import downcast_dtypes
+from wrangle_in_py.extracting_ymd_hms import extract_datetime_parts, extracting_hms, extracting_ymd
+from wrangle_in_py.hashing import BloomFilter, UInt64HashTable, hash_rows
+from wrangle_in_py.pipeline import Pipeline
+from wrangle_in_py.remove_duplicates import remove_duplicates, remove_duplicates_chunked
+from wrangle_in_py.value_standardizer import value_standardizer
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# The base frame of each preset, and the values each axis is swept over (one axis at a time)
+PRESETS = {
+    "quick": {
+        "base": {"rows": 10_000, "cols": 10, "nulls": 0.05, "duplicates": 0.1, "dtypes": "mixed"},
+        "axes": {
+            "rows": [1_000, 10_000, 100_000],
+            "cols": [10, 100, 1_000],
+            "nulls": [0.0, 0.05, 0.5],
+            "duplicates": [0.0, 0.1, 0.5],
+            "dtypes": ["numeric", "mixed", "strings"],
+        },
+    },
+    "full": {
+        "base": {"rows": 1_000_000, "cols": 10, "nulls": 0.05, "duplicates": 0.1, "dtypes": "mixed"},
+        "axes": {
+            "rows": [1_000, 100_000, 10_000_000, 100_000_000],
+            "cols": [10, 100, 1_000, 10_000],
+            "nulls": [0.0, 0.05, 0.2, 0.5],
+            "duplicates": [0.0, 0.1, 0.5, 0.9],
+            "dtypes": ["numeric", "mixed", "strings"],
+        },
+    },
+}
+
+# The column types of each dtype mix, cycled across the columns
+DTYPE_MIXES = {
+    "numeric": ["float", "int"],
+    "mixed": ["datetime", "float", "int", "string", "category"],
+    "strings": ["datetime", "string", "category"],
+}
+
+_WORDS = np.array(["Jack Fruit", "PINEAPPLE", "jack-fruit", "Dragon (Fruit)", "kiwi", "Kiwi!", "mango", "MANGO"])
+
+
+def make_frame(rows, cols, nulls, duplicates, dtypes, seed=0):
+    """
+    Builds a frame of rows x cols with the column types of the dtypes mix, a null_density share of missing values
+    in every column, and a duplicates share of rows that repeat an earlier row.
+    """
+    rng = np.random.default_rng(seed)
+    n_unique = max(int(rows * (1 - duplicates)), 1)
+    # Every row is a copy of one of the first n_unique rows, so about the duplicates share of rows repeat one
+    source = np.concatenate([np.arange(n_unique), rng.integers(0, n_unique, rows - n_unique)])
+    kinds = DTYPE_MIXES[dtypes]
+
+    data = {}
+    for i in range(cols):
+        kind = kinds[i % len(kinds)]
+        missing = rng.random(n_unique) < nulls
+        if kind == "float":
+            values = rng.normal(100, 15, n_unique)
+            values[missing] = np.nan
+        elif kind == "int":
+            values = pd.array(rng.integers(0, 1_000, n_unique), dtype="Int64")
+            values[missing] = pd.NA
+        elif kind == "datetime":
+            values = rng.integers(1.5e18, 1.7e18, n_unique).astype("datetime64[ns]")
+            values[missing] = np.datetime64("NaT")
+        else:
+            values = _WORDS[rng.integers(0, len(_WORDS), n_unique)].astype(object)
+            values[missing] = None
+            if kind == "category":
+                values = pd.Categorical(values)
+        data[f"{kind.title()} Column {i}"] = pd.Series(values).take(source).reset_index(drop=True)
+    return pd.DataFrame(data)
+
+
+def _first_column(df, kind):
+    """Returns the name of the first column of a kind in a frame from make_frame, or None."""
+    return next((col for col in df.columns if col.startswith(f"{kind.title()} Column")), None)
+
+
+def _chunks(df, n=10):
+    """Splits df into n row chunks."""
+    bounds = np.linspace(0, len(df), n + 1).astype(int)
+    return [df.iloc[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+
+
+def _hashes(df):
+    return hash_rows(df)
+
+
+def _add_to_table(hashes):
+    UInt64HashTable().add(hashes)
+
+
+def _add_to_bloom_filter(hashes):
+    BloomFilter(capacity=max(len(hashes), 1)).add(hashes)
+
+
+def _pipeline(df, timestamp):
+    (Pipeline(df).column_name_standardizer().column_drop_threshold(0.9)
+     .remove_duplicates().extracting_ymd(string_standardizer(timestamp)).collect())
+
+
+# Each case turns a frame into the arguments of the call to time, or None if the frame does not suit it
+CASES = {
+    "column_name_standardizer": (column_name_standardizer, lambda df: (df,)),
+    "column_name_standardizer_no_copy": (lambda df: column_name_standardizer(df, copy=False), lambda df: (df,)),
+    "string_standardizer": (lambda names: [string_standardizer(name) for name in names], lambda df: (list(df.columns),)),
+    "standardize_strings": (standardize_strings,
+                            lambda df: (df[col],) if (col := _first_column(df, "string")) else None),
+    "resulting_duplicates": (resulting_duplicates,
+                             lambda df: (list(df.columns), standardize_strings(list(df.columns)))),
+    "value_standardizer": (value_standardizer, lambda df: (df,)),
+    "extracting_ymd": (extracting_ymd, lambda df: (df, col) if (col := _first_column(df, "datetime")) else None),
+    "extracting_hms": (extracting_hms, lambda df: (df, col) if (col := _first_column(df, "datetime")) else None),
+    "extract_datetime_parts": (extract_datetime_parts,
+                               lambda df: (df, col) if (col := _first_column(df, "datetime")) else None),
+    "remove_duplicates": (remove_duplicates, lambda df: (df,)),
+    "remove_duplicates_n_jobs": (lambda df: remove_duplicates(df, n_jobs=-1), lambda df: (df,)),
+    "remove_duplicates_approximate": (lambda df: remove_duplicates(df, mode="approximate"), lambda df: (df,)),
+    "remove_duplicates_chunked": (lambda chunks: list(remove_duplicates_chunked(chunks)), lambda df: (_chunks(df),)),
+    "column_drop_threshold": (lambda df: column_drop_threshold(df, 0.5, 0.1), lambda df: (df,)),
+    "column_drop_threshold_n_jobs": (lambda df: column_drop_threshold(df, 0.5, 0.1, n_jobs=-1), lambda df: (df,)),
+    "column_drop_threshold_chunked": (lambda chunks: column_drop_threshold_chunked(chunks, 0.5, 0.1),
+                                      lambda df: (_chunks(df),)),
+    "column_statistics": (column_statistics, lambda df: (df,)),
+    "downcast_dtypes": (downcast_dtypes, lambda df: (df,)),
+    "hash_rows": (hash_rows, lambda df: (df,)),
+    "UInt64HashTable.add": (_add_to_table, lambda df: (_hashes(df),)),
+    "BloomFilter.add": (_add_to_bloom_filter, lambda df: (_hashes(df),)),
+    "Pipeline": (_pipeline, lambda df: (df, col) if (col := _first_column(df, "datetime")) else None),
+}
+
+
+def calibrate(repeats=5):
+    """Returns the fastest time of a fixed NumPy workload, the unit benchmark times are expressed in."""
+    values = np.random.default_rng(0).random(1_000_000)
+    return min(_time_once(np.sort, (values,)) for _ in range(repeats))
+
+
+def _time_once(function, args):
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def measure(function, args, repeats):
+    """Returns the median wall time in seconds over repeats runs, and the peak traced memory in MB of one more run."""
+    seconds = float(np.median([_time_once(function, args) for _ in range(repeats)]))
+    tracemalloc.start()
+    try:
+        function(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return seconds, peak / 1024 ** 2
+
+
+def sweep_points(preset):
+    """Yields each distinct frame parameter set of the preset: the base frame, and each axis value around it."""
+    seen = set()
+    for axis, values in preset["axes"].items():
+        for value in values:
+            point = dict(preset["base"], **{axis: value})
+            key = tuple(sorted(point.items()))
+            if key not in seen:
+                seen.add(key)
+                yield point
+
+
+def case_id(name, point):
+    return (f"{name}[rows={point['rows']},cols={point['cols']},nulls={point['nulls']},"
+            f"duplicates={point['duplicates']},dtypes={point['dtypes']}]")
+
+
+def run(preset, filter_text=None, repeats=5, max_cells=None):
+    """
+    Runs every case of the preset and returns a dict of results by case id,
+    and the list of frame parameters skipped for having more than max_cells cells.
+    """
+    results = {}
+    skipped = []
+    for point in sweep_points(PRESETS[preset]):
+        if max_cells is not None and point["rows"] * point["cols"] > max_cells:
+            print(f"skipping {point}: more than --max-cells cells", file=sys.stderr)
+            skipped.append(point)
+            continue
+        names = [name for name in CASES if not filter_text or filter_text in name]
+        if not names:
+            continue
+        df = make_frame(**point)
+        for name in names:
+            function, setup = CASES[name]
+            args = setup(df)
+            if args is None:
+                continue
+            # The functions print dropped row counts and warn about duplicate names, neither is of interest here
+            with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                seconds, peak_mb = measure(function, args, repeats)
+            results[case_id(name, point)] = {"seconds": seconds, "peak_mb": peak_mb}
+            print(f"{case_id(name, point):<110} {seconds * 1000:>10.2f} ms {peak_mb:>10.2f} MB", file=sys.stderr)
+    return results, skipped
+
+
+def versions():
+    """Returns the versions of the libraries that decide the measured peak memory."""
+    return {"numpy": np.__version__, "pandas": pd.__version__}
+
+
+def compare(results, calibration, baseline, time_tolerance, memory_tolerance):
+    """
+    Returns the descriptions of the cases whose peak memory regressed against baseline, more than memory_tolerance
+    higher (plus 1 MB of slack), and of the cases whose calibrated time is more than time_tolerance slower.
+    Cases that take under a millisecond are too noisy for their time to be compared.
+    """
+    regressions = []
+    slowdowns = []
+    for case, result in results.items():
+        if case not in baseline["results"]:
+            continue
+        expected = baseline["results"][case]
+        time_ratio = (result["seconds"] / calibration) / (expected["seconds"] / baseline["calibration"])
+        if expected["seconds"] > 1e-3 and time_ratio > 1 + time_tolerance:
+            slowdowns.append(f"{case}: {time_ratio:.2f}x the baseline time")
+        if result["peak_mb"] > expected["peak_mb"] * (1 + memory_tolerance) + 1:
+            regressions.append(f"{case}: {result['peak_mb']:.1f} MB peak memory, baseline {expected['peak_mb']:.1f} MB")
+    return regressions, slowdowns
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--preset", choices=list(PRESETS), default="quick")
+    parser.add_argument("--filter", help="only run the functions whose case name contains this text")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--max-cells", type=float,
+                        help="skip frames with more rows x columns than this, to stay within memory (default: no limit)")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="write the results to the baseline file")
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    parser.add_argument("--time-tolerance", type=float, default=2.0,
+                        help="relative slowdown before a case is reported as slower (2.0 = three times as slow)")
+    parser.add_argument("--fail-on-time", action="store_true",
+                        help="also exit with status 1 if a case is slower, on a machine quiet enough to trust timings")
+    parser.add_argument("--memory-tolerance", type=float, default=0.25,
+                        help="allowed relative increase of peak memory before a case counts as regressed")
+    args = parser.parse_args()
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+    if not args.save_baseline and baseline is not None and baseline.get("versions") != versions():
+        recorded = ", ".join(f"{name} {version}" for name, version in sorted(baseline.get("versions", {}).items()))
+        running = ", ".join(f"{name} {version}" for name, version in sorted(versions().items()))
+        print(f"the baseline was recorded with {recorded or 'unknown versions'}, but this is {running}: "
+              f"peak memory cannot be compared, run with --save-baseline in this environment to record a new one")
+        sys.exit(1)
+
+    calibration = calibrate()
+    results, skipped = run(args.preset, args.filter, args.repeats, args.max_cells)
+    if skipped:
+        print(f"skipped {len(skipped)} frames with more than --max-cells={args.max_cells:g} cells:")
+        print("\n".join(f"  {point}" for point in skipped))
+    report = {"preset": args.preset, "calibration": calibration, "results": results}
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=1, sort_keys=True)
+
+    if args.save_baseline:
+        if baseline is None or baseline.get("versions") != versions():
+            baseline = {"results": {}}
+        # Cases that were not run keep their baseline, rescaled to this machine's calibration
+        scale = calibration / baseline.get("calibration", calibration)
+        merged = {case: dict(result, seconds=result["seconds"] * scale) for case, result in baseline["results"].items()}
+        merged.update(results)
+        with open(args.baseline, "w") as file:
+            json.dump({"calibration": calibration, "results": merged, "versions": versions()},
+                      file, indent=1, sort_keys=True)
+        print(f"saved {len(results)} results to {args.baseline}")
+        return
+
+    if baseline is None:
+        print(f"no baseline at {args.baseline}, run with --save-baseline to record one")
+        return
+    regressions, slowdowns = compare(results, calibration, baseline, args.time_tolerance, args.memory_tolerance)
+    compared = sum(case in baseline["results"] for case in results)
+    if slowdowns:
+        print(f"warning: {len(slowdowns)} cases slower than the baseline:")
+        print("\n".join(f"  {slowdown}" for slowdown in slowdowns))
+        if args.fail_on_time:
+            regressions += slowdowns
+    if regressions:
+        print(f"{len(regressions)} regressions in {compared} cases compared with the baseline:")
+        print("\n".join(f"  {regression}" for regression in regressions))
+        sys.exit(1)
+    print(f"no regressions in {compared} cases compared with the baseline")
+
+
+if __name__ == "__main__":
+    main()
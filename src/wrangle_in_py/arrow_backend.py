@@ -0,0 +1,235 @@
+import warnings
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from wrangle_in_py.column_name_standardizer import resulting_duplicates, standardize_strings
+
+# The row number column added while deduplicating, named so it cannot clash with a real column
+_ROW_NUMBER = '__wrangle_in_py_row_number__'
+
+# The view types handled as their large types, since the group-by and take kernels do not all accept them
+_VIEW_TYPES = {'string_view': pa.large_string(), 'binary_view': pa.large_binary()}
+
+
+def column_names(table):
+    """Returns the column names of table."""
+    return table.column_names
+
+
+def column_name_standardizer(table):
+    """
+    Returns the pyarrow Table with standardized column names, as column_name_standardizer does for pandas.
+    Only the schema is rebuilt, the column data is shared with table.
+
+    Parameters
+    ----------
+    table : pyarrow.Table
+        The input table whose column names need standardization.
+
+    Warnings
+    --------
+    UserWarning :
+        If any of the standardized column names are the same.
+
+    Returns
+    -------
+    pyarrow.Table :
+        A table with standardized column names.
+    """
+    original_columns = table.column_names
+    standardized_columns = standardize_strings(original_columns)
+
+    duplicates = resulting_duplicates(original_columns, standardized_columns)
+    if bool(duplicates):
+        warnings.warn(f"Duplicate column names found after standardization: {duplicates}")
+
+    return table.rename_columns(standardized_columns)
+
+
+def column_drop_threshold(table, threshold, variance=None):
+    """
+    Returns the pyarrow Table without the columns whose missingness is above threshold
+    or whose coefficient of variance is below variance, as column_drop_threshold does for pandas.
+
+    Null counts are read from the Arrow metadata, floating point NaN values also count as missing
+    (as they do in pandas), and the mean and population standard deviation of numeric columns
+    come from Arrow compute kernels. The kept columns are shared with table.
+
+    Parameters
+    ----------
+    table : pyarrow.Table
+        The input table whose columns need to be checked.
+
+    threshold : float
+        Must be 0 <= threshold <= 1
+        The threshold for the proportion of missing values to allow in each column.
+
+    variance : float
+        Default is None
+        The lowest coefficient of variance to allow in any one column.
+
+    Returns
+    -------
+    pyarrow.Table :
+        A table with only the columns that meet both thresholds.
+    """
+    keep = _kept_columns(table, threshold, variance)
+    return table.select([i for i, kept in enumerate(keep) if kept])
+
+
+def _kept_columns(table, threshold, variance=None):
+    """Returns one boolean per column of table, False for the columns column_drop_threshold drops."""
+    n_rows = table.num_rows
+    keep = []
+    for column in table.columns:
+        missing = column.null_count
+        if pa.types.is_floating(column.type):
+            missing += pc.sum(pc.is_nan(column)).as_py() or 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dropped = np.float64(missing) / n_rows > threshold
+
+        if variance is not None and not dropped and missing == 0 and n_rows and _is_numeric_type(column.type):
+            mean = pc.mean(column).as_py()
+            std = pc.stddev(column, ddof=0).as_py()
+            with np.errstate(divide='ignore', invalid='ignore'):
+                dropped = np.float64(std) / np.float64(mean) < variance
+
+        keep.append(not dropped)
+
+    return keep
+
+
+def remove_duplicates(table, subset_columns=None, keep='first'):
+    """
+    Returns the pyarrow Table without duplicate rows, as remove_duplicates does for pandas.
+    The rows are grouped with Arrow's hash group-by on subset_columns, which keeps the first or last row number
+    of every group (and the group sizes when keep is False), and the kept rows are taken in their original order.
+    Values pandas considers equal are grouped together: in floating point keys, NaN and null are both missing
+    and -0.0 equals 0.0. string_view and binary_view columns are grouped and taken as large strings and binaries,
+    and keep their view type in the result.
+
+    Parameters
+    ----------
+    table : pyarrow.Table
+        The table to process.
+
+    subset_columns : list or None
+        List of column names to consider for identifying duplicates.
+        If None (default), consider all columns.
+
+    keep : {'first', 'last', False}
+        Default is 'first'
+        Which duplicate to keep, as in remove_duplicates.
+
+    Returns
+    -------
+    pyarrow.Table :
+        A table with duplicates removed. The number of dropped rows is printed.
+    """
+    keys = table.column_names if subset_columns is None else list(subset_columns)
+    if not keys or table.num_rows == 0:
+        result = table
+    else:
+        numbered = pa.table([_comparable(table[key]) for key in keys], names=keys)
+        numbered = numbered.append_column(_ROW_NUMBER, pa.array(np.arange(table.num_rows)))
+        aggregation = 'max' if keep == 'last' else 'min'
+        groups = numbered.group_by(keys).aggregate([(_ROW_NUMBER, aggregation), (_ROW_NUMBER, 'count')])
+        rows = groups[f"{_ROW_NUMBER}_{aggregation}"].to_numpy()
+        if keep is False:
+            rows = rows[groups[f"{_ROW_NUMBER}_count"].to_numpy() == 1]
+        result = _take(table, np.sort(rows))
+
+    print(f"{table.num_rows - result.num_rows} rows have been dropped.")
+    return result
+
+
+def _comparable(column):
+    """Returns column with the values pandas treats as equal made identical, for Arrow's group-by to compare."""
+    if pa.types.is_floating(column.type):
+        # pandas stores null as NaN, and adding zero turns -0.0 into 0.0
+        missing = pa.scalar(None, column.type)
+        return pc.add(pc.if_else(pc.is_nan(column), missing, column), pa.scalar(0, column.type))
+    if str(column.type) in _VIEW_TYPES:
+        return column.cast(_VIEW_TYPES[str(column.type)])
+    return column
+
+
+def _take(table, rows):
+    """Returns the rows of table, taking view columns, which have no take kernel, through their large types."""
+    if not any(str(column.type) in _VIEW_TYPES for column in table.columns):
+        return table.take(rows)
+    columns = [column.take(rows) if str(column.type) not in _VIEW_TYPES
+               else column.cast(_VIEW_TYPES[str(column.type)]).take(rows).cast(column.type)
+               for column in table.columns]
+    return pa.Table.from_arrays(columns, schema=table.schema)
+
+
+def extract_parts(table, column, parts, format=None):
+    """
+    Returns the pyarrow Table with one int64 column '<column>_<part>' added for each of parts
+    (any of 'year', 'month', 'day', 'hour', 'minute', 'second'), computed with Arrow temporal kernels.
+    Timezone-aware timestamps are decomposed in their own timezone. A string column is first parsed
+    with Arrow's strptime kernel when format is given. Existing columns with the same names are replaced.
+
+    Parameters
+    ----------
+    table : pyarrow.Table
+        The table containing the timestamp column.
+
+    column : str
+        The name of the timestamp column to extract from.
+
+    parts : list of str
+        The components to extract.
+
+    format : str or None
+        The strptime format of a string column.
+
+    Raises
+    ------
+    KeyError :
+        If the input column is not a column in table.
+
+    TypeError :
+        If the input column is not of timestamp type, or of string type when format is given.
+
+    ValueError :
+        If a string does not match format.
+
+    Returns
+    -------
+    pyarrow.Table :
+        The input table with the added columns.
+    """
+    if column not in table.column_names:
+        raise KeyError(f"Column '{column}' does not exist in the DataFrame.")
+
+    values = table[column]
+    if format is not None and (pa.types.is_string(values.type) or pa.types.is_large_string(values.type)):
+        try:
+            parsed = pc.strptime(values, format=format, unit='s')
+        except pa.ArrowInvalid as error:
+            raise ValueError(str(error)) from None
+        # strptime rolls impossible dates such as February 30th over, formatting them back shows them
+        mismatched = pc.filter(values, pc.not_equal(pc.strftime(parsed, format=format), values))
+        if len(mismatched):
+            raise ValueError(f"time data \"{mismatched[0]}\" doesn't match format \"{format}\".")
+        values = parsed
+    elif not pa.types.is_timestamp(values.type):
+        raise TypeError(f"Column '{column}' must be of datetime type.")
+
+    for part in parts:
+        name = f"{column}_{part}"
+        extracted = getattr(pc, part)(values).cast(pa.int64())
+        if name in table.column_names:
+            table = table.set_column(table.column_names.index(name), name, extracted)
+        else:
+            table = table.append_column(name, extracted)
+    return table
+
+
+def _is_numeric_type(arrow_type):
+    """Mirrors the pandas numeric check of column_drop_threshold: integers and floats, but not booleans."""
+    return pa.types.is_integer(arrow_type) or pa.types.is_floating(arrow_type)
@@ -0,0 +1,266 @@
+import contextlib
+import json
+import os
+import warnings
+
+from wrangle_in_py.column_drop_threshold import _validate_thresholds
+from wrangle_in_py.column_name_standardizer import resulting_duplicates, standardize_strings
+from wrangle_in_py.instrumentation import instrumented
+from wrangle_in_py.remove_duplicates import _validate_keep, _validate_subset_columns
+
+@instrumented
+def column_name_standardizer_ipc(source, output, compression=None):
+    """
+    Standardizes the column names of an Arrow IPC (Feather v2) file, writing the result to a new file,
+    as column_name_standardizer does for a DataFrame. The source is memory-mapped and only its schema is rebuilt:
+    the record batches are written out from the mapped pages as they are, without being read into memory
+    or converted to pandas. The pandas metadata is updated to match, and the columns holding a pandas index
+    keep their names, as column_name_standardizer leaves the index alone.
+
+    Parameters
+    ----------
+    source : str or os.PathLike
+        The path of the Arrow IPC file to read. Uncompressed files are read without copying their data;
+        compressed ones have each record batch decompressed in memory.
+
+    output : str or os.PathLike
+        The path of the Arrow IPC file to write. Must not be the source file.
+
+    compression : str or None
+        Default is None
+        The compression of the written file, 'lz4' or 'zstd', or None to leave it uncompressed.
+
+    Warnings
+    --------
+    UserWarning :
+        If any of the standardized column names are the same.
+
+    Raises
+    ------
+    ValueError :
+        If source is not an Arrow IPC file, or output is the source file.
+
+    ImportError :
+        If pyarrow is not installed.
+
+    Returns
+    -------
+    list
+        The column names of the written file.
+
+    Example
+    -------
+    >>> column_name_standardizer_ipc('events.arrow', 'events_clean.arrow')
+    ['time_stamp', 'fruit_name', 'amount']
+    """
+    pa = _import_pyarrow()
+    with _open(pa, source, output) as reader:
+        original_columns = _data_columns(reader.schema)
+        standardized_columns = standardize_strings(original_columns)
+
+        duplicates = resulting_duplicates(original_columns, standardized_columns)
+        if bool(duplicates):
+            warnings.warn(f"Duplicate column names found after standardization: {duplicates}")
+
+        renames = dict(zip(original_columns, standardized_columns))
+        names = [renames.get(name, name) for name in reader.schema.names]
+        _write_batches(pa, reader, output, list(range(len(names))), names, compression)
+    return names
+
+
+@instrumented
+def column_drop_threshold_ipc(source, output, threshold, variance=None, compression=None):
+    """
+    Drops the columns of an Arrow IPC (Feather v2) file that do not meet the missingness threshold
+    or the coefficient of variance, writing the result to a new file, as column_drop_threshold does
+    for a DataFrame. The source is memory-mapped and its statistics are computed with Arrow compute kernels;
+    the kept columns are then written out from the mapped pages as they are and the dropped ones are not read again.
+    Columns holding a pandas index are never dropped.
+
+    Parameters
+    ----------
+    source : str or os.PathLike
+        The path of the Arrow IPC file to read. Uncompressed files are read without copying their data.
+
+    output : str or os.PathLike
+        The path of the Arrow IPC file to write. Must not be the source file.
+
+    threshold : float
+        Must be 0 <= threshold <= 1
+        The threshold for the proportion of missing values to allow in each column.
+
+    variance : float
+        Default is None
+        The lowest coefficient of variance to allow in any one column.
+
+    compression : str or None
+        Default is None
+        The compression of the written file, 'lz4' or 'zstd', or None to leave it uncompressed.
+
+    Raises
+    ------
+    ValueError :
+        If the input for threshold is not a float and in the inclusive range 0 and 1.
+        Or if the input for variance is not a float >=0.
+        Or if source is not an Arrow IPC file, or output is the source file.
+
+    ImportError :
+        If pyarrow is not installed.
+
+    Returns
+    -------
+    list
+        The names of the columns that were dropped.
+
+    Example
+    -------
+    >>> column_drop_threshold_ipc('sensors.arrow', 'sensors_clean.arrow', 0.35, 0.1)
+    ['kiwi', 'peach']
+    """
+    from wrangle_in_py.arrow_backend import _kept_columns
+
+    _validate_thresholds(threshold, variance)
+    pa = _import_pyarrow()
+    with _open(pa, source, output) as reader:
+        data_columns = _data_columns(reader.schema)
+        table = reader.read_all().select(data_columns)
+        dropped = [name for name, kept in zip(data_columns, _kept_columns(table, threshold, variance)) if not kept]
+        del table
+
+        names = reader.schema.names
+        positions = [i for i, name in enumerate(names) if name not in dropped]
+        _write_batches(pa, reader, output, positions, [names[i] for i in positions], compression)
+    return dropped
+
+
+@instrumented
+def remove_duplicates_ipc(source, output, subset_columns=None, keep='first', compression=None):
+    """
+    Removes the duplicate rows of an Arrow IPC (Feather v2) file, writing the result to a new file,
+    as remove_duplicates does for a DataFrame. The source is memory-mapped and the rows are grouped
+    with Arrow's hash group-by, so only the key columns, the row numbers of the groups and the kept rows
+    are held in memory. Columns holding a pandas index are not compared, as remove_duplicates ignores the index.
+
+    Parameters
+    ----------
+    source : str or os.PathLike
+        The path of the Arrow IPC file to read. Uncompressed files are read without copying their data.
+
+    output : str or os.PathLike
+        The path of the Arrow IPC file to write. Must not be the source file.
+
+    subset_columns : list or None
+        List of column names to consider for identifying duplicates.
+        If None (default), consider all columns.
+
+    keep : {'first', 'last', False}
+        Default is 'first'
+        Which duplicate to keep, as in remove_duplicates.
+
+    compression : str or None
+        Default is None
+        The compression of the written file, 'lz4' or 'zstd', or None to leave it uncompressed.
+
+    Raises
+    ------
+    ValueError :
+        If any column in subset_columns is not a column in the file.
+        If the input for keep is not 'first', 'last', or False.
+        If source is not an Arrow IPC file, or output is the source file.
+
+    ImportError :
+        If pyarrow is not installed.
+
+    Returns
+    -------
+    int
+        The number of rows written. The number of dropped rows is printed.
+
+    Example
+    -------
+    >>> remove_duplicates_ipc('orders.arrow', 'orders_unique.arrow', subset_columns=['order_id'])
+    12 rows have been dropped.
+    9988
+    """
+    from wrangle_in_py.arrow_backend import remove_duplicates
+
+    _validate_keep(keep)
+    pa = _import_pyarrow()
+    with _open(pa, source, output) as reader:
+        data_columns = _data_columns(reader.schema)
+        _validate_subset_columns(data_columns, subset_columns)
+        result = remove_duplicates(reader.read_all(), data_columns if subset_columns is None else subset_columns, keep)
+        # The result can still point into the mapped file, so it is written before the map is closed
+        options = pa.ipc.IpcWriteOptions(compression=compression)
+        with pa.ipc.new_file(os.fspath(output), reader.schema, options=options) as writer:
+            writer.write_table(result)
+    return result.num_rows
+
+
+def _import_pyarrow():
+    """Returns the pyarrow module, with a clear error if it is not installed."""
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc
+    except ImportError as error:
+        raise ImportError("Reading and writing Arrow IPC files requires pyarrow, installed with pip install 'wrangle_in_py[arrow]'.") from error
+    return pa
+
+
+@contextlib.contextmanager
+def _open(pa, source, output):
+    """Memory-maps the Arrow IPC file source and yields its reader, closing the map on exit."""
+    path = os.fspath(source)
+    if os.path.abspath(path) == os.path.abspath(os.fspath(output)):
+        raise ValueError("output must not be the source file, which is memory-mapped while the output is written.")
+    with pa.memory_map(path) as mapped:
+        try:
+            reader = pa.ipc.open_file(mapped)
+        except pa.ArrowInvalid as error:
+            raise ValueError(f"{path} is not an Arrow IPC (Feather v2) file: {error}") from None
+        yield reader
+
+
+def _data_columns(schema):
+    """Returns the names of the fields of schema that are not pandas index columns."""
+    index_columns = set()
+    if schema.metadata and b'pandas' in schema.metadata:
+        index_columns = {name for name in json.loads(schema.metadata[b'pandas'])['index_columns']
+                         if isinstance(name, str)}
+    return [name for name in schema.names if name not in index_columns]
+
+
+def _write_batches(pa, reader, output, positions, names, compression):
+    """
+    Writes the columns at positions of every record batch of reader to output under the new names,
+    one batch at a time. The column buffers are passed to the writer as they are, so nothing is copied in memory.
+    """
+    schema = pa.schema([reader.schema.field(i).with_name(name) for i, name in zip(positions, names)],
+                       metadata=_pandas_metadata(reader.schema, positions, names))
+    with pa.ipc.new_file(os.fspath(output), schema, options=pa.ipc.IpcWriteOptions(compression=compression)) as writer:
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            writer.write_batch(pa.RecordBatch.from_arrays([batch.column(j) for j in positions], schema=schema))
+
+
+def _pandas_metadata(schema, positions, names):
+    """
+    Returns the metadata of schema with its pandas metadata, if any, describing only the fields at positions
+    under their new names, so the written file still converts back to the same pandas DataFrame.
+    """
+    metadata = dict(schema.metadata or {})
+    if b'pandas' not in metadata:
+        return metadata or None
+    pandas_metadata = json.loads(metadata[b'pandas'])
+    renames = {schema.names[i]: name for i, name in zip(positions, names)}
+    columns = []
+    for column in pandas_metadata['columns']:
+        if column['field_name'] in renames:
+            new_name = renames[column['field_name']]
+            if column['name'] == column['field_name']:
+                column['name'] = new_name
+            column['field_name'] = new_name
+            columns.append(column)
+    pandas_metadata['columns'] = columns
+    metadata[b'pandas'] = json.dumps(pandas_metadata).encode()
+    return metadata
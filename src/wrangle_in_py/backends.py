@@ -0,0 +1,18 @@
+def _backend_for(df):
+    """
+    Returns the module that runs the wrangle_in_py functions natively on df (arrow_backend for a pyarrow Table,
+    polars_backend for a polars DataFrame), or None for anything else. The backends, and pyarrow or polars,
+    are only imported once such an object is passed in, so neither library is needed to use the package.
+    """
+    library = type(df).__module__.split('.')[0]
+    if library == 'pyarrow':
+        import pyarrow as pa
+        if isinstance(df, pa.Table):
+            from wrangle_in_py import arrow_backend
+            return arrow_backend
+    elif library == 'polars':
+        import polars as pl
+        if isinstance(df, pl.DataFrame):
+            from wrangle_in_py import polars_backend
+            return polars_backend
+    return None
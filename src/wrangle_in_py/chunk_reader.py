@@ -0,0 +1,127 @@
+import os
+
+import pandas as pd
+
+def iter_chunks(source, chunksize=100_000):
+    """
+    Yields the input data as a sequence of pandas DataFrame chunks so that it never has to be fully held in memory.
+
+    Parameters
+    ----------
+    source : str, os.PathLike or iterable of pd.DataFrame
+        A path to a '.csv' or '.parquet' file, or an iterable of pandas DataFrame chunks.
+
+    chunksize : int
+        Default is 100_000
+        The number of rows read into each chunk when source is a file path.
+
+    Raises
+    -------
+    ValueError :
+        If the input for chunksize is not a positive integer,
+        or if source is a file path that does not end in '.csv' or '.parquet'.
+
+    TypeError :
+        If source is neither a file path nor an iterable of pandas DataFrames.
+
+    ImportError :
+        If source is a parquet file and pyarrow is not installed.
+
+    Returns
+    ----------
+    generator of pd.DataFrame
+        The chunks of the input data, in order.
+
+    Examples
+    ----------
+    >>> for chunk in iter_chunks('events.csv', chunksize=2):
+    ...     print(chunk.shape)
+    (2, 3)
+    (1, 3)
+    """
+    if not (isinstance(chunksize, int) and chunksize > 0):
+        raise ValueError("chunksize must be a positive integer.")
+
+    if isinstance(source, (str, os.PathLike)):
+        path = os.fspath(source)
+        extension = os.path.splitext(path)[1].lower()
+        if extension == '.csv':
+            with pd.read_csv(path, chunksize=chunksize) as reader:
+                yield from reader
+        elif extension == '.parquet':
+            try:
+                import pyarrow.parquet as pq
+            except ImportError as error:
+                raise ImportError("Reading parquet files in chunks requires pyarrow, installed with pip install 'wrangle_in_py[arrow]'.") from error
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+                yield batch.to_pandas()
+        else:
+            raise ValueError("File paths must end in '.csv' or '.parquet'.")
+        return
+
+    if isinstance(source, pd.DataFrame) or not hasattr(source, '__iter__'):
+        raise TypeError("source must be a file path or an iterable of pandas DataFrames.")
+
+    for chunk in source:
+        if not isinstance(chunk, pd.DataFrame):
+            raise TypeError("Every chunk must be a pandas DataFrame.")
+        yield chunk
+
+
+def write_chunks(chunks, output):
+    """
+    Writes a sequence of pandas DataFrame chunks to a single '.csv' or '.parquet' file, one chunk at a time.
+
+    Parameters
+    ----------
+    chunks : iterable of pd.DataFrame
+        The chunks to write. Every chunk must have the same columns.
+
+    output : str or os.PathLike
+        The path of the file to write. Its extension decides the file format.
+
+    Raises
+    -------
+    ValueError :
+        If the output path does not end in '.csv' or '.parquet'.
+
+    ImportError :
+        If output is a parquet file and pyarrow is not installed.
+
+    Returns
+    ----------
+    int
+        The number of rows written.
+    """
+    path = os.fspath(output)
+    extension = os.path.splitext(path)[1].lower()
+    n_rows = 0
+
+    if extension == '.csv':
+        header = True
+        for chunk in chunks:
+            chunk.to_csv(path, mode='w' if header else 'a', header=header, index=False)
+            header = False
+            n_rows += len(chunk)
+        return n_rows
+
+    if extension != '.parquet':
+        raise ValueError("File paths must end in '.csv' or '.parquet'.")
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as error:
+        raise ImportError("Writing parquet files requires pyarrow, installed with pip install 'wrangle_in_py[arrow]'.") from error
+
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table.cast(writer.schema))
+            n_rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return n_rows
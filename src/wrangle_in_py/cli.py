@@ -0,0 +1,308 @@
+"""
+The wrangle-in-py command, which applies a list of wrangle_in_py steps to many csv or parquet files in parallel.
+
+    wrangle-in-py "partitions/*.csv" --steps steps.yaml --output-dir clean/ --jobs 8
+
+The steps file is a JSON or YAML list of steps, each either a function name or a mapping of a function name
+to its arguments (the DataFrame argument is left out):
+
+    - column_name_standardizer
+    - column_drop_threshold: {threshold: 0.5, variance: 0.1}
+    - remove_duplicates: {subset_columns: [order_id]}
+    - extracting_ymd: {column: order_date, format: '%Y-%m-%d'}
+"""
+import argparse
+import contextlib
+import glob
+import inspect
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from wrangle_in_py.chunk_reader import iter_chunks, write_chunks
+from wrangle_in_py.column_drop_threshold import column_drop_threshold_chunked
+from wrangle_in_py.column_name_standardizer import column_name_standardizer
+from wrangle_in_py.extracting_ymd_hms import extract_datetime_parts, extracting_hms, extracting_ymd
+from wrangle_in_py.remove_duplicates import remove_duplicates_chunked
+from wrangle_in_py.value_standardizer import value_standardizer
+
+# The steps that look at one chunk at a time, and the arguments of the steps that need the whole file
+_CHUNK_STEPS = {
+    'column_name_standardizer': column_name_standardizer,
+    'value_standardizer': value_standardizer,
+    'extracting_ymd': extracting_ymd,
+    'extracting_hms': extracting_hms,
+    'extract_datetime_parts': extract_datetime_parts,
+}
+_FILE_STEPS = {
+    'column_drop_threshold': lambda threshold, variance=None: None,
+    'remove_duplicates': lambda subset_columns=None, keep='first': None,
+}
+
+
+def main(argv=None):
+    """
+    Runs the wrangle-in-py command with the arguments argv (by default, those the program was called with).
+
+    Every input file is read in chunks of --chunksize rows and its steps are applied in order, so memory is bounded
+    by the chunk size rather than the file size. Steps that need to see the whole file first do so in a separate pass:
+    column_drop_threshold reads the file once to decide which columns to drop, and remove_duplicates with
+    keep='last' or keep=False reads it once to count the keys, each pass re-running the earlier steps on the chunks.
+    Files are processed concurrently by at most --jobs worker processes, and each output is written to a temporary
+    file and renamed once complete. An output that is newer than both its input and the steps file is up to date
+    and skipped, so an interrupted run can be resumed by running the same command again.
+    Each output keeps the path of its input relative to the deepest directory that holds every input,
+    so inputs with the same name in different directories are written to different outputs.
+
+    Parameters
+    ----------
+    argv : list of str or None
+        The command line arguments, without the program name.
+
+    Returns
+    -------
+    int
+        The exit status: 0 if every file was written or skipped, 1 if any failed, 2 for invalid arguments or steps.
+    """
+    parser = argparse.ArgumentParser(
+        prog='wrangle-in-py', description="Apply wrangle_in_py steps to many csv or parquet files in parallel."
+    )
+    parser.add_argument('inputs', nargs='+', help="input files or glob patterns, such as 'data/*.csv'")
+    parser.add_argument('--steps', required=True, help="a JSON or YAML file listing the steps to apply")
+    parser.add_argument('--output-dir', required=True, help="the directory to write the outputs to")
+    parser.add_argument('--format', choices=['csv', 'parquet'],
+                        help="the format of the outputs (by default, the format of each input)")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count(),
+                        help="the largest number of files processed at once (default: the number of CPUs)")
+    parser.add_argument('--chunksize', type=int, default=100_000, help="the number of rows read at a time")
+    parser.add_argument('--force', action='store_true', help="process every file, even if its output is up to date")
+    args = parser.parse_args(argv)
+
+    if args.jobs < 1 or args.chunksize < 1:
+        parser.error("--jobs and --chunksize must be positive integers.")
+    try:
+        steps = load_steps(args.steps)
+    except (OSError, ValueError, ImportError) as error:
+        parser.error(str(error))
+
+    paths = sorted({path for pattern in args.inputs for path in (glob.glob(pattern) or [pattern])})
+    missing = [path for path in paths if not os.path.isfile(path)]
+    if missing:
+        parser.error(f"no such input files: {missing}")
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in paths])
+    outputs = [_output_path(path, root, args.output_dir, args.format) for path in paths]
+    collisions = sorted({output for output in outputs if outputs.count(output) > 1})
+    if collisions:
+        parser.error(f"several inputs would be written to each of {collisions}")
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    steps_mtime = os.path.getmtime(args.steps)
+    summaries = []
+    pending = []
+    for path, output in zip(paths, outputs):
+        if not args.force and _up_to_date(output, path, steps_mtime):
+            summaries.append({'input': path, 'output': output, 'status': 'skipped'})
+            _report(summaries[-1])
+        else:
+            pending.append((path, output))
+
+    with ProcessPoolExecutor(max_workers=min(args.jobs, max(len(pending), 1))) as pool:
+        futures = [pool.submit(process_file, path, output, steps, args.chunksize) for path, output in pending]
+        for future in as_completed(futures):
+            summaries.append(future.result())
+            _report(summaries[-1])
+
+    statuses = [summary['status'] for summary in summaries]
+    print(f"{statuses.count('written')} written, {statuses.count('skipped')} skipped (up to date), "
+          f"{statuses.count('failed')} failed, of {len(summaries)} files.")
+    return 1 if 'failed' in statuses else 0
+
+
+def load_steps(path):
+    """
+    Reads and checks a steps file, returning its steps as a list of (name, arguments) pairs.
+    Files ending in '.yaml' or '.yml' are read as YAML, which requires PyYAML, and any other file as JSON.
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+        The path of the steps file.
+
+    Raises
+    ------
+    ValueError :
+        If the file is not a list of steps, or a step names an unknown function or has invalid arguments.
+
+    ImportError :
+        If the file is a YAML file and PyYAML is not installed.
+
+    Returns
+    -------
+    list of tuple
+        The name and the dict of arguments of every step, in order.
+    """
+    with open(path) as file:
+        if os.path.splitext(os.fspath(path))[1].lower() in ('.yaml', '.yml'):
+            try:
+                import yaml
+            except ImportError as error:
+                raise ImportError("Reading YAML steps files requires PyYAML, installed with pip install 'wrangle_in_py[yaml]'.") from error
+            try:
+                raw_steps = yaml.safe_load(file)
+            except yaml.YAMLError as error:
+                raise ValueError(f"Could not read the steps file: {error}") from None
+        else:
+            raw_steps = json.load(file)
+
+    if not isinstance(raw_steps, list) or not raw_steps:
+        raise ValueError("The steps file must contain a non-empty list of steps.")
+
+    steps = []
+    for raw_step in raw_steps:
+        if isinstance(raw_step, str):
+            name, arguments = raw_step, {}
+        elif isinstance(raw_step, dict) and len(raw_step) == 1:
+            (name, arguments), = raw_step.items()
+            arguments = {} if arguments is None else arguments
+        else:
+            raise ValueError(f"Each step must be a function name or a mapping of one function name "
+                             f"to its arguments, got {raw_step!r}.")
+
+        if name in _CHUNK_STEPS:
+            # The first parameter is the DataFrame, which the runner passes in
+            signature = inspect.signature(_CHUNK_STEPS[name])
+            signature = signature.replace(parameters=list(signature.parameters.values())[1:])
+        elif name in _FILE_STEPS:
+            signature = inspect.signature(_FILE_STEPS[name])
+        else:
+            raise ValueError(f"Unknown step {name!r}. Steps must be one of {sorted({**_CHUNK_STEPS, **_FILE_STEPS})}.")
+        if not isinstance(arguments, dict):
+            raise ValueError(f"The arguments of step {name!r} must be a mapping.")
+        try:
+            signature.bind(**arguments)
+        except TypeError as error:
+            raise ValueError(f"Invalid arguments for step {name!r}: {error}") from None
+        steps.append((name, arguments))
+    return steps
+
+
+def process_file(path, output, steps, chunksize=100_000):
+    """
+    Applies steps to the file at path one chunk at a time and writes the result to output.
+    The printed messages of the steps are suppressed, their row counts are part of the returned summary instead.
+
+    Parameters
+    ----------
+    path : str
+        The csv or parquet file to read.
+
+    output : str
+        The csv or parquet file to write, whose directory is created if needed.
+        It is only replaced once the whole output has been written.
+
+    steps : list of tuple
+        The (name, arguments) pairs returned by load_steps.
+
+    chunksize : int
+        Default is 100_000
+        The number of rows read at a time.
+
+    Returns
+    -------
+    dict
+        The 'input', 'output', 'status' ('written' or 'failed'), 'rows_in', 'rows_out', 'columns_out'
+        and 'seconds' of the file, and the 'error' if it failed.
+    """
+    start = time.perf_counter()
+    rows_in = [0]
+
+    def read():
+        rows_in[0] = 0
+        for chunk in iter_chunks(path, chunksize):
+            rows_in[0] += len(chunk)
+            yield chunk
+
+    source = _Chunks(read)
+    directory, name = os.path.split(output)
+    partial = os.path.join(directory, f".partial-{os.getpid()}-{name}")
+    try:
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with contextlib.redirect_stdout(io.StringIO()):
+            for step, arguments in steps:
+                source = _apply(source, step, arguments, chunksize)
+            columns_out = []
+            rows_out = write_chunks(_record_columns(source, columns_out), partial)
+        os.replace(partial, output)
+    except Exception as error:
+        if os.path.exists(partial):
+            os.remove(partial)
+        return {'input': path, 'output': output, 'status': 'failed', 'error': f"{type(error).__name__}: {error}",
+                'seconds': time.perf_counter() - start}
+
+    return {'input': path, 'output': output, 'status': 'written', 'rows_in': rows_in[0], 'rows_out': rows_out,
+            'columns_out': len(columns_out), 'seconds': time.perf_counter() - start}
+
+
+class _Chunks:
+    """A re-iterable sequence of chunks, produced afresh by calling read every time it is iterated."""
+
+    def __init__(self, read):
+        self._read = read
+
+    def __iter__(self):
+        return iter(self._read())
+
+
+def _apply(source, name, arguments, chunksize):
+    """Returns the chunks of source with the step applied."""
+    if name == 'column_drop_threshold':
+        columns_to_drop = column_drop_threshold_chunked(source, arguments['threshold'], arguments.get('variance'),
+                                                        chunksize=chunksize)
+        return _Chunks(lambda: (chunk.drop(columns=columns_to_drop, errors='ignore') for chunk in source))
+    if name == 'remove_duplicates':
+        return _Chunks(lambda: remove_duplicates_chunked(source, arguments.get('subset_columns'),
+                                                         arguments.get('keep', 'first'), chunksize))
+    function = _CHUNK_STEPS[name]
+    return _Chunks(lambda: (function(chunk, **arguments) for chunk in source))
+
+
+def _record_columns(chunks, columns):
+    """Yields chunks, remembering the columns of the last one in columns."""
+    for chunk in chunks:
+        columns[:] = list(chunk.columns)
+        yield chunk
+
+
+def _output_path(path, root, output_dir, output_format):
+    """
+    Returns the output path of an input file: its path relative to the directory root in output_dir,
+    with the extension of output_format.
+    """
+    directory = os.path.relpath(os.path.dirname(os.path.abspath(path)), root)
+    stem, extension = os.path.splitext(os.path.basename(path))
+    name = stem + (f".{output_format}" if output_format else extension)
+    return os.path.normpath(os.path.join(output_dir, directory, name))
+
+
+def _up_to_date(output, path, steps_mtime):
+    """Returns True if output exists and is newer than both its input and the steps file."""
+    return os.path.exists(output) and os.path.getmtime(output) >= max(os.path.getmtime(path), steps_mtime)
+
+
+def _report(summary):
+    """Prints the one-line summary of a file."""
+    if summary['status'] == 'written':
+        print(f"written  {summary['input']} -> {summary['output']}: {summary['rows_in']} rows in, "
+              f"{summary['rows_out']} rows x {summary['columns_out']} columns out, {summary['seconds']:.2f} s")
+    elif summary['status'] == 'skipped':
+        print(f"skipped  {summary['input']}: {summary['output']} is up to date")
+    else:
+        print(f"failed   {summary['input']}: {summary['error']}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,15 +1,92 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from multiprocessing import shared_memory
+
+import numpy as np
 import pandas as pd
-from scipy.stats import variation
+import scipy.stats
+
+from wrangle_in_py.backends import _backend_for
+from wrangle_in_py.chunk_reader import iter_chunks, write_chunks
+from wrangle_in_py.instrumentation import instrumented
+from wrangle_in_py.profiling import Profile
+from wrangle_in_py.remove_duplicates import _validate_n_jobs
+
+def column_statistics(df):
+    """
+    Computes the missingness and coefficient of variance statistics for every column of the dataframe
+    in one vectorized pass, instead of building a Series and rescanning the data for each column.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The input pandas dataframe whose column statistics need to be calculated.
+
+    Raises
+    -------
+    TypeError :
+        If the input for df is not a pandas DataFrame.
+
+    Returns
+    ----------
+    pd.DataFrame
+        A dataframe indexed by the columns of df with the columns
+        'null_count', 'missingness', 'mean', 'std' and 'cv'.
+        'mean' and 'std' (the population standard deviation) ignore missing values and are NaN for non-numeric columns.
+        'cv' follows scipy.stats.variation, so it is NaN for non-numeric columns and for columns with missing values.
+
+    Examples
+    ----------
+    >>> data = {'apple': [1, 2, NaN], 'banana': [3, 4, 5], 'kiwi': ['a', 'b', NaN]}
+    >>> df = pd.DataFrame(data)
+    >>> column_statistics(df)
+            null_count  missingness  mean       std        cv
+    apple            1     0.333333   1.5  0.500000       NaN
+    banana           0     0.000000   4.0  0.816497  0.204124
+    kiwi             1     0.333333   NaN       NaN       NaN
+    """
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("The first argument must be a pandas DataFrame.")
+
+    null_count = df.isna().to_numpy().sum(axis=0) if len(df.columns) else np.zeros(0, dtype=np.int64)
+    return _column_statistics(df, null_count)
+
+
+def _column_statistics(df, null_count):
+    """Returns column_statistics(df), given the null count of every column."""
+    n_rows, n_cols = df.shape
+    with np.errstate(divide='ignore', invalid='ignore'):
+        missingness = null_count / n_rows
+
+    mean = np.full(n_cols, np.nan)
+    std = np.full(n_cols, np.nan)
+    cv = np.full(n_cols, np.nan)
+
+    # Numeric columns are pulled out as one 2-D float block so the moments are computed for all of them at once
+    numeric = np.array([_is_numeric_dtype(dtype) for dtype in df.dtypes], dtype=bool)
+    if n_rows and numeric.any():
+        values = df.iloc[:, np.flatnonzero(numeric)].to_numpy(dtype='float64', na_value=np.nan)
+        mean[numeric], std[numeric], cv[numeric] = _numeric_moments(values, null_count[numeric])
 
-def column_drop_threshold(df, threshold, variance=None):
+    return pd.DataFrame(
+        {'null_count': null_count, 'missingness': missingness, 'mean': mean, 'std': std, 'cv': cv},
+        index=df.columns,
+    )
+
+@instrumented
+def column_drop_threshold(df, threshold, variance=None, column_stats=None, n_jobs=None, mode='exact',
+                          sample_size=10_000, confidence=0.99, profile=None):
     """
     Returns a copy of the dataframe inputted with columns removed if they did not meet the threshold specified, 
     and with columns removed if they had a coefficient of variance lower than specified.
     
     Parameters
     ----------
-    df : pd.DataFrame
+    df : pd.DataFrame, pyarrow.Table or polars.DataFrame
         The input pandas dataframe whose missingness threshold and coefficient of variance needs to be checked
+        A pyarrow Table or polars DataFrame is checked natively with Arrow compute kernels or polars expressions
+        (NaN values count as missing, as in pandas) and returned as the same type.
     
     threshold : float
         Must be 0 <= threshold <= 1
@@ -23,18 +100,64 @@ def column_drop_threshold(df, threshold, variance=None):
         A column must have at least 2 numbers for coefficient of variance to be calculated
           because the coefficient of variance cannot be calculated with 1 or 0 numbers. 
 
+    column_stats : ColumnStats
+        Default is None
+        The statistics of df, kept up to date with ColumnStats.update as new rows are appended to it.
+        If given, the decisions are read from column_stats and df is not scanned.
+
+    n_jobs : int or None
+        Default is None
+        The number of worker processes to spread the statistics over, or -1 to use every CPU.
+        If None, the statistics are computed in a single pass in this process.
+        Otherwise the numeric columns are copied once into a column-major float block in shared memory,
+        and each worker computes the null counts and coefficients of variance of a contiguous group of its columns,
+        reading them from shared memory rather than receiving a pickled copy. Worth it for very wide frames;
+        the process start-up makes it slower for small ones. A pyarrow Table or polars DataFrame uses
+        its library's own threads instead, so n_jobs does not apply.
+
+    mode : str
+        Default is 'exact'
+        - 'exact': Compute the statistics of every column from every row.
+        - 'estimate': Compute the statistics of every column from a random sample of sample_size rows first,
+          with a Wilson interval for the missingness and a delta-method interval for the coefficient of variance.
+          Columns whose intervals fall clearly on one side of threshold and variance are decided from the sample,
+          and the exact statistics are only computed for the rest: columns whose intervals straddle a threshold,
+          and columns the variance rule might drop (since a single missing value anywhere exempts a column from it).
+          Each sampled decision is wrong with a probability of at most about 1 - confidence. The sample is drawn
+          with a fixed seed, so repeated calls on the same data make the same decisions.
+        Does not apply when column_stats is given.
+
+    sample_size : int
+        Default is 10_000
+        The number of rows sampled when mode is 'estimate'. Frames with no more rows than this are checked exactly.
+
+    confidence : float
+        Default is 0.99
+        Must be 0 < confidence < 1
+        The confidence level of the sampled intervals when mode is 'estimate'.
+
+    profile : Profile
+        Default is None
+        The profile(df) of df. If given, its statistics are used and df is not scanned.
+
     Raises
     -------
     TypeError :
-    	If the input for df is not a pandas DataFrame.
+    	If the input for df is not a pandas DataFrame, a pyarrow Table or a polars DataFrame.
+     	Or if the input for column_stats is not a ColumnStats or None, or profile is not a Profile or None.
      
     ValueError :
     	If the input for threshold is not a float and in the inclusive range 0 and 1.
      	Or if the input for variance is not a float >=0.
+     	Or if column_stats does not cover every column of df, or is given with a pyarrow Table or polars DataFrame.
+     	Or if the input for n_jobs is not a positive integer, -1 or None.
+     	Or if the input for mode is not 'exact' or 'estimate', or mode is 'estimate' and df is not a pandas DataFrame.
+     	Or if the input for sample_size is not a positive integer, or confidence is not a float between 0 and 1.
+     	Or if profile was computed for a different DataFrame, or is given with a pyarrow Table or polars DataFrame.
     
     Returns
     ----------
-    pd.DataFrame
+    pd.DataFrame, pyarrow.Table or polars.DataFrame
         A new dataframe where each column meets or exceeds the specified allowable missingness threshold, and the variance threshold. 
         Any columns previously not meeting the thresholds have been removed.
     
@@ -48,35 +171,590 @@ def column_drop_threshold(df, threshold, variance=None):
     1   2     4
     2   NaN   5
     """
-    # Check that the df is a pandas dataframe
-    if not isinstance(df, pd.DataFrame):
+    # Check that the df is a pandas dataframe, or a table a backend handles natively
+    backend = _backend_for(df)
+    if backend is None and not isinstance(df, pd.DataFrame):
         raise TypeError("The first argument must be a pandas DataFrame.")
         
+    _validate_thresholds(threshold, variance)
+    _validate_n_jobs(n_jobs)
+    _validate_estimate(mode, sample_size, confidence)
+
+    if column_stats is not None:
+        if not isinstance(column_stats, ColumnStats):
+            raise TypeError("column_stats must be a ColumnStats or None.")
+        if backend is not None:
+            raise ValueError("column_stats is only supported for pandas DataFrames.")
+        uncovered = df.columns[~df.columns.isin(column_stats.columns)]
+        if len(uncovered):
+            raise ValueError(f"column_stats does not cover the columns {uncovered.tolist()}.")
+        # The decisions come from the accumulated statistics, so df is not read
+        drop_mask = df.columns.isin(column_stats.columns_to_drop(threshold, variance))
+        return df.loc[:, ~drop_mask]
+
+    if profile is not None:
+        if not isinstance(profile, Profile):
+            raise TypeError("profile must be a Profile or None.")
+        if backend is not None:
+            raise ValueError("profile is only supported for pandas DataFrames.")
+        profile._check(df)
+        return df.loc[:, ~_drop_mask(profile.statistics, threshold, variance)]
+
+    if backend is not None:
+        if mode != 'exact':
+            raise ValueError("mode='estimate' is only supported for pandas DataFrames.")
+        return backend.column_drop_threshold(df, threshold, variance)
+
+    if mode == 'estimate' and len(df) > sample_size:
+        drop_mask = _drop_mask_estimate(df, threshold, variance, n_jobs, sample_size, confidence)
+    else:
+        drop_mask = _drop_mask(_statistics(df, n_jobs), threshold, variance)
+
+    dropped_df = df.loc[:, ~drop_mask] # Drop the specified columns
+
+    return dropped_df
+
+
+@instrumented
+def column_drop_threshold_chunked(source, threshold, variance=None, chunksize=100_000, output=None):
+    """
+    Applies the missingness threshold and coefficient of variance rules of column_drop_threshold
+    to data that is read one chunk at a time, so memory use is bounded by the chunk size rather than the data size.
+    Null counts and running means and variances (Welford/Chan updates) are accumulated for each column across chunks.
+
+    Parameters
+    ----------
+    source : str, os.PathLike or iterable of pd.DataFrame
+        A path to a '.csv' or '.parquet' file, or an iterable of pandas DataFrame chunks.
+
+    threshold : float
+        Must be 0 <= threshold <= 1
+        The threshold for the proportion of missing values to allow in each column,
+        Columns with a larger proportion of missing observations than the threshold will be dropped
+
+    variance : float
+        Default is None
+        The lowest coefficient of variance to allow in any one column
+        Columns with a lower variance than specified will be dropped
+
+    chunksize : int
+        Default is 100_000
+        The number of rows read into each chunk when source is a file path.
+
+    output : str or os.PathLike
+        Default is None
+        A '.csv' or '.parquet' path to write the data to with the dropped columns removed.
+        Writing the output reads the source a second time, so source must be a file path or a re-iterable collection of chunks.
+
+    Raises
+    -------
+    TypeError :
+        If source is neither a file path nor an iterable of pandas DataFrames.
+
+    ValueError :
+        If the input for threshold is not a float and in the inclusive range 0 and 1.
+        Or if the input for variance is not a float >=0.
+        Or if output is given but source is a one-shot iterator that cannot be read twice.
+
+    Returns
+    ----------
+    list
+        The names of the columns that did not meet the thresholds, in the order they first appeared.
+
+    Examples
+    ----------
+    >>> column_drop_threshold_chunked('sensors.csv', 0.35, 0.1, chunksize=50_000)
+    ['kiwi', 'peach']
+    >>> column_drop_threshold_chunked('sensors.csv', 0.35, 0.1, output='sensors_clean.parquet')
+    ['kiwi', 'peach']
+    """
+    _validate_thresholds(threshold, variance)
+
+    if output is not None and not isinstance(source, (str, os.PathLike)) and iter(source) is source:
+        raise ValueError("Writing an output requires a file path or a re-iterable collection of chunks as source.")
+
+    column_stats = ColumnStats()
+    for chunk in iter_chunks(source, chunksize):
+        column_stats.update(chunk)
+
+    columns_to_drop = column_stats.columns_to_drop(threshold, variance)
+
+    if output is not None:
+        write_chunks((chunk.drop(columns=columns_to_drop, errors='ignore') for chunk in iter_chunks(source, chunksize)), output)
+
+    return columns_to_drop
+
+
+class ColumnStats:
+    """
+    The per-column state behind column_drop_threshold: the row count, null count, and the count, mean and
+    sum of squared deviations of the numeric values of every column. States of separate batches can be merged
+    exactly (Chan's parallel update), so the statistics of append-only data can be kept up to date
+    by updating them with each new partition, in time proportional to the new rows only,
+    and states computed by separate workers can be combined. The state is a few numbers per column
+    and can be saved with to_dict (which is JSON serializable) and restored with from_dict.
+
+    A column that is absent from a batch counts as entirely missing for that batch's rows.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Default is None
+        The first batch of data. If None, the state starts empty.
+
+    Raises
+    ------
+    TypeError :
+        If the input for df is not a pandas DataFrame or None.
+
+    Example
+    -------
+    >>> stats = ColumnStats(pd.DataFrame({'apple': [1, 2, NaN], 'peach': [2, 2, 2]}))
+    >>> stats.update(pd.DataFrame({'apple': [4, 5, 6], 'peach': [2, 3, 2]}))
+    ColumnStats(2 columns, 6 rows)
+    >>> stats.columns_to_drop(0.35, 0.2)
+    ['peach']
+    >>> ColumnStats.from_dict(json.loads(json.dumps(stats.to_dict()))).statistics()
+           null_count  missingness      mean       std        cv
+    apple           1     0.166667  3.600000  1.854724       NaN
+    peach           0     0.000000  2.166667  0.372678  0.172005
+    """
+
+    _FIELDS = ['row_count', 'null_count', 'numeric', 'count', 'mean', 'm2']
+
+    def __init__(self, df=None):
+        self._moments = None
+        if df is not None:
+            self.update(df)
+
+    def __repr__(self):
+        return f"ColumnStats({len(self.columns)} columns, {self.row_count} rows)"
+
+    @property
+    def columns(self):
+        """The names of the columns seen so far, in the order they first appeared."""
+        return [] if self._moments is None else self._moments.index.tolist()
+
+    @property
+    def row_count(self):
+        """The number of rows seen so far."""
+        return 0 if self._moments is None else int(self._moments['row_count'].max())
+
+    def update(self, df):
+        """
+        Adds the statistics of a new batch of rows to the state, reading only that batch.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            The new rows.
+
+        Raises
+        ------
+        TypeError :
+            If the input for df is not a pandas DataFrame.
+
+        Returns
+        -------
+        ColumnStats
+            The updated state itself, so calls can be chained.
+        """
+        if not isinstance(df, pd.DataFrame):
+            raise TypeError("The first argument must be a pandas DataFrame.")
+        return self._merge_in(_chunk_moments(df))
+
+    def merge(self, other):
+        """
+        Returns a new state combining this state with other, as if every batch of both had been added to one state.
+
+        Parameters
+        ----------
+        other : ColumnStats
+            The state of other rows, for example of a partition processed by another worker.
+
+        Raises
+        ------
+        TypeError :
+            If the input for other is not a ColumnStats.
+
+        Returns
+        -------
+        ColumnStats
+            The combined state. Neither input is changed.
+        """
+        if not isinstance(other, ColumnStats):
+            raise TypeError("other must be a ColumnStats.")
+        merged = ColumnStats()
+        merged._moments = self._moments
+        if other._moments is not None:
+            merged._merge_in(other._moments)
+        return merged
+
+    def statistics(self):
+        """
+        Returns the statistics of every column seen so far, in the format of column_statistics.
+
+        Returns
+        -------
+        pd.DataFrame
+            A dataframe indexed by column with the columns 'null_count', 'missingness', 'mean', 'std' and 'cv'.
+        """
+        if self._moments is None:
+            return column_statistics(pd.DataFrame())
+        return _finalize_moments(self._moments)
+
+    def columns_to_drop(self, threshold, variance=None):
+        """
+        Returns the columns that column_drop_threshold would drop from all the rows seen so far.
+
+        Parameters
+        ----------
+        threshold : float
+            Must be 0 <= threshold <= 1
+            The threshold for the proportion of missing values to allow in each column.
+
+        variance : float
+            Default is None
+            The lowest coefficient of variance to allow in any one column.
+
+        Raises
+        ------
+        ValueError :
+            If the input for threshold is not a float and in the inclusive range 0 and 1.
+            Or if the input for variance is not a float >=0.
+
+        Returns
+        -------
+        list
+            The names of the columns that do not meet the thresholds, in the order they first appeared.
+        """
+        _validate_thresholds(threshold, variance)
+        stats = self.statistics()
+        return stats.index[_drop_mask(stats, threshold, variance)].tolist()
+
+    def to_dict(self):
+        """
+        Returns the state as a dict of lists that json.dumps can write, with None for undefined means.
+        """
+        if self._moments is None:
+            return {'columns': [], **{field: [] for field in self._FIELDS}}
+        state = {'columns': self.columns}
+        for field in self._FIELDS:
+            values = self._moments[field].to_numpy()
+            if field == 'mean':
+                state[field] = [None if np.isnan(value) else float(value) for value in values]
+            else:
+                state[field] = values.tolist()
+        return state
+
+    @classmethod
+    def from_dict(cls, state):
+        """
+        Restores a state saved with to_dict.
+
+        Parameters
+        ----------
+        state : dict
+            The output of to_dict.
+
+        Raises
+        ------
+        ValueError :
+            If state is missing any of the saved fields, or its lists have different lengths.
+
+        Returns
+        -------
+        ColumnStats
+            The restored state.
+        """
+        fields = ['columns'] + cls._FIELDS
+        if not (isinstance(state, dict) and all(field in state for field in fields)
+                and len({len(state[field]) for field in fields}) == 1):
+            raise ValueError(f"state must be a dict of equally long lists with the keys {fields}.")
+        restored = cls()
+        if state['columns']:
+            restored._moments = pd.DataFrame({
+                'row_count': np.asarray(state['row_count'], dtype=np.int64),
+                'null_count': np.asarray(state['null_count'], dtype=np.int64),
+                'numeric': np.asarray(state['numeric'], dtype=bool),
+                'count': np.asarray(state['count'], dtype=np.int64),
+                'mean': np.array([np.nan if value is None else value for value in state['mean']], dtype=np.float64),
+                'm2': np.asarray(state['m2'], dtype=np.float64),
+            }, index=pd.Index(state['columns']))
+        return restored
+
+    def _merge_in(self, moments):
+        """Merges a per-column state from _chunk_moments into this one."""
+        self._moments = moments if self._moments is None else _merge_moments(self._moments, moments)
+        return self
+
+
+def _validate_thresholds(threshold, variance):
+    """Checks the threshold and variance arguments shared by the column_drop_threshold functions."""
     # Check that the missingness threshold is a number between 0 and 1
     if not (isinstance(threshold, (int, float)) and 0 <= threshold <= 1):
         raise ValueError("The missingness threshold must be a number between 0 and 1.")
-    
+
     # Check that the coefficient of variance is a positive float
     if variance is not None and not (isinstance(variance, (int, float)) and variance >= 0):
         raise ValueError("The coefficient of variance must be a positive float.")
 
-    columns_to_drop = []	
 
-    for col in df.columns:
-        missing_count = df[col].isnull().sum() # Calculate the total number of missing values in the column
-        total_count = len(df[col])  #Calculate the total number of values in the column 
-        missingness = (missing_count / total_count) # Calculate the proportion of missing values 
-        if missingness > threshold: 
-            columns_to_drop.append(col) # If the missingness proportion is too high add the column to the drop list
-	
+def _chunk_moments(chunk):
+    """
+    Returns the mergeable per-column state of one chunk: 'row_count', 'null_count', 'numeric',
+    and the 'count', 'mean' and 'm2' (sum of squared deviations) of the non-missing numeric values.
+    Columns that are entirely missing in the chunk do not decide whether the column is numeric.
+    """
+    stats = column_statistics(chunk)
+    n_rows = len(chunk)
+    count = n_rows - stats['null_count'].to_numpy()
+    numeric = np.array([_is_numeric_dtype(dtype) for dtype in chunk.dtypes], dtype=bool)
+    numeric |= count == 0
+    std = stats['std'].to_numpy()
+    return pd.DataFrame({
+        'row_count': np.full(len(stats), n_rows, dtype=np.int64),
+        'null_count': stats['null_count'].to_numpy(dtype=np.int64),
+        'numeric': numeric,
+        'count': np.where(numeric, count, 0).astype(np.int64),
+        'mean': np.where(numeric & (count > 0), stats['mean'].to_numpy(), np.nan),
+        'm2': np.where(numeric & (count > 0), std ** 2 * count, 0.0),
+    }, index=stats.index)
+
+
+def _merge_moments(left, right):
+    """
+    Combines two per-column states from _chunk_moments with Chan's parallel update of the mean and variance.
+    A column missing from one side counts as entirely missing for that side's rows.
+    """
+    columns = left.index.append(right.index[~right.index.isin(left.index)])
+    left = _reindex_moments(left, columns)
+    right = _reindex_moments(right, columns)
+
+    n_left = left['count'].to_numpy()
+    n_right = right['count'].to_numpy()
+    n = n_left + n_right
+    mean_left = np.nan_to_num(left['mean'].to_numpy())
+    mean_right = np.nan_to_num(right['mean'].to_numpy())
+    with np.errstate(divide='ignore', invalid='ignore'):
+        delta = mean_right - mean_left
+        mean = np.where(n > 0, mean_left + delta * n_right / n, np.nan)
+        m2 = left['m2'].to_numpy() + right['m2'].to_numpy() + np.where(n > 0, delta ** 2 * n_left * n_right / n, 0.0)
+
+    return pd.DataFrame({
+        'row_count': left['row_count'].to_numpy() + right['row_count'].to_numpy(),
+        'null_count': left['null_count'].to_numpy() + right['null_count'].to_numpy(),
+        'numeric': left['numeric'].to_numpy() & right['numeric'].to_numpy(),
+        'count': n,
+        'mean': mean,
+        'm2': m2,
+    }, index=columns)
+
+
+def _reindex_moments(moments, columns):
+    """Aligns a per-column state to columns, treating the absent columns as entirely missing."""
+    # Every column of a state has seen the same rows, since absent columns are padded on each merge
+    n_rows = int(moments['row_count'].max()) if len(moments) else 0
+    moments = moments.reindex(columns)
+    absent = moments['row_count'].isna().to_numpy()
+    if absent.any():
+        moments.loc[absent, ['row_count', 'null_count']] = n_rows
+        moments.loc[absent, ['count', 'm2']] = 0
+        moments.loc[absent, 'numeric'] = True
+    return moments.astype({'row_count': np.int64, 'null_count': np.int64, 'count': np.int64, 'numeric': bool})
+
+
+def _finalize_moments(moments):
+    """Turns a merged per-column state into the statistics returned by column_statistics."""
+    null_count = moments['null_count'].to_numpy()
+    numeric = moments['numeric'].to_numpy()
+    count = moments['count'].to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        missingness = null_count / moments['row_count'].to_numpy()
+        mean = np.where(numeric & (count > 0), moments['mean'].to_numpy(), np.nan)
+        std = np.where(numeric & (count > 0), np.sqrt(moments['m2'].to_numpy() / count), np.nan)
+        cv = np.where(null_count == 0, std / mean, np.nan)
+    return pd.DataFrame(
+        {'null_count': null_count, 'missingness': missingness, 'mean': mean, 'std': std, 'cv': cv},
+        index=moments.index,
+    )
+
+
+def _statistics(df, n_jobs):
+    """Returns column_statistics(df), computed by worker processes if n_jobs asks for more than one."""
+    if n_jobs is None or n_jobs == 1:
+        return column_statistics(df) # Calculate the missingness and cv of every column in one pass
+    return _column_statistics_parallel(df, os.cpu_count() if n_jobs == -1 else n_jobs)
+
+
+def _drop_mask_estimate(df, threshold, variance, n_jobs, sample_size, confidence):
+    """
+    Returns the drop mask of column_drop_threshold, deciding the columns whose sampled intervals are clear of
+    threshold and variance from a sample of sample_size rows, and computing the exact statistics of the others.
+    """
+    z = scipy.stats.norm.ppf(0.5 + confidence / 2)
+    rows = np.sort(np.random.default_rng(0).choice(len(df), size=sample_size, replace=False))
+    sample = df.iloc[rows]
+    stats = column_statistics(sample)
+
+    # Wilson score interval of the proportion of missing values
+    n = sample_size
+    p = stats['missingness'].to_numpy()
+    center = (p + z ** 2 / (2 * n)) / (1 + z ** 2 / n)
+    half_width = z / (1 + z ** 2 / n) * np.sqrt(p * (1 - p) / n + z ** 2 / (4 * n ** 2))
+    drop = center - half_width > threshold
+    keep = center + half_width <= threshold
+
     if variance is not None:
-        for col in df.select_dtypes(include=['number']).columns: 
-            cv = variation(df[col]) # Calculate the coefficient of variance for the column
-            if cv < variance: 
-                columns_to_drop.append(col) # If the cv is too low add the column to the drop list
-                
-    dropped_df = df.drop(columns=columns_to_drop, errors='ignore') # Drop the specified columns
-	
-    return dropped_df
+        # A column with a missing value has no cv, so the variance rule cannot drop it.
+        # Without one in the sample, it is only safe to keep if the cv is clearly at or above variance.
+        sampled_nulls = stats['null_count'].to_numpy() > 0
+        numeric = np.array([_is_numeric_dtype(dtype) for dtype in df.dtypes], dtype=bool)
+        cv_low = np.full(len(stats), -np.inf)
+        candidates = np.flatnonzero(numeric & ~sampled_nulls & keep)
+        if len(candidates):
+            values = sample.iloc[:, candidates].to_numpy(dtype='float64')
+            cv_low[candidates] = _cv_lower_bound(values, stats['mean'].to_numpy()[candidates],
+                                                 stats['std'].to_numpy()[candidates], z)
+        keep &= ~numeric | sampled_nulls | (cv_low >= variance)
+
+    drop_mask = drop.copy()
+    undecided = np.flatnonzero(~drop & ~keep)
+    if len(undecided):
+        exact = _statistics(df.iloc[:, undecided], n_jobs)
+        drop_mask[undecided] = _drop_mask(exact, threshold, variance)
+    return drop_mask
+
+
+def _cv_lower_bound(values, mean, std, z):
+    """
+    Returns a lower confidence bound of the coefficient of variance of each column of a sampled float block
+    without missing values, from normal intervals of the mean and of the standard deviation (by the delta method,
+    using the sample's fourth moment so it does not assume normal data). -inf where the mean may be 0 or negative.
+    """
+    n = values.shape[0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        m4 = ((values - mean) ** 4).mean(axis=0)
+        std_se = np.sqrt(np.maximum(m4 - std ** 4, 0) / n) / (2 * std)
+        std_low = np.maximum(np.nan_to_num(std - z * std_se), 0)
+        mean_high = mean + z * std / np.sqrt(n)
+        mean_low = mean - z * std / np.sqrt(n)
+        return np.where(mean_low > 0, std_low / mean_high, -np.inf)
+
+
+def _validate_estimate(mode, sample_size, confidence):
+    """Checks the mode, sample_size and confidence arguments of column_drop_threshold."""
+    if mode not in ['exact', 'estimate']:
+        raise ValueError("Invalid value for 'mode'. Must be 'exact' or 'estimate'.")
+    if not (isinstance(sample_size, int) and not isinstance(sample_size, bool) and sample_size > 0):
+        raise ValueError("sample_size must be a positive integer.")
+    if not (isinstance(confidence, float) and 0 < confidence < 1):
+        raise ValueError("confidence must be a float between 0 and 1.")
+
+
+def _column_statistics_parallel(df, n_jobs):
+    """
+    Returns column_statistics(df), with the numeric columns copied once into a column-major float block
+    in shared memory and split into n_jobs contiguous groups of columns, whose null counts and moments
+    are computed by worker processes that attach to the block by name. The null counts of the other columns
+    are computed in this process, since their values are Python objects that cannot be shared.
+    """
+    n_rows, n_cols = df.shape
+    numeric = np.array([_is_numeric_dtype(dtype) for dtype in df.dtypes], dtype=bool)
+    numeric_positions = np.flatnonzero(numeric)
+    if n_rows == 0 or len(numeric_positions) == 0:
+        return column_statistics(df)
+
+    null_count = np.zeros(n_cols, dtype=np.int64)
+    if not numeric.all():
+        null_count[~numeric] = df.iloc[:, np.flatnonzero(~numeric)].isna().to_numpy().sum(axis=0)
+
+    shape = (n_rows, len(numeric_positions))
+    groups = [group for group in np.array_split(np.arange(shape[1]), n_jobs) if len(group)]
+    starts = [int(group[0]) for group in groups]
+    stops = [int(group[-1]) + 1 for group in groups]
+
+    block = shared_memory.SharedMemory(create=True, size=n_rows * shape[1] * np.dtype(np.float64).itemsize)
+    try:
+        # Each column is contiguous in a column-major block, so every group is one contiguous slice of memory
+        values = np.ndarray(shape, dtype=np.float64, buffer=block.buf, order='F')
+        for start, stop in zip(starts, stops):
+            values[:, start:stop] = df.iloc[:, numeric_positions[start:stop]].to_numpy(dtype='float64', na_value=np.nan)
+        del values
+        with ProcessPoolExecutor(max_workers=len(groups)) as pool:
+            results = list(pool.map(_shared_block_statistics, repeat(block.name), repeat(shape), starts, stops))
+    finally:
+        block.close()
+        block.unlink()
+
+    mean = np.full(n_cols, np.nan)
+    std = np.full(n_cols, np.nan)
+    cv = np.full(n_cols, np.nan)
+    null_count[numeric], mean[numeric], std[numeric], cv[numeric] = (
+        np.concatenate(parts) for parts in zip(*results)
+    )
+    with np.errstate(divide='ignore', invalid='ignore'):
+        missingness = null_count / n_rows
+    return pd.DataFrame(
+        {'null_count': null_count, 'missingness': missingness, 'mean': mean, 'std': std, 'cv': cv},
+        index=df.columns,
+    )
+
+
+def _shared_block_statistics(name, shape, start, stop):
+    """
+    Runs in a worker process: attaches to the shared float block called name and returns the null counts,
+    means, standard deviations and coefficients of variance of its columns start to stop.
+    """
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        values = np.ndarray(shape, dtype=np.float64, buffer=block.buf, order='F')[:, start:stop]
+        null_count = np.isnan(values).sum(axis=0)
+        mean, std, cv = _numeric_moments(values, null_count)
+        # The view must be released before the block can be closed
+        del values
+    finally:
+        block.close()
+    return null_count, mean, std, cv
+
+
+def _numeric_moments(values, null_count):
+    """
+    Returns the mean, population standard deviation and coefficient of variance of each column of a 2-D float block
+    with NaN for missing values, given the null count of each column.
+    """
+    n_rows = values.shape[0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = values.mean(axis=0)
+        std = values.std(axis=0)
+        # Only columns with missing values need the slower NaN-aware reductions
+        has_nulls = null_count > 0
+        if has_nulls.any():
+            with_nulls = values[:, has_nulls]
+            counts = n_rows - null_count[has_nulls]
+            sums = np.where(np.isnan(with_nulls), 0.0, with_nulls).sum(axis=0)
+            nan_mean = sums / counts
+            centered = np.where(np.isnan(with_nulls), 0.0, with_nulls - nan_mean)
+            mean[has_nulls] = nan_mean
+            std[has_nulls] = np.sqrt((centered ** 2).sum(axis=0) / counts)
+        cv = std / mean
+    # scipy.stats.variation propagates missing values, so columns with nulls have no cv
+    cv[has_nulls] = np.nan
+    return mean, std, cv
+
+
+def _is_numeric_dtype(dtype):
+    """Mirrors df.select_dtypes(include=['number']), which excludes booleans."""
+    return (pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+            and not pd.api.types.is_complex_dtype(dtype))
+
+
+def _drop_mask(stats, threshold, variance=None):
+    """Returns a boolean array marking the columns of stats that fail the missingness or cv thresholds."""
+    with np.errstate(invalid='ignore'):
+        drop_mask = stats['missingness'].to_numpy() > threshold # Missingness proportion is too high
+        if variance is not None:
+            drop_mask |= stats['cv'].to_numpy() < variance # Coefficient of variance is too low
+    return drop_mask
 
 
@@ -1,7 +1,26 @@
 import pandas as pd
-from collections import defaultdict
+from functools import lru_cache
+from itertools import zip_longest
+import math
 import re
 
+from wrangle_in_py.backends import _backend_for
+from wrangle_in_py.instrumentation import instrumented
+from wrangle_in_py.profiling import Profile
+
+# Compiled once instead of being looked up in re's cache on every call
+_NON_WORD = re.compile(r'[^\w]')
+
+# For ASCII strings, \w is exactly [A-Za-z0-9_] and lower() only changes A-Z,
+# so both steps can be done in a single str.translate
+_ASCII_TABLE = str.maketrans({
+    chr(code): chr(code).lower() if chr(code).isalnum() or chr(code) == '_' else '_'
+    for code in range(128)
+})
+
+# Marks the end of the shorter input in resulting_duplicates
+_EXHAUSTED = object()
+
 def string_standardizer(messy_string):
     """
     Converts the inputted messy_string to lowercase and
@@ -36,21 +55,91 @@ def string_standardizer(messy_string):
     """
     if not isinstance(messy_string, str):
         raise TypeError("messy_string input should be of type string.")
-    new_string = re.sub(r'[^\w]', '_', messy_string)
+    if messy_string.isascii():
+        return messy_string.translate(_ASCII_TABLE)
+    new_string = _NON_WORD.sub('_', messy_string)
     new_string = new_string.lower()
     return new_string
 
+def standardize_strings(strings, cache_size=65536):
+    """
+    Applies string_standardizer to every string in a batch, giving identical output to calling it on each string.
+    Repeated values are only standardized once: a pandas Series or Arrow array is standardized
+    through its unique values, and other iterables go through an LRU cache of cache_size entries.
+    Missing values (None, NaN, pd.NA) are kept missing rather than standardized.
+
+    Parameters
+    ----------
+    strings : iterable of str, pandas Series, or pyarrow Array or ChunkedArray
+        The strings to be standardized.
+
+    cache_size : int
+        Default is 65536
+        The number of recently standardized strings to remember when strings is neither a Series nor an Arrow array.
+        The least recently used string is evicted when the cache is full.
+
+    Raises
+    ------
+    TypeError :
+        If any of the non-missing values is not a string.
+
+    ValueError :
+        If cache_size is not a positive integer.
+
+    Returns
+    -------
+    list, pandas Series or pyarrow Array
+        The standardized strings, in the same kind of container as the input (a list for other iterables).
+        A Series keeps its index and name.
+
+    Examples
+    --------
+    >>> standardize_strings(['Jack Fruit 88', 'PINEAPPLES', 'Jack Fruit 88'])
+    ['jack_fruit_88', 'pineapples', 'jack_fruit_88']
+
+    >>> standardize_strings(pd.Series(['Dragon (Fruit)', None]))
+    0    dragon__fruit_
+    1              None
+    dtype: object
+    """
+    if not (isinstance(cache_size, int) and cache_size > 0):
+        raise ValueError("cache_size must be a positive integer.")
+
+    if isinstance(strings, pd.Series):
+        codes, uniques = pd.factorize(strings, use_na_sentinel=True)
+        standardized = pd.Series([string_standardizer(value) for value in uniques] + [None], dtype=object)
+        # The sentinel code -1 picks the trailing None, so missing values stay missing
+        return pd.Series(standardized.to_numpy()[codes], index=strings.index, name=strings.name, dtype=object)
+
+    if type(strings).__module__.split('.')[0] == 'pyarrow':
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        uniques = pc.unique(strings).drop_null()
+        standardized = pa.array([string_standardizer(value) for value in uniques.to_pylist()], type=pa.string())
+        return pc.take(standardized, pc.index_in(strings, value_set=uniques))
+
+    standardize = lru_cache(maxsize=cache_size)(string_standardizer)
+    return [value if _is_missing(value) else standardize(value) for value in strings]
+
+def _is_missing(value):
+    """Returns True for the scalar missing values None, NaN and pd.NA."""
+    return value is None or value is pd.NA or (isinstance(value, float) and math.isnan(value))
+
 def resulting_duplicates(original_strings, standardized_strings):
     """
     Identifies which strings became duplicates after standardization.
 
+    Both inputs are read once, in step, and validated as they are read, so they can be generators.
+    Only the first original string of each standardized string is remembered,
+    and a list is only built once a second original string maps to it.
+
     Parameters
     ----------
-    original_strings : list of str
-        List of strings before standardization.
+    original_strings : iterable of str
+        Strings before standardization, such as a list or a generator.
         
-    standardized_strings : list of str
-        List of strings after standardization.
+    standardized_strings : iterable of str
+        Strings after standardization, in the same order.
 
     Raises
     ------
@@ -59,7 +148,7 @@ def resulting_duplicates(original_strings, standardized_strings):
         
     TypeError :
         If either of the inputs, original_strings or standardized_strings,
-        are not a list of strings.
+        are not an iterable of strings (a single string is not accepted).
 
     Returns
     -------
@@ -71,33 +160,51 @@ def resulting_duplicates(original_strings, standardized_strings):
     --------
     >>> strings_before = ['Jack Fruit 88.', "Jack!Fruit!88!", "PINEAPPLES"]
     >>> strings_after = ["jack_fruit_88_", "jack_fruit_88_", "pineapples"]
-    >>> identify_duplicates(strings_before, strings_after)
+    >>> resulting_duplicates(strings_before, strings_after)
     {'jack_fruit_88_': ['Jack Fruit 88.', 'Jack!Fruit!88!']}
     """
-    # check if original_strings is a list of strings
-    if not isinstance(original_strings, list) or not all(isinstance(element, str) for element in original_strings):
-        raise TypeError("original_strings must be a list of strings.")
-    
-    # check if standardized_strings is a list of strings
-    if not isinstance(standardized_strings, list) or not all(isinstance(element, str) for element in standardized_strings):
-        raise TypeError("standardized_strings must be a list of strings.")
-    
-    # check if original_strings and standardized_strings are the same length
-    if len(original_strings) != len(standardized_strings):
-        raise ValueError("Both inputs must be of the same length.")
-    
-    # Map standardized names to original names
-    duplicates = defaultdict(list)
+    original_iterator = _iterate_strings(original_strings, "original_strings")
+    standardized_iterator = _iterate_strings(standardized_strings, "standardized_strings")
+
+    # Map standardized strings to the first original string, and to a list only once they collide
+    first_originals = {}
+    duplicates = {}
 
-    for orig, std in zip(original_strings, standardized_strings):
-        duplicates[std].append(orig)
+    for orig, std in zip_longest(original_iterator, standardized_iterator, fillvalue=_EXHAUSTED):
+        # check if original_strings and standardized_strings are the same length
+        if orig is _EXHAUSTED or std is _EXHAUSTED:
+            raise ValueError("Both inputs must be of the same length.")
 
-    # Filter to keep only those with multiple original columns mapping to the same standardized name
-    duplicates = {key: value for key, value in duplicates.items() if len(value) > 1}
+        # check that both elements are strings
+        if not isinstance(orig, str):
+            raise TypeError("original_strings must be an iterable of strings.")
+        if not isinstance(std, str):
+            raise TypeError("standardized_strings must be an iterable of strings.")
+
+        if std in duplicates:
+            duplicates[std].append(orig)
+        elif std in first_originals:
+            duplicates[std] = [first_originals[std], orig]
+        else:
+            first_originals[std] = orig
+
+    # Report the duplicates in the order their standardized strings first appeared
+    if len(duplicates) > 1:
+        duplicates = {key: duplicates[key] for key in first_originals if key in duplicates}
 
     return duplicates
 
-def column_name_standardizer(df):
+def _iterate_strings(strings, name):
+    """Returns an iterator over strings, rejecting a single string and non-iterables with a TypeError."""
+    if isinstance(strings, (str, bytes)):
+        raise TypeError(f"{name} must be an iterable of strings.")
+    try:
+        return iter(strings)
+    except TypeError:
+        raise TypeError(f"{name} must be an iterable of strings.") from None
+
+@instrumented
+def column_name_standardizer(df, copy=True, profile=None):
     """
     Returns a copy of the inputted dataframe with standardized column names.
     Column names will be converted to lowercase and
@@ -107,8 +214,22 @@ def column_name_standardizer(df):
 
     Parameters
     ----------
-    df : pandas DataFrame
-        The input pandas DataFrame whose column names need standardization.
+    df : pandas DataFrame, pyarrow Table or polars DataFrame
+        The input DataFrame whose column names need standardization.
+        A pyarrow Table or polars DataFrame is handled natively and returned as the same type,
+        with only its names rebuilt.
+
+    copy : bool
+        Default is True
+        If True, the data of the returned DataFrame is a deep copy of the data of df.
+        If False, only the column index is rebuilt and the returned DataFrame shares its data with df,
+        so standardizing the headers of a large dataframe takes no extra memory for the data.
+        With pandas Copy-on-Write (the default from pandas 3.0) later changes to either dataframe stay separate;
+        without it, changing values in place in one of them changes the other too.
+
+    profile : Profile or None
+        Default is None
+        The profile(df) of df. If given, the standardized names and collisions it found are reused.
     
     Warnings
     --------
@@ -118,7 +239,12 @@ def column_name_standardizer(df):
     Raises
     ------
     TypeError:
-        If the input dataframe is not a pandas DataFrame.
+        If the input dataframe is not a pandas DataFrame, a pyarrow Table or a polars DataFrame.
+
+    ValueError:
+        If the input for copy is not a boolean.
+        If the input for profile is not a Profile or None, or was computed for a different DataFrame
+        or for a pyarrow Table or polars DataFrame.
 
     Returns
     -------
@@ -135,18 +261,36 @@ def column_name_standardizer(df):
     0           1          3         25
     1           2          4         30
     """
-    if not isinstance(df, pd.DataFrame):
+    backend = _backend_for(df)
+    if backend is None and not isinstance(df, pd.DataFrame):
         raise TypeError("The input must be a pandas DataFrame.")
 
-    original_columns = df.columns.tolist()
-    standardized_columns = [string_standardizer(col) for col in original_columns]
+    if not isinstance(copy, bool):
+        raise ValueError("copy must be True or False.")
+
+    if profile is not None:
+        if not isinstance(profile, Profile):
+            raise ValueError("profile must be a Profile or None.")
+        if backend is not None:
+            raise ValueError("profile is only supported for pandas DataFrames.")
+        profile._check(df)
 
-    duplicates = resulting_duplicates(original_columns, standardized_columns)
+    if backend is not None:
+        return backend.column_name_standardizer(df)
+
+    original_columns = df.columns.tolist()
+    if profile is not None and profile.standardized_columns is not None:
+        standardized_columns = profile.standardized_columns
+        duplicates = profile.name_collisions
+    else:
+        standardized_columns = standardize_strings(original_columns)
+        duplicates = resulting_duplicates(original_columns, standardized_columns)
 
     if bool(duplicates):
         import warnings
         warnings.warn(f"Duplicate column names found after standardization: {duplicates}")
 
-    standardized_df = df.copy()
+    # A shallow copy gets its own column index but shares the underlying blocks with df
+    standardized_df = df.copy(deep=copy)
     standardized_df.columns = standardized_columns
     return standardized_df
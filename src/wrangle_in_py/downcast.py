@@ -0,0 +1,160 @@
+import numpy as np
+import pandas as pd
+
+from wrangle_in_py.instrumentation import instrumented
+
+# The integer dtypes tried for a column, smallest first
+_SIGNED = (np.int8, np.int16, np.int32)
+_UNSIGNED = (np.uint8, np.uint16, np.uint32)
+
+
+@instrumented
+def downcast_dtypes(df, columns=None, max_category_ratio=0.5, float32=True):
+    """
+    Returns a copy of the inputted dataframe with each column stored in the smallest dtype that holds
+    its values exactly, and prints the number of bytes saved.
+
+    Integer columns, including the nullable Int64 columns made by extracting_ymd and extracting_hms,
+    get the smallest integer dtype of the same kind (signed or unsigned, nullable or not) that fits
+    their smallest and largest values, such as int8 for a month or a second. Float columns become float32
+    when every value survives the round trip unchanged. String columns become 'category' when they have
+    few distinct values compared to their length and the categorical is smaller. Other columns,
+    and columns that cannot be made smaller, share their data with df.
+
+    Parameters
+    ----------
+    df : pandas DataFrame
+        The input pandas DataFrame to shrink.
+
+    columns : list or None
+        List of column names to downcast.
+        If None (default), downcast every column.
+
+    max_category_ratio : float
+        Default is 0.5
+        Must be 0 <= max_category_ratio <= 1
+        The largest proportion of distinct values among the non-missing values
+        for a string column to be converted to 'category'. 0 never converts string columns.
+
+    float32 : bool
+        Default is True
+        If False, float columns keep their precision.
+
+    Raises
+    ------
+    TypeError :
+        If the input dataframe is not a pandas DataFrame.
+
+    KeyError :
+        If any column in columns is not a column in df.
+
+    ValueError :
+        If the input for max_category_ratio is not a number in the inclusive range 0 and 1.
+        Or if the input for float32 is not a bool.
+
+    Returns
+    -------
+    pandas.DataFrame :
+        A new DataFrame with the same values in smaller dtypes. The number of bytes saved is printed.
+
+    Example
+    -------
+    >>> df = pd.DataFrame({'date': pd.to_datetime(['2024-01-07', '2023-12-25', '2024-01-07']),
+    ...                    'fruit': ['kiwi', 'kiwi', 'peach'], 'weight': [1.5, 2.25, 3.0]})
+    >>> result = downcast_dtypes(extracting_ymd(df, 'date'))
+    72 bytes saved (298 -> 226 bytes).
+    >>> result.dtypes
+    date          datetime64[us]
+    fruit                    str
+    weight               float32
+    date_year              Int16
+    date_month              Int8
+    date_day                Int8
+    dtype: object
+    """
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("The input must be a pandas DataFrame.")
+
+    if columns is not None:
+        missing = [col for col in columns if col not in df.columns]
+        if missing:
+            raise KeyError(f"Columns {missing} do not exist in the DataFrame.")
+
+    if (not isinstance(max_category_ratio, (int, float)) or isinstance(max_category_ratio, bool)
+            or not 0 <= max_category_ratio <= 1):
+        raise ValueError("max_category_ratio must be a number between 0 and 1 inclusive.")
+
+    if not isinstance(float32, bool):
+        raise ValueError("float32 must be True or False.")
+
+    chosen = set(df.columns) if columns is None else set(columns)
+    result = df.copy(deep=False)
+    for position, col in enumerate(df.columns):
+        if col not in chosen:
+            continue
+        downcast = _downcast_series(df.iloc[:, position], max_category_ratio, float32)
+        if downcast is not None:
+            result.isetitem(position, downcast)
+
+    before = int(df.memory_usage(deep=True).sum())
+    after = int(result.memory_usage(deep=True).sum())
+    print(f"{before - after} bytes saved ({before} -> {after} bytes).")
+    return result
+
+
+def _downcast_series(series, max_category_ratio, float32):
+    """Returns series in a smaller dtype that holds the same values, or None if there is none."""
+    array = series.array
+    masked = isinstance(array, (pd.arrays.IntegerArray, pd.arrays.FloatingArray))
+    # The dtype of the values, without the mask of nullable columns
+    dtype = series.dtype.numpy_dtype if masked else series.dtype
+
+    if isinstance(dtype, np.dtype) and dtype.kind in 'iu':
+        target = _smallest_integer_dtype(series, dtype)
+        if target is None:
+            return None
+        if masked:
+            return series.astype(('UInt' if target.kind == 'u' else 'Int') + str(8 * target.itemsize))
+        return series.astype(target)
+
+    if float32 and isinstance(dtype, np.dtype) and dtype.kind == 'f' and dtype.itemsize > 4:
+        values = series.dropna().to_numpy(dtype=np.float64) if masked else series.to_numpy()
+        with np.errstate(over='ignore'):
+            exact = np.array_equal(values.astype(np.float32).astype(np.float64), values, equal_nan=True)
+        if not exact:
+            return None
+        return series.astype('Float32' if masked else np.float32)
+
+    if max_category_ratio > 0 and _holds_strings(series):
+        non_missing = series.count()
+        if non_missing == 0 or series.nunique(dropna=True) > max_category_ratio * non_missing:
+            return None
+        categorical = series.astype('category')
+        if categorical.memory_usage(deep=True, index=False) >= series.memory_usage(deep=True, index=False):
+            return None
+        return categorical
+
+    return None
+
+
+def _smallest_integer_dtype(series, dtype):
+    """Returns the smallest integer dtype of the kind of dtype, narrower than it, that fits series, or None."""
+    if series.count() == 0:
+        low, high = 0, 0
+    else:
+        low, high = int(series.min()), int(series.max())
+    for candidate in (_UNSIGNED if dtype.kind == 'u' else _SIGNED):
+        candidate = np.dtype(candidate)
+        if candidate.itemsize >= dtype.itemsize:
+            return None
+        info = np.iinfo(candidate)
+        if info.min <= low and high <= info.max:
+            return candidate
+    return None
+
+
+def _holds_strings(series):
+    """Returns True for string columns, and object columns whose non-missing values are all strings."""
+    if isinstance(series.dtype, pd.StringDtype):
+        return True
+    return series.dtype == object and pd.api.types.infer_dtype(series, skipna=True) == 'string'
@@ -1,25 +1,43 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pandas as pd
 
-def extracting_ymd(df, column):
+from wrangle_in_py.backends import _backend_for
+from wrangle_in_py.instrumentation import instrumented
+
+@instrumented
+def extracting_ymd(df, column, format=None):
     """
     Returns a copy of the input DataFrame with three new columns: year, month, and day,
     extracted from the specified datetime column.
 
     Parameters
     ----------
-    df : pandas.DataFrame
+    df : pandas.DataFrame, pyarrow.Table or polars.DataFrame
         The DataFrame containing the datetime column.
+        A pyarrow Table or polars DataFrame is handled natively with Arrow compute kernels or polars expressions
+        (int64 columns are added, and a string column is parsed with the library's strptime) and returned as the same type.
         
     column : str
         The name of the datetime column to extract from.
 
+    format : str or None
+        The fixed-width format of a string column, such as '%Y-%m-%d %H:%M:%S'.
+        If given, a string column is parsed straight into the new columns without converting it to datetime first.
+        See extract_datetime_parts for the supported directives.
+
     Raises
     -------
     KeyError :
         If the input column is not a column in df.
         
     TypeError :
-        If the input column is not of datetime type.
+        If the input column is not of datetime type, or of string type when format is given.
+
+    ValueError :
+        If format is not supported or a string in the column does not match it.
 
     Returns
     -------
@@ -36,52 +54,58 @@ def extracting_ymd(df, column):
     0 2024-01-07 12:30:45             2024                1             7
     1 2023-12-25 08:15:30             2023               12            25
     """
-    # Check if the column exists
-    if column not in df.columns:
-        raise KeyError(f"Column '{column}' does not exist in the DataFrame.")
+    # A pyarrow Table or polars DataFrame is handled natively by its backend
+    backend = _backend_for(df)
+    if backend is not None:
+        if format is not None:
+            _compile_format(format)
+        return backend.extract_parts(df, column, ['year', 'month', 'day'], format)
 
-    # Check if the column is of datetime type
-    if not pd.api.types.is_datetime64_any_dtype(df[column]):
-        raise TypeError(f"Column '{column}' must be of datetime type.")
+    # Check that the column exists and is of datetime type (or string type when a format is given)
+    _validate_column(df, column, format)
 
     # Create a copy of the DataFrame to avoid modifying the original
     result = df.copy()
 
-    # Ensure empty datetime columns are correctly handled
-    if result.empty:     
-        result[f"{column}_year"] = pd.Series(dtype="Int64")
-        result[f"{column}_month"] = pd.Series(dtype="Int64")
-        result[f"{column}_day"] = pd.Series(dtype="Int64")
-        return result
-
-    # Extract hour, minute, and second into new columns
-    result[f"{column}_year"] = result[column].dt.year.astype("Int64")
-    result[f"{column}_month"] = result[column].dt.month.astype("Int64")
-    result[f"{column}_day"] = result[column].dt.day.astype("Int64")
+    # Extract year, month, and day into new columns from a single decomposition of the timestamps
+    components, mask = _column_components(result[column], ['year', 'month', 'day'], format)
+    for part in ['year', 'month', 'day']:
+        result[f"{column}_{part}"] = pd.arrays.IntegerArray(components[part].astype(np.int64), mask.copy())
 
     return result
 
 
-def extracting_hms(df, column):
+@instrumented
+def extracting_hms(df, column, format=None):
     """
     Returns a copy of the input DataFrame with three new columns: hour, minute, and second,
     extracted from the specified datetime column.
 
     Parameters
     -----------
-    df : pd.DataFrame
+    df : pd.DataFrame, pyarrow.Table or polars.DataFrame
         The DataFrame containing the datetime column.
+        A pyarrow Table or polars DataFrame is handled natively with Arrow compute kernels or polars expressions
+        (int64 columns are added, and a string column is parsed with the library's strptime) and returned as the same type.
         
     column : str
         The name of the datetime column to extract from.
-        
+
+    format : str or None
+        The fixed-width format of a string column, such as '%Y-%m-%d %H:%M:%S'.
+        If given, a string column is parsed straight into the new columns without converting it to datetime first.
+        See extract_datetime_parts for the supported directives.
+
     Raises
     -------
     KeyError :
         If the input column is not a column in df.
         
     TypeError :
-        If the input column is not of datetime type.
+        If the input column is not of datetime type, or of string type when format is given.
+
+    ValueError :
+        If format is not supported or a string in the column does not match it.
 
     Returns
     -------
@@ -99,28 +123,431 @@ def extracting_hms(df, column):
     1 2023-12-25 08:15:30              8                15               30
     """
 
-    # Check if the column exists
-    if column not in df.columns:
-        raise KeyError(f"Column '{column}' does not exist in the DataFrame.")
+    # A pyarrow Table or polars DataFrame is handled natively by its backend
+    backend = _backend_for(df)
+    if backend is not None:
+        if format is not None:
+            _compile_format(format)
+        return backend.extract_parts(df, column, ['hour', 'minute', 'second'], format)
 
-    # Check if the column is of datetime type
-    if not pd.api.types.is_datetime64_any_dtype(df[column]):
-        raise TypeError(f"Column '{column}' must be of datetime type.")
+    # Check that the column exists and is of datetime type (or string type when a format is given)
+    _validate_column(df, column, format)
 
     # Create a copy of the DataFrame to avoid modifying the original
     result = df.copy()
 
-    # Ensure empty datetime columns are correctly handled
-    if result.empty:     
-        result[f"{column}_hour"] = pd.Series(dtype="Int64")
-        result[f"{column}_minute"] = pd.Series(dtype="Int64")
-        result[f"{column}_second"] = pd.Series(dtype="Int64")
+    # Extract hour, minute, and second into new columns from a single decomposition of the timestamps
+    components, mask = _column_components(result[column], ['hour', 'minute', 'second'], format)
+    for part in ['hour', 'minute', 'second']:
+        result[f"{column}_{part}"] = pd.arrays.IntegerArray(components[part].astype(np.int64), mask.copy())
+
+    return result
+
+
+
+# The date and time components extract_datetime_parts can produce, and the ones it produces by default
+DATETIME_PARTS = ('year', 'month', 'day', 'hour', 'minute', 'second', 'millisecond', 'weekday', 'quarter')
+_DEFAULT_PARTS = ('year', 'month', 'day', 'hour', 'minute', 'second')
+
+_TICKS_PER_SECOND = {'s': 1, 'ms': 10**3, 'us': 10**6, 'ns': 10**9}
+_SECONDS_PER_DAY = 86_400
+_PANDAS_MAJOR = int(pd.__version__.split('.')[0])
+
+
+@instrumented
+def extract_datetime_parts(df, column, parts=_DEFAULT_PARTS, n_jobs=None, tz=None, calendar_cache=False,
+                           format=None):
+    """
+    Returns the input DataFrame with one new column for each requested date or time component
+    of the specified datetime column or columns.
+
+    The datetime values are decomposed once into every requested component with integer arithmetic
+    on the underlying int64 timestamps, instead of once per component, and the input is not deep-copied:
+    the returned DataFrame shares the data of its existing columns with df, however many columns are extracted from.
+    The new columns use the smallest nullable integer dtype that fits (Int16 for the year when it fits, Int8 otherwise)
+    and missing (NaT) timestamps give missing values in every new column.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The DataFrame containing the datetime column.
+
+    column : str or list of str
+        The name of the datetime column to extract from, or a list of datetime column names.
+
+    parts : list of str
+        Default is ('year', 'month', 'day', 'hour', 'minute', 'second')
+        The components to extract, in the order the new columns should be added. Any of
+        'year', 'month', 'day', 'hour', 'minute', 'second', 'millisecond', 'weekday' (Monday=0) and 'quarter'.
+        Timezone-aware columns are decomposed in their own timezone, like the pandas .dt accessor.
+
+    n_jobs : int or None
+        The number of threads to decompose the columns on, or -1 to use every CPU.
+        If None (default), the columns are decomposed one after another.
+        The NumPy arithmetic releases the GIL, so the columns are decomposed in parallel.
+
+    tz : str, datetime.tzinfo or None
+        The timezone to convert timezone-aware columns to before decomposing them.
+        If None (default), each column is decomposed in its own timezone.
+        The conversion looks up the UTC offset once per distinct day rather than once per row,
+        and only converts rows one by one on days where the offset changes (daylight saving transitions).
+
+    calendar_cache : bool
+        Default is False
+        If True, the year, month, day, quarter and weekday are computed once per distinct day
+        and broadcast back to the rows, which is much less work when many rows fall on few days.
+        Timezone-aware columns also use the per-day UTC offsets described for tz.
+
+    format : str or None
+        The fixed-width format of string columns, made of the directives '%Y' (4 digits), '%m', '%d', '%H', '%M'
+        and '%S' (2 digits each) and literal characters, such as the ISO-8601 '%Y-%m-%dT%H:%M:%S'.
+        If given, string columns are parsed straight into the requested components by slicing the digits
+        out of each string, without converting the column to datetime first. Missing strings give missing values,
+        and components absent from the format default to 1900-01-01 00:00:00, as with pandas.to_datetime.
+        Datetime columns are decomposed as usual.
+
+    Raises
+    -------
+    TypeError :
+        If df is not a pandas DataFrame, or an input column is not of datetime type
+        (or of string type when format is given).
+
+    KeyError :
+        If an input column is not a column in df.
+
+    ValueError :
+        If parts is empty or contains an unknown component.
+        If the input for n_jobs is not a positive integer, -1 or None.
+        If tz is given and an input column is not timezone-aware.
+        If format is not supported or a string in an input column does not match it.
+
+    Returns
+    -------
+    pandas.DataFrame :
+        The input DataFrame with added columns '<column>_<part>' for every column and part,
+        grouped by column.
+
+    Example
+    -------
+    >>> df = pd.DataFrame({'timestamp': pd.to_datetime(['2024-01-07 12:30:45.250', '2023-12-25 08:15:30.000'])})
+    >>> extract_datetime_parts(df, 'timestamp', parts=['year', 'quarter', 'weekday', 'millisecond'])
+                    timestamp  timestamp_year  timestamp_quarter  timestamp_weekday  timestamp_millisecond
+    0 2024-01-07 12:30:45.250            2024                  1                  6                    250
+    1 2023-12-25 08:15:30.000            2023                  4                  0                      0
+    """
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("The first argument must be a pandas DataFrame.")
+
+    columns = [column] if isinstance(column, str) else list(column)
+    for col in columns:
+        _validate_column(df, col, format)
+
+    parts = _validate_parts(parts)
+
+    if tz is not None:
+        naive = [col for col in columns
+                 if not pd.api.types.is_datetime64_any_dtype(df[col]) or df[col].dt.tz is None]
+        if naive:
+            raise ValueError(f"Columns {naive} must be timezone-aware to be converted to tz.")
+
+    if n_jobs is not None and not (isinstance(n_jobs, int) and not isinstance(n_jobs, bool) and (n_jobs >= 1 or n_jobs == -1)):
+        raise ValueError("n_jobs must be a positive integer, -1 or None.")
+
+    def extract(col):
+        components, mask = _column_components(df[col], parts, format, tz=tz, calendar_cache=calendar_cache)
+        return {f"{col}_{part}": pd.arrays.IntegerArray(components[part], mask.copy()) for part in parts}
+
+    if n_jobs is None or n_jobs == 1 or len(columns) == 1:
+        extracted = [extract(col) for col in columns]
+    else:
+        with ThreadPoolExecutor(max_workers=os.cpu_count() if n_jobs == -1 else n_jobs) as pool:
+            extracted = list(pool.map(extract, columns))
+
+    new_columns = {name: values for columns_parts in extracted for name, values in columns_parts.items()}
+    return _append_columns(df, new_columns)
+
+
+def _append_columns(df, new_columns):
+    """
+    Returns df with new_columns (a dict of arrays) added at the end, sharing the existing columns with df.
+    Columns that already exist in df are replaced in place, as with df[name] = values.
+    """
+    if any(name in df.columns for name in new_columns):
+        # A shallow copy shares the existing columns with df, only the new columns are allocated
+        result = df.copy(deep=False)
+        for name, values in new_columns.items():
+            result[name] = values
         return result
 
-    # Extract hour, minute, and second into new columns
-    result[f"{column}_hour"] = result[column].dt.hour.astype("Int64")
-    result[f"{column}_minute"] = result[column].dt.minute.astype("Int64")
-    result[f"{column}_second"] = result[column].dt.second.astype("Int64")
+    # A single concat avoids fragmenting the frame when many columns are added
+    new = pd.DataFrame(new_columns, index=df.index, copy=False)
+    if _PANDAS_MAJOR < 3:
+        return pd.concat([df, new], axis=1, copy=False)
+    return pd.concat([df, new], axis=1)
+
+
+def _validate_column(df, column, format=None):
+    """Checks that column is in df and is of datetime type, or of string type when a (supported) format is given."""
+    if format is not None:
+        _compile_format(format)
+    if column not in df.columns:
+        raise KeyError(f"Column '{column}' does not exist in the DataFrame.")
+    if pd.api.types.is_datetime64_any_dtype(df[column]):
+        return
+    if format is None:
+        raise TypeError(f"Column '{column}' must be of datetime type.")
+    # An empty or all-missing column has no values to check, and gives missing parts
+    if pd.api.types.infer_dtype(df[column], skipna=True) not in ('string', 'empty'):
+        raise TypeError(f"Column '{column}' must be of datetime or string type.")
+
+
+def _validate_parts(parts):
+    """Checks that parts is a non-empty collection of known datetime components and returns it as a list."""
+    if isinstance(parts, str):
+        parts = [parts]
+    parts = list(parts)
+    if not parts:
+        raise ValueError("parts must contain at least one datetime component.")
+    unknown = [part for part in parts if part not in DATETIME_PARTS]
+    if unknown:
+        raise ValueError(f"Unknown datetime components {unknown}. Must be among {list(DATETIME_PARTS)}.")
+    return parts
+
+
+def _column_components(series, parts, format=None, tz=None, calendar_cache=False):
+    """Decomposes a datetime Series, or parses a string Series with format, into the requested components."""
+    if format is not None and not pd.api.types.is_datetime64_any_dtype(series):
+        return _parse_fixed_width(series, format, parts)
+    return _datetime_components(series, parts, tz=tz, calendar_cache=calendar_cache)
+
+
+def _datetime_components(series, parts, tz=None, calendar_cache=False):
+    """
+    Decomposes a datetime Series into the requested components in a single pass over its int64 ticks.
+    Returns a dict of compact integer arrays (values under missing entries are 0) and the shared boolean null mask.
+    With tz or calendar_cache, timezone-aware values are shifted to local time with one UTC offset per distinct day.
+    """
+    target_tz = series.dt.tz if tz is None else tz
+    if series.dt.tz is not None and (tz is not None or calendar_cache):
+        values = series.dt.tz_convert('UTC').dt.tz_localize(None).to_numpy()
+    elif series.dt.tz is not None:
+        # Decompose the wall-clock time in the column's own timezone, as the .dt accessor does
+        values = series.dt.tz_localize(None).to_numpy()
+        target_tz = None
+    else:
+        values = series.to_numpy()
+        target_tz = None
+
+    ticks_per_second = _TICKS_PER_SECOND[np.datetime_data(values.dtype)[0]]
+    mask = np.isnat(values)
+    ticks = np.where(mask, 0, values.view(np.int64))
+    if target_tz is not None:
+        ticks = _utc_to_local_ticks(ticks, values.dtype, target_tz, ticks_per_second)
+    return _components_from_ticks(ticks, ticks_per_second, parts, calendar_cache), mask
+
+
+def _utc_to_local_ticks(ticks, dtype, tz, ticks_per_second):
+    """
+    Shifts UTC ticks to wall-clock ticks in tz. The UTC offset is looked up once per distinct UTC day
+    (at its first and last tick) and broadcast through the day codes; only rows on a day where the offset
+    changes, such as a daylight saving transition, are converted one by one.
+    """
+    ticks_per_day = _SECONDS_PER_DAY * ticks_per_second
+    codes, unique_days = pd.factorize(np.floor_divide(ticks, ticks_per_day))
+
+    def offsets(instants):
+        local = pd.DatetimeIndex(instants.astype(dtype), tz='UTC').tz_convert(tz).tz_localize(None)
+        return local.to_numpy().astype(dtype).view(np.int64) - instants
+
+    day_starts = unique_days * ticks_per_day
+    start_offsets = offsets(day_starts)
+    end_offsets = offsets(day_starts + ticks_per_day - 1)
+
+    local_ticks = ticks + start_offsets[codes]
+    is_transition_day = start_offsets != end_offsets
+    if is_transition_day.any():
+        rows = np.flatnonzero(is_transition_day[codes])
+        local_ticks[rows] = ticks[rows] + offsets(ticks[rows])
+    return local_ticks
+
+
+def _components_from_ticks(ticks, ticks_per_second, parts, calendar_cache=False):
+    """
+    Computes the requested components of int64 ticks since the epoch, only doing the arithmetic each part needs.
+    With calendar_cache, the calendar date is computed once per distinct day and broadcast through the day codes.
+    """
+    ticks_per_day = _SECONDS_PER_DAY * ticks_per_second
+    days, time_of_day = np.divmod(ticks, ticks_per_day)
+    components = {}
+
+    if calendar_cache and {'year', 'month', 'day', 'quarter', 'weekday'} & set(parts):
+        codes, unique_days = pd.factorize(days)
+        calendar = _components_from_ticks(unique_days * ticks_per_day, ticks_per_second,
+                                          ['year', 'month', 'day', 'quarter', 'weekday'])
+        components.update({part: values[codes] for part, values in calendar.items()})
+
+    elif {'year', 'month', 'day', 'quarter'} & set(parts):
+        year, month, day = _civil_from_days(days)
+        components['year'] = year.astype(np.int16 if _fits(year, np.int16) else np.int32)
+        components['month'] = month.astype(np.int8)
+        components['day'] = day.astype(np.int8)
+        components['quarter'] = ((month - 1) // 3 + 1).astype(np.int8)
+
+    if {'hour', 'minute', 'second', 'millisecond'} & set(parts):
+        seconds, subsecond = np.divmod(time_of_day, ticks_per_second)
+        components['hour'] = (seconds // 3600).astype(np.int8)
+        components['minute'] = (seconds // 60 % 60).astype(np.int8)
+        components['second'] = (seconds % 60).astype(np.int8)
+        components['millisecond'] = (subsecond * 1000 // ticks_per_second).astype(np.int16)
+
+    if 'weekday' in parts and 'weekday' not in components:
+        # 1970-01-01 was a Thursday, so the epoch day has weekday 3 with Monday=0
+        components['weekday'] = ((days + 3) % 7).astype(np.int8)
+
+    return {part: components[part] for part in parts}
+
+
+# The fixed-width directives a format can use, with their widths and the value a missing directive defaults to
+_FORMAT_DIRECTIVES = {
+    'Y': ('year', 4, 1900), 'm': ('month', 2, 1), 'd': ('day', 2, 1),
+    'H': ('hour', 2, 0), 'M': ('minute', 2, 0), 'S': ('second', 2, 0),
+}
+_DAYS_IN_MONTH = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], dtype=np.int32)
+
+
+def _compile_format(format):
+    """
+    Splits a fixed-width format into the position and width of each field and the position of each literal character.
+    Raises a ValueError for formats that are not made only of the supported directives and literals.
+    """
+    if not isinstance(format, str) or not format:
+        raise ValueError("format must be a non-empty string.")
+    fields, literals = {}, []
+    position, i = 0, 0
+    while i < len(format):
+        if format[i] != '%':
+            literals.append((position, format[i]))
+            position, i = position + 1, i + 1
+            continue
+        directive = format[i + 1:i + 2]
+        if directive == '%':
+            literals.append((position, '%'))
+        elif directive in _FORMAT_DIRECTIVES:
+            field, width, _ = _FORMAT_DIRECTIVES[directive]
+            if field in fields:
+                raise ValueError(f"format repeats the directive '%{directive}'.")
+            fields[field] = (position, width)
+            position += width - 1
+        else:
+            raise ValueError(f"Unsupported format directive '%{directive}'. "
+                             f"Must be among {['%' + d for d in _FORMAT_DIRECTIVES]} or '%%'.")
+        position, i = position + 1, i + 2
+    if not fields:
+        raise ValueError("format must contain at least one of the directives "
+                         f"{['%' + d for d in _FORMAT_DIRECTIVES]}.")
+    return fields, literals, position
+
+
+def _parse_fixed_width(series, format, parts):
+    """
+    Parses a string Series with a fixed-width format into the requested components, without building datetimes.
+    The strings are laid out as a 2-D array of code units (bytes for ASCII, UCS4 code points otherwise),
+    so each field is a few columns of digits converted with vectorized multiply-adds.
+    Returns the same (components, mask) as _datetime_components.
+    """
+    fields, literals, width = _compile_format(format)
+    values = series.to_numpy(dtype=object)
+    # One extra character per string shows strings that are longer than the format.
+    # Missing values become strings such as 'None' or 'nan', which have no digits and never match.
+    try:
+        strings = np.asarray(values, dtype=f'S{width + 1}' if format.isascii() else f'U{width + 1}')
+    except UnicodeEncodeError:
+        strings = np.asarray(values, dtype=f'U{width + 1}')
+    code_units = strings.view(np.uint8 if strings.dtype.kind == 'S' else np.uint32).reshape(len(strings), width + 1)
+    zero = code_units.dtype.type(ord('0'))
+
+    matches = code_units[:, width] == 0
+    for position, character in literals:
+        matches &= code_units[:, position] == ord(character)
+
+    fields_values = {}
+    for field, (position, field_width) in fields.items():
+        field_values = np.zeros(len(strings), dtype=np.int16)
+        for column in range(position, position + field_width):
+            # Code units below '0' wrap around to large unsigned values, so one comparison checks for a digit
+            digit = code_units[:, column] - zero
+            matches &= digit < 10
+            field_values *= 10
+            field_values += digit.astype(np.int16)
+        fields_values[field] = field_values
+    year, month, day, hour, minute, second = (
+        fields_values.get(field, np.full(len(strings), default, dtype=np.int16))
+        for field, _, default in _FORMAT_DIRECTIVES.values()
+    )
+
+    matches &= (month >= 1) & (month <= 12) & (hour <= 23) & (minute <= 59) & (second <= 59) & (day >= 1)
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    matches &= day <= _DAYS_IN_MONTH[np.clip(month, 1, 12) - 1] + ((month == 2) & leap)
+
+    mask = np.zeros(len(strings), dtype=bool)
+    unmatched = np.flatnonzero(~matches)
+    if len(unmatched):
+        mask[unmatched] = pd.isna(values[unmatched])
+        bad = unmatched[~mask[unmatched]]
+        if len(bad):
+            raise ValueError(f"time data \"{values[bad[0]]}\" doesn't match format \"{format}\".")
+        for field_values in (year, month, day, hour, minute, second):
+            field_values[mask] = 0
+
+    components = {}
+    if {'year', 'month', 'day', 'quarter'} & set(parts):
+        # Four digits always fit in Int16
+        components['year'] = year
+        components['month'] = month.astype(np.int8)
+        components['day'] = day.astype(np.int8)
+        components['quarter'] = ((month + 2) // 3).astype(np.int8)
+    if {'hour', 'minute', 'second', 'millisecond'} & set(parts):
+        components['hour'] = hour.astype(np.int8)
+        components['minute'] = minute.astype(np.int8)
+        components['second'] = second.astype(np.int8)
+        components['millisecond'] = np.zeros(len(strings), dtype=np.int16)
+    if 'weekday' in parts:
+        days = _days_from_civil(year.astype(np.int64), month, day)
+        components['weekday'] = np.where(mask, 0, (days + 3) % 7).astype(np.int8)
+    return {part: components[part] for part in parts}, mask
+
+
+def _days_from_civil(year, month, day):
+    """
+    Converts proleptic Gregorian year, month and day arrays to days since 1970-01-01
+    (Howard Hinnant's days-from-civil algorithm, vectorized), the inverse of _civil_from_days.
+    """
+    year = year - (month <= 2)
+    era = np.floor_divide(year, 400)
+    year_of_era = year - era * 400
+    day_of_year = (153 * np.where(month > 2, month - 3, month + 9) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return era * 146_097 + day_of_era - 719_468
+
+
+def _civil_from_days(days):
+    """
+    Converts days since 1970-01-01 to proleptic Gregorian year, month and day arrays
+    (Howard Hinnant's days-to-civil algorithm, vectorized).
+    """
+    shifted = days + 719_468
+    era = np.floor_divide(shifted, 146_097)
+    day_of_era = shifted - era * 146_097
+    year_of_era = (day_of_era - day_of_era // 1460 + day_of_era // 36_524 - day_of_era // 146_096) // 365
+    day_of_year = day_of_era - (365 * year_of_era + year_of_era // 4 - year_of_era // 100)
+    month_from_march = (5 * day_of_year + 2) // 153
+    day = day_of_year - (153 * month_from_march + 2) // 5 + 1
+    month = np.where(month_from_march < 10, month_from_march + 3, month_from_march - 9)
+    year = year_of_era + era * 400 + (month <= 2)
+    return year, month, day
 
-    return result
 
+def _fits(values, dtype):
+    """Returns True if every value fits in the integer dtype."""
+    info = np.iinfo(dtype)
+    return values.size == 0 or (values.min() >= info.min and values.max() <= info.max)
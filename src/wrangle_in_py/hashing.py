@@ -0,0 +1,283 @@
+import numpy as np
+import pandas as pd
+
+def hash_rows(df, subset_columns=None):
+    """
+    Returns one 64-bit hash per row of the dataframe, computed from the values in subset_columns.
+    Rows with equal values in subset_columns always have equal hashes, so the hashes can stand in for the rows
+    when looking for duplicates. Different rows share a hash with a probability of about 2**-64.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The dataframe whose rows need to be hashed.
+
+    subset_columns : list or None
+        List of column names to hash.
+        If None (default), hash all columns.
+
+    Returns
+    -------
+    np.ndarray
+        A uint64 array with one hash per row of df.
+
+    Example
+    -------
+    >>> df = pd.DataFrame({'A': [1, 2, 1], 'B': [5, 6, 7]})
+    >>> hashes = hash_rows(df, subset_columns=['A'])
+    >>> hashes[0] == hashes[2]
+    True
+    """
+    subset = df if subset_columns is None else df[subset_columns]
+    return pd.util.hash_pandas_object(subset, index=False).to_numpy()
+
+
+class UInt64HashTable:
+    """
+    A growable open-addressing hash table of uint64 keys backed by NumPy arrays,
+    with a count kept for every key. Lookups and inserts work on whole arrays of keys at a time,
+    so its memory is proportional to the number of unique keys rather than to the number of rows seen.
+
+    Parameters
+    ----------
+    capacity : int
+        Default is 1024
+        The number of keys to make room for up front. The table doubles in size when it becomes half full.
+
+    Example
+    -------
+    >>> table = UInt64HashTable()
+    >>> table.add(np.array([7, 8, 7], dtype=np.uint64))
+    array([False, False,  True])
+    >>> len(table)
+    2
+    """
+
+    def __init__(self, capacity=1024):
+        if not (isinstance(capacity, int) and capacity > 0):
+            raise ValueError("capacity must be a positive integer.")
+        n_slots = 1 << max(int(2 * capacity - 1).bit_length(), 4)
+        self._keys = np.zeros(n_slots, dtype=np.uint64)
+        self._occupied = np.zeros(n_slots, dtype=bool)
+        self._counts = np.zeros(n_slots, dtype=np.int64)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def add(self, keys):
+        """
+        Inserts keys into the table, in order, and increments their counts.
+
+        Parameters
+        ----------
+        keys : np.ndarray
+            A uint64 array of keys. It may contain repeated keys.
+
+        Returns
+        -------
+        np.ndarray
+            A boolean array that is True where the key had already been added,
+            either in an earlier call or earlier in keys.
+        """
+        keys = np.asarray(keys, dtype=np.uint64)
+        unique_keys, first_index, inverse, unique_counts = np.unique(
+            keys, return_index=True, return_inverse=True, return_counts=True
+        )
+        slots, existed = self._find_or_insert(unique_keys)
+        self._counts[slots] += unique_counts
+
+        seen = existed[inverse]
+        # Later copies of a key within the same call are also repeats
+        seen |= np.arange(len(keys)) != first_index[inverse]
+        return seen
+
+    def counts(self, keys):
+        """
+        Returns how many times each of keys has been added, with 0 for keys that are not in the table.
+
+        Parameters
+        ----------
+        keys : np.ndarray
+            A uint64 array of keys.
+
+        Returns
+        -------
+        np.ndarray
+            An int64 array of counts, aligned with keys.
+        """
+        slots, found = self._find(np.asarray(keys, dtype=np.uint64))
+        return np.where(found, self._counts[slots], 0)
+
+    def subtract(self, keys):
+        """
+        Decrements the counts of keys that are in the table, once per occurrence in keys.
+
+        Parameters
+        ----------
+        keys : np.ndarray
+            A uint64 array of keys. It may contain repeated keys.
+        """
+        unique_keys, unique_counts = np.unique(np.asarray(keys, dtype=np.uint64), return_counts=True)
+        slots, found = self._find(unique_keys)
+        self._counts[slots[found]] -= unique_counts[found]
+
+    def _find(self, keys):
+        """Returns the slot of every key and whether it was found, without inserting anything."""
+        mask = len(self._keys) - 1
+        slots = (keys & np.uint64(mask)).astype(np.int64)
+        found = np.zeros(len(keys), dtype=bool)
+        pending = np.arange(len(keys))
+        while len(pending):
+            probe = slots[pending]
+            occupied = self._occupied[probe]
+            hit = occupied & (self._keys[probe] == keys[pending])
+            found[pending[hit]] = True
+            # Keys keep probing linearly until they hit themselves or an empty slot
+            pending = pending[occupied & ~hit]
+            slots[pending] = (slots[pending] + 1) & mask
+        return slots, found
+
+    def _find_or_insert(self, keys):
+        """Returns the slot of every key (which must be unique) and whether it was already present, inserting new keys."""
+        if 2 * (self._size + len(keys)) > len(self._keys):
+            self._grow(self._size + len(keys))
+
+        mask = len(self._keys) - 1
+        slots = (keys & np.uint64(mask)).astype(np.int64)
+        existed = np.zeros(len(keys), dtype=bool)
+        pending = np.arange(len(keys))
+        while len(pending):
+            probe = slots[pending]
+            occupied = self._occupied[probe]
+            hit = occupied & (self._keys[probe] == keys[pending])
+            existed[pending[hit]] = True
+
+            # Several new keys can land on the same empty slot, only the first of them claims it
+            empty = np.flatnonzero(~occupied)
+            claimed_slots, first = np.unique(probe[empty], return_index=True)
+            winners = pending[empty[first]]
+            self._keys[claimed_slots] = keys[winners]
+            self._occupied[claimed_slots] = True
+            self._size += len(winners)
+
+            done = hit.copy()
+            done[empty[first]] = True
+            # Keys that lost a slot retry it, and it is now occupied so they move on next round
+            move = occupied & ~hit
+            slots[pending[move]] = (probe[move] + 1) & mask
+            pending = pending[~done]
+        return slots, existed
+
+    def _grow(self, n_keys):
+        """Rehashes the table into enough slots to keep n_keys at most half full."""
+        occupied = self._occupied
+        keys, counts = self._keys[occupied], self._counts[occupied]
+        n_slots = 1 << int(2 * n_keys - 1).bit_length()
+        self._keys = np.zeros(n_slots, dtype=np.uint64)
+        self._occupied = np.zeros(n_slots, dtype=bool)
+        self._counts = np.zeros(n_slots, dtype=np.int64)
+        self._size = 0
+        slots, _ = self._find_or_insert(keys)
+        self._counts[slots] = counts
+
+
+class BloomFilter:
+    """
+    A fixed-size probabilistic set of uint64 keys backed by a NumPy bit array.
+    A key that was added is always reported as present, while a key that was never added
+    is wrongly reported as present with a small probability (the false positive rate).
+    Memory stays fixed however many keys are added, and the filter can be reused across calls
+    to remember keys from earlier batches.
+
+    Parameters
+    ----------
+    capacity : int
+        Default is 1_000_000
+        The number of keys the filter is sized for.
+
+    error_rate : float
+        Default is 0.001
+        Must be 0 < error_rate < 1
+        The false positive rate the filter should have once capacity keys have been added.
+
+    Raises
+    ------
+    ValueError :
+        If capacity is not a positive integer or error_rate is not between 0 and 1.
+
+    Example
+    -------
+    >>> bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    >>> bloom.add(np.array([7, 8], dtype=np.uint64))
+    >>> bloom.contains(np.array([7, 9], dtype=np.uint64))
+    array([ True, False])
+    """
+
+    def __init__(self, capacity=1_000_000, error_rate=0.001):
+        if not (isinstance(capacity, int) and capacity > 0):
+            raise ValueError("capacity must be a positive integer.")
+        if not (isinstance(error_rate, float) and 0 < error_rate < 1):
+            raise ValueError("error_rate must be a float between 0 and 1.")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        # Optimal number of bits and of hash functions for the capacity and error rate
+        self.n_bits = max(int(np.ceil(-capacity * np.log(error_rate) / np.log(2) ** 2)), 8)
+        self.n_hashes = max(int(round(self.n_bits / capacity * np.log(2))), 1)
+        self._bits = np.zeros((self.n_bits + 7) // 8, dtype=np.uint8)
+        self._n_added = 0
+
+    def __len__(self):
+        return self._n_added
+
+    @property
+    def false_positive_rate(self):
+        """The estimated probability that a key that was never added is reported as present, given the bits set so far."""
+        fill_ratio = np.unpackbits(self._bits, count=self.n_bits).mean()
+        return float(fill_ratio ** self.n_hashes)
+
+    def add(self, keys):
+        """
+        Adds keys to the filter.
+
+        Parameters
+        ----------
+        keys : np.ndarray
+            A uint64 array of keys.
+        """
+        positions = self._positions(keys)
+        np.bitwise_or.at(self._bits, positions >> 3, (1 << (positions & 7)).astype(np.uint8))
+        self._n_added += len(positions)
+
+    def contains(self, keys):
+        """
+        Checks which keys may have been added.
+
+        Parameters
+        ----------
+        keys : np.ndarray
+            A uint64 array of keys.
+
+        Returns
+        -------
+        np.ndarray
+            A boolean array that is False where the key was certainly never added.
+        """
+        positions = self._positions(keys)
+        present = np.ones(len(positions), dtype=bool)
+        for column in positions.T:
+            present &= (self._bits[column >> 3] >> (column & 7)) & 1 == 1
+        return present
+
+    def _positions(self, keys):
+        """Returns the n_hashes bit positions of every key, using double hashing on a remixed copy of the key."""
+        keys = np.asarray(keys, dtype=np.uint64)
+        # A splitmix64 finalizer gives a second hash that is independent of the key's own bits
+        second = keys ^ (keys >> np.uint64(30))
+        second *= np.uint64(0xBF58476D1CE4E5B9)
+        second ^= second >> np.uint64(27)
+        second *= np.uint64(0x94D049BB133111EB)
+        second ^= second >> np.uint64(31)
+        second |= np.uint64(1)
+        steps = np.arange(self.n_hashes, dtype=np.uint64)
+        return ((keys[:, None] + steps * second[:, None]) % np.uint64(self.n_bits)).astype(np.int64)
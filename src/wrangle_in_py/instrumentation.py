@@ -0,0 +1,360 @@
+import bisect
+import contextlib
+import functools
+import inspect
+import logging
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# np.byte_bounds moved to np.lib.array_utils in NumPy 2.0, and was removed from the main namespace
+_byte_bounds = np.lib.array_utils.byte_bounds if hasattr(np.lib, 'array_utils') else np.byte_bounds
+
+# The registered hooks. The tuple is replaced rather than changed in place,
+# so a call that is running its hooks on one thread is not affected by another thread registering one.
+_hooks = ()
+
+
+@dataclass(frozen=True)
+class CallEvent:
+    """
+    A record of one call to an instrumented wrangle_in_py function, passed to every registered hook.
+
+    Attributes
+    ----------
+    function : str
+        The name of the function that was called, such as 'remove_duplicates' or 'Pipeline.collect'.
+
+    input_shape : tuple or None
+        The (rows, columns) shape of the input DataFrame or table,
+        or None when the input is a file path or an iterable of chunks.
+
+    output_shape : tuple or None
+        The (rows, columns) shape of the returned DataFrame or table, or None if the call raised an error
+        or returned something without a shape, such as the list of dropped columns.
+
+    seconds : float
+        The wall time of the call.
+
+    bytes_copied : int or None
+        The number of bytes of column data in the output that are not shared with the input,
+        meaning data that was copied or newly computed by the call.
+        None if the call raised an error, or for a polars DataFrame, whose buffers are not exposed.
+
+    error : BaseException or None
+        The error the call raised, which is raised again after the hooks have run.
+    """
+    function: str
+    input_shape: tuple
+    output_shape: tuple
+    seconds: float
+    bytes_copied: int
+    error: BaseException = None
+
+    @property
+    def rows_dropped(self):
+        """The number of rows the call removed, or None if either shape is unknown."""
+        if self.input_shape is None or self.output_shape is None:
+            return None
+        return self.input_shape[0] - self.output_shape[0]
+
+    @property
+    def columns_dropped(self):
+        """The number of columns the call removed (0 if it only added columns), or None if either shape is unknown."""
+        if self.input_shape is None or self.output_shape is None:
+            return None
+        return max(self.input_shape[1] - self.output_shape[1], 0)
+
+
+def add_hook(hook):
+    """
+    Registers hook to be called with a CallEvent after every call to an instrumented function,
+    including calls that raise an error. A hook that is already registered is not added twice.
+
+    Parameters
+    ----------
+    hook : callable
+        A function taking a single CallEvent, such as a LoggingHook or a MetricsCollector.
+
+    Raises
+    ------
+    TypeError :
+        If hook is not callable.
+
+    Returns
+    -------
+    callable :
+        The hook, so add_hook can be used as a decorator.
+
+    Example
+    -------
+    >>> @add_hook
+    ... def report(event):
+    ...     print(event.function, event.rows_dropped)
+    >>> remove_duplicates(pd.DataFrame({'A': [1, 1, 2]}))
+    1 rows have been dropped.
+    remove_duplicates 1
+       A
+    0  1
+    2  2
+    """
+    global _hooks
+    if not callable(hook):
+        raise TypeError("hook must be callable.")
+    if hook not in _hooks:
+        _hooks = _hooks + (hook,)
+    return hook
+
+
+def remove_hook(hook):
+    """
+    Unregisters a hook added with add_hook. Removing a hook that is not registered does nothing.
+
+    Parameters
+    ----------
+    hook : callable
+        The hook to remove.
+    """
+    global _hooks
+    _hooks = tuple(registered for registered in _hooks if registered is not hook)
+
+
+@contextlib.contextmanager
+def instrument(*hooks):
+    """
+    Registers hooks for the duration of a with block, and unregisters them when it exits.
+    Hooks that were already registered before the block stay registered after it.
+
+    Parameters
+    ----------
+    *hooks : callable
+        Functions taking a single CallEvent. If none are given, a new MetricsCollector is used.
+
+    Raises
+    ------
+    TypeError :
+        If any hook is not callable.
+
+    Returns
+    -------
+    context manager :
+        Yields the first hook, so the collected metrics can be read after the block.
+
+    Example
+    -------
+    >>> with instrument() as metrics:
+    ...     column_drop_threshold(df, 0.5)
+    >>> metrics.summary()
+                           calls  seconds  rows_dropped  columns_dropped  bytes_copied  errors
+    function
+    column_drop_threshold      1  0.00123             0                1             0       0
+    """
+    hooks = hooks or (MetricsCollector(),)
+    added = [hook for hook in hooks if hook not in _hooks]
+    for hook in added:
+        add_hook(hook)
+    try:
+        yield hooks[0]
+    finally:
+        for hook in added:
+            remove_hook(hook)
+
+
+def instrumented(function=None, *, name=None, source=None):
+    """
+    Decorator that reports every call of function to the registered hooks as a CallEvent.
+    When no hook is registered the call goes straight through, after a single check of the registry.
+
+    Parameters
+    ----------
+    function : callable
+        The function to instrument. Its first parameter is the input DataFrame or table,
+        whether it is passed by position or by keyword.
+        Generator functions should not be instrumented: their work happens while the caller iterates,
+        after the call, so the event would only time the checks of the arguments.
+
+    name : str or None
+        The function name reported in events. If None (default), the function's qualified name.
+
+    source : callable or None
+        Returns the input DataFrame or table from the first argument, for methods whose first argument is not one.
+    """
+    if function is None:
+        return functools.partial(instrumented, name=name, source=source)
+    name = function.__qualname__ if name is None else name
+    first = next(iter(inspect.signature(function).parameters), None)
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if not _hooks:
+            return function(*args, **kwargs)
+
+        df = args[0] if args else kwargs.get(first)
+        if source is not None:
+            df = source(df)
+        result, error = None, None
+        start = time.perf_counter()
+        try:
+            result = function(*args, **kwargs)
+        except BaseException as caught:
+            error = caught
+        seconds = time.perf_counter() - start
+
+        input_shape = _shape(df)
+        output_shape = None if error is not None else _shape(result)
+        bytes_copied = None if error is not None else _bytes_copied(df, result)
+        event = CallEvent(name, input_shape, output_shape, seconds, bytes_copied, error)
+        for hook in _hooks:
+            hook(event)
+
+        if error is not None:
+            raise error
+        return result
+
+    return wrapper
+
+
+class LoggingHook:
+    """
+    A hook that writes one log record per call, so the shapes, timings and dropped counts end up in the job's logs.
+    The CallEvent is attached to each record as its 'event' attribute, for handlers that format it themselves.
+
+    Parameters
+    ----------
+    logger : logging.Logger or None
+        The logger to write to. If None (default), the 'wrangle_in_py' logger.
+
+    level : int
+        Default is logging.INFO
+        The level of the records of successful calls. Calls that raised an error are logged at logging.ERROR.
+
+    Example
+    -------
+    >>> logging.basicConfig(level=logging.INFO)
+    >>> with instrument(LoggingHook()):
+    ...     remove_duplicates(df)
+    INFO:wrangle_in_py:remove_duplicates: (4, 2) -> (3, 2) in 0.0012 s, 1 rows and 0 columns dropped, 48 bytes copied
+    """
+
+    def __init__(self, logger=None, level=logging.INFO):
+        self.logger = logging.getLogger('wrangle_in_py') if logger is None else logger
+        self.level = level
+
+    def __call__(self, event):
+        if event.error is not None:
+            self.logger.error("%s: %s failed after %.4f s with %r", event.function, event.input_shape,
+                              event.seconds, event.error, extra={'event': event})
+        else:
+            self.logger.log(self.level, "%s: %s -> %s in %.4f s, %s rows and %s columns dropped, %s bytes copied",
+                            event.function, event.input_shape, event.output_shape, event.seconds,
+                            event.rows_dropped, event.columns_dropped, event.bytes_copied, extra={'event': event})
+
+
+class MetricsCollector:
+    """
+    A hook that keeps every CallEvent in memory and sums them up per function.
+
+    Attributes
+    ----------
+    events : list of CallEvent
+        The events received, in call order.
+
+    Example
+    -------
+    >>> metrics = add_hook(MetricsCollector())
+    >>> remove_duplicates(df)
+    >>> metrics.summary()['rows_dropped']
+    function
+    remove_duplicates    1
+    Name: rows_dropped, dtype: int64
+    """
+
+    def __init__(self):
+        self.events = []
+
+    def __call__(self, event):
+        self.events.append(event)
+
+    def clear(self):
+        """Forgets the events received so far."""
+        self.events = []
+
+    def summary(self):
+        """
+        Returns the number of calls, total wall time, rows and columns dropped, bytes copied and errors
+        of each function, as a DataFrame indexed by function name in order of first call.
+        Unknown byte counts are left out of the sums.
+        """
+        columns = ['calls', 'seconds', 'rows_dropped', 'columns_dropped', 'bytes_copied', 'errors']
+        records = pd.DataFrame([
+            {'function': event.function, 'calls': 1, 'seconds': event.seconds,
+             'rows_dropped': event.rows_dropped or 0, 'columns_dropped': event.columns_dropped or 0,
+             'bytes_copied': event.bytes_copied or 0, 'errors': int(event.error is not None)}
+            for event in self.events
+        ], columns=['function'] + columns)
+        return records.groupby('function', sort=False)[columns].sum()
+
+
+def _shape(obj):
+    """Returns the (rows, columns) shape of a DataFrame or table, or None for anything else."""
+    shape = getattr(obj, 'shape', None)
+    return tuple(shape) if isinstance(shape, tuple) and len(shape) == 2 else None
+
+
+def _bytes_copied(source, result):
+    """
+    Returns the number of bytes of the column buffers of result that do not lie within a column buffer of source,
+    or None if the buffers of either cannot be read.
+    """
+    source_buffers = _buffers(source)
+    result_buffers = _buffers(result)
+    if source_buffers is None or result_buffers is None:
+        return None
+
+    # A result buffer is shared if it lies within a source buffer that starts at or before it,
+    # which is the case if the furthest end among those source buffers reaches past its own end
+    source_buffers.sort()
+    starts = [start for start, _ in source_buffers]
+    furthest_ends = np.maximum.accumulate([start + size for start, size in source_buffers]) if source_buffers else []
+    copied = 0
+    for start, size in result_buffers:
+        i = bisect.bisect_right(starts, start) - 1
+        if i < 0 or furthest_ends[i] < start + size:
+            copied += size
+    return copied
+
+
+def _buffers(obj):
+    """Returns the (address, size) of every non-empty column buffer of a pandas DataFrame or pyarrow Table, or None."""
+    if isinstance(obj, pd.DataFrame):
+        buffers = []
+        for _, series in obj.items():
+            buffers.extend(_array_buffers(series.array))
+    elif type(obj).__module__.split('.')[0] == 'pyarrow' and hasattr(obj, 'columns') and hasattr(obj, 'num_rows'):
+        buffers = [buffer for column in obj.columns for chunk in column.chunks for buffer in _arrow_buffers(chunk)]
+    else:
+        return None
+    return [(start, size) for start, size in buffers if size > 0]
+
+
+def _array_buffers(array):
+    """Yields the (address, size) of the NumPy or Arrow buffers behind a pandas extension array."""
+    # NumPy-backed arrays keep their values in _ndarray, masked arrays in _data and _mask, categoricals in codes
+    for attribute in ('_ndarray', '_data', '_mask', 'codes'):
+        values = getattr(array, attribute, None)
+        if isinstance(values, np.ndarray):
+            start, end = _byte_bounds(values)
+            yield start, end - start
+    arrow = getattr(array, '_pa_array', None)
+    if arrow is not None:
+        for chunk in arrow.chunks:
+            yield from _arrow_buffers(chunk)
+
+
+def _arrow_buffers(chunk):
+    """Yields the (address, size) of the buffers of a pyarrow Array, including those of its children."""
+    for buffer in chunk.buffers():
+        if buffer is not None:
+            yield buffer.address, buffer.size
@@ -0,0 +1,209 @@
+import datetime
+import json
+import os
+import sqlite3
+import time
+
+import numpy as np
+
+
+class SeenKeyStore:
+    """
+    A persistent set of uint64 row keys kept in a SQLite database on disk, so rows seen in earlier runs
+    can be recognized without reading those runs again. Each key is stored with the time it was last seen,
+    and keys that have not been seen for longer than retention are evicted.
+
+    Keys are looked up and inserted in batches: each batch is passed to SQLite as one JSON array
+    and matched against the stored keys, which are the table's primary key, by a single statement,
+    rather than with one query per key.
+
+    Keys can also be staged with stage(), as remove_duplicates does in 'persistent' mode, and are then only
+    written by commit(). Staged keys already count as seen in contains(), so later batches of the same run
+    drop them, but they are forgotten if the store is closed first: committing after the output of a run
+    has been persisted means a run that fails in between delivers its rows again when it is rerun.
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+        The SQLite database file. It is created if it does not exist.
+
+    retention : float, datetime.timedelta or None
+        How long a key is kept after it was last seen, in seconds or as a timedelta.
+        Older keys are evicted when the store is opened and when evict() is called.
+        If None (default), keys are never evicted.
+
+    batch_size : int
+        Default is 100_000
+        The number of keys looked up or inserted per query.
+
+    Raises
+    ------
+    ValueError :
+        If retention is negative or not a number, a timedelta or None,
+        or batch_size is not a positive integer.
+
+    Example
+    -------
+    >>> with SeenKeyStore('seen_orders.sqlite', retention=datetime.timedelta(days=30)) as store:
+    ...     store.add(np.array([7, 8], dtype=np.uint64))
+    ...     store.contains(np.array([7, 9], dtype=np.uint64))
+    array([ True, False])
+    >>> with SeenKeyStore('seen_orders.sqlite') as store:
+    ...     new_orders = remove_duplicates(orders, subset_columns=['order_id'], mode='persistent', key_store=store)
+    ...     new_orders.to_parquet('new_orders.parquet')
+    ...     store.commit()
+    """
+
+    def __init__(self, path, retention=None, batch_size=100_000):
+        if isinstance(retention, datetime.timedelta):
+            retention = retention.total_seconds()
+        if retention is not None and (not isinstance(retention, (int, float)) or isinstance(retention, bool)
+                                      or retention < 0):
+            raise ValueError("retention must be a non-negative number of seconds, a timedelta or None.")
+        if not (isinstance(batch_size, int) and not isinstance(batch_size, bool) and batch_size > 0):
+            raise ValueError("batch_size must be a positive integer.")
+        self.path = os.fspath(path)
+        self.retention = retention
+        self.batch_size = batch_size
+        # The arrays of keys staged since the last commit
+        self._staged = []
+
+        self._connection = sqlite3.connect(self.path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            # An INTEGER PRIMARY KEY is the table's own rowid b-tree, so the keys are stored once
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS seen_keys (key INTEGER PRIMARY KEY, seen_at REAL NOT NULL)"
+            )
+            # Eviction runs on every open, and the index lets it find the expired keys without reading the others
+            self._connection.execute("CREATE INDEX IF NOT EXISTS seen_keys_seen_at ON seen_keys (seen_at)")
+        self.evict()
+
+    def __len__(self):
+        return self._connection.execute("SELECT COUNT(*) FROM seen_keys").fetchone()[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Closes the database. Every added key has already been written, and keys staged since the last commit are dropped."""
+        self._staged = []
+        self._connection.close()
+
+    def contains(self, keys):
+        """
+        Returns whether each of keys is in the store, or staged to be added by the next commit.
+
+        Parameters
+        ----------
+        keys : np.ndarray
+            A uint64 array of keys.
+
+        Returns
+        -------
+        np.ndarray
+            A boolean array that is True where the key is in the store.
+        """
+        unique_keys = _to_sqlite(np.unique(np.asarray(keys, dtype=np.uint64)))
+        found = []
+        for batch in self._batches(unique_keys):
+            found.extend(key for key, in self._connection.execute(
+                "SELECT key FROM seen_keys WHERE key IN (SELECT value FROM json_each(?))", (batch,)
+            ))
+        known = np.array(found, dtype=np.int64).view(np.uint64)
+        if self._staged:
+            known = np.concatenate([known] + self._staged)
+        return np.isin(np.asarray(keys, dtype=np.uint64), known)
+
+    def add(self, keys, seen_at=None):
+        """
+        Adds keys to the store, or refreshes the time they were last seen if they are already in it.
+        The keys are committed to disk before add returns.
+
+        Parameters
+        ----------
+        keys : np.ndarray
+            A uint64 array of keys. It may contain repeated keys.
+
+        seen_at : float or None
+            The time the keys were seen, in seconds since the epoch. If None (default), the current time.
+        """
+        seen_at = time.time() if seen_at is None else float(seen_at)
+        unique_keys = _to_sqlite(np.unique(np.asarray(keys, dtype=np.uint64)))
+        with self._connection:
+            for batch in self._batches(unique_keys):
+                # The WHERE clause tells SQLite's parser that ON CONFLICT belongs to the INSERT, not to a join
+                self._connection.execute(
+                    "INSERT INTO seen_keys (key, seen_at) SELECT value, ? FROM json_each(?) WHERE true "
+                    "ON CONFLICT (key) DO UPDATE SET seen_at = max(seen_at, excluded.seen_at)", (seen_at, batch)
+                )
+
+    def stage(self, keys):
+        """
+        Stages keys to be added by the next commit. Until then they count as seen in contains(),
+        but nothing is written, and closing the store discards them.
+
+        Parameters
+        ----------
+        keys : np.ndarray
+            A uint64 array of keys. It may contain repeated keys.
+        """
+        self._staged.append(np.unique(np.asarray(keys, dtype=np.uint64)))
+
+    def commit(self, seen_at=None):
+        """
+        Adds the keys staged since the last commit, as add does. Call it once the rows that were kept
+        while the keys were staged have been persisted, so that those rows are not lost if that fails.
+
+        Parameters
+        ----------
+        seen_at : float or None
+            The time the keys were seen, in seconds since the epoch. If None (default), the current time.
+
+        Returns
+        -------
+        int
+            The number of distinct keys committed.
+        """
+        if not self._staged:
+            return 0
+        keys = np.unique(np.concatenate(self._staged))
+        self.add(keys, seen_at)
+        self._staged = []
+        return len(keys)
+
+    def evict(self, now=None):
+        """
+        Removes the keys that were last seen longer than retention ago. Does nothing if retention is None.
+
+        Parameters
+        ----------
+        now : float or None
+            The current time, in seconds since the epoch. If None (default), the current time.
+
+        Returns
+        -------
+        int
+            The number of keys removed.
+        """
+        if self.retention is None:
+            return 0
+        now = time.time() if now is None else float(now)
+        with self._connection:
+            return self._connection.execute(
+                "DELETE FROM seen_keys WHERE seen_at < ?", (now - self.retention,)
+            ).rowcount
+
+    def _batches(self, keys):
+        """Yields keys, a list of ints, as JSON arrays of at most batch_size keys."""
+        for start in range(0, len(keys), self.batch_size):
+            yield json.dumps(keys[start:start + self.batch_size])
+
+
+def _to_sqlite(keys):
+    """Returns uint64 keys as the Python ints of their signed 64-bit pattern, the range SQLite integers can hold."""
+    return keys.view(np.int64).tolist()
@@ -0,0 +1,592 @@
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from wrangle_in_py.column_drop_threshold import _drop_mask, _is_numeric_dtype, _validate_thresholds, column_statistics
+from wrangle_in_py.column_name_standardizer import resulting_duplicates, standardize_strings
+from wrangle_in_py.extracting_ymd_hms import (
+    _DEFAULT_PARTS, _column_components, _compile_format, _validate_column, _validate_parts
+)
+from wrangle_in_py.instrumentation import instrumented
+from wrangle_in_py.remove_duplicates import _duplicated_parallel, _validate_keep, _validate_n_jobs
+from wrangle_in_py.value_standardizer import _is_string_like_dtype, _standardize_categorical, _standardize_values
+
+
+class Pipeline:
+    """
+    A lazy chain of wrangle_in_py steps over a DataFrame. Each method records a step and returns a new Pipeline,
+    and nothing is computed until collect() is called, which returns the same DataFrame as calling
+    the functions one after another.
+
+    Instead of copying the whole frame at every step, the plan keeps track of which input columns and rows
+    are still in play: renames only change names, removing duplicates only narrows the set of rows,
+    and new columns (standardized values and datetime components) are only computed when a later step
+    or the output needs their values, on the rows that remain at that point. Columns that are dropped
+    or not selected before that are never computed, and the output is materialized once at the end.
+
+    The steps keep the order they are added in, because dropping columns by missingness or coefficient
+    of variance before or after removing duplicates gives different results. Column names are checked
+    as steps are added, while errors that depend on the data (such as a column that is not of datetime type)
+    are raised by collect().
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The DataFrame to wrangle. It is not modified, and with pandas Copy-on-Write (the default from pandas 3.0)
+        the output shares the data of untouched columns with it until either of them is changed.
+
+    Raises
+    ------
+    TypeError :
+        If df is not a pandas DataFrame.
+
+    Example
+    -------
+    >>> df = pd.DataFrame({'Time Stamp': pd.to_datetime(['2024-01-07', '2024-01-07', '2023-12-25']),
+    ...                    'Notes': [None, None, 'late'], 'Amount': [3, 3, 5]})
+    >>> pipeline = (Pipeline(df).column_name_standardizer().column_drop_threshold(0.5)
+    ...             .remove_duplicates().extracting_ymd('time_stamp'))
+    >>> pipeline.collect()
+    1 rows have been dropped.
+      time_stamp  amount  time_stamp_year  time_stamp_month  time_stamp_day
+    0 2024-01-07       3             2024                 1               7
+    2 2023-12-25       5             2023                12              25
+    """
+
+    def __init__(self, df):
+        if not isinstance(df, pd.DataFrame):
+            raise TypeError("The input must be a pandas DataFrame.")
+        self._df = df
+        self._steps = ()
+        # The planned columns, used to check the names used by each new step
+        self._plan = _PlanState(df, static=True)
+
+    def _then(self, call, step, **arguments):
+        """
+        Returns a new Pipeline with the step appended, after checking it against the planned columns.
+        call is how the step was recorded, for explain().
+        """
+        plan = self._plan.copy()
+        _STEPS[step](plan, **arguments)
+        pipeline = Pipeline.__new__(Pipeline)
+        pipeline._df = self._df
+        pipeline._steps = self._steps + ((call, step, arguments),)
+        pipeline._plan = plan
+        return pipeline
+
+    def column_name_standardizer(self):
+        """
+        Records standardizing the column names, as column_name_standardizer does. No data is read.
+
+        Warnings
+        --------
+        UserWarning :
+            If any of the standardized column names are the same.
+
+        Returns
+        -------
+        Pipeline :
+            A new Pipeline with the step appended.
+        """
+        return self._then("column_name_standardizer()", 'column_name_standardizer')
+
+    def value_standardizer(self, columns=None):
+        """
+        Records standardizing the string values of columns, as value_standardizer does.
+        The values are standardized on the rows that remain when they are first needed.
+
+        Parameters
+        ----------
+        columns : list of str or None
+            The columns whose values need standardization.
+            If None (default), every object, string and category column is standardized.
+
+        Raises
+        ------
+        KeyError :
+            If any column in columns is not a planned column.
+
+        Returns
+        -------
+        Pipeline :
+            A new Pipeline with the step appended.
+        """
+        return self._then(f"value_standardizer(columns={columns!r})", 'value_standardizer', columns=columns)
+
+    def column_drop_threshold(self, threshold, variance=None):
+        """
+        Records dropping the columns whose missingness is above threshold or whose coefficient of variance
+        is below variance, as column_drop_threshold does. The missingness only needs null counts,
+        which columns computed by earlier steps share with the columns they come from,
+        so only numeric columns without missing values are read when variance is given.
+
+        Parameters
+        ----------
+        threshold : float
+            Must be 0 <= threshold <= 1
+            The threshold for the proportion of missing values to allow in each column.
+
+        variance : float
+            Default is None
+            The lowest coefficient of variance to allow in any one column.
+
+        Raises
+        ------
+        ValueError :
+            If the input for threshold is not a float and in the inclusive range 0 and 1.
+            Or if the input for variance is not a float >=0.
+
+        Returns
+        -------
+        Pipeline :
+            A new Pipeline with the step appended.
+        """
+        _validate_thresholds(threshold, variance)
+        return self._then(f"column_drop_threshold({threshold!r}, variance={variance!r})", 'column_drop_threshold',
+                          threshold=threshold, variance=variance)
+
+    def remove_duplicates(self, subset_columns=None, keep='first', n_jobs=None):
+        """
+        Records removing duplicate rows, as remove_duplicates does. Only the compared columns are read,
+        on the rows that remain at that point, and a column computed from another compared column
+        is skipped because it cannot tell equal rows apart. The number of dropped rows is printed by collect().
+
+        Parameters
+        ----------
+        subset_columns : list or None
+            List of column names to consider for duplicates.
+            If None (default), consider all planned columns.
+
+        keep : {'first', 'last', False}
+            Default is 'first'
+            Which duplicate to keep, as in remove_duplicates.
+
+        n_jobs : int or None
+            The number of threads to find duplicate rows with, or -1 to use every CPU.
+            If None (default), pandas is used on a single thread.
+
+        Raises
+        ------
+        ValueError :
+            If any column in subset_columns is not a planned column.
+            If the input for keep is not 'first', 'last', or False.
+            If the input for n_jobs is not a positive integer, -1 or None.
+
+        Returns
+        -------
+        Pipeline :
+            A new Pipeline with the step appended.
+        """
+        _validate_keep(keep)
+        _validate_n_jobs(n_jobs)
+        return self._then(f"remove_duplicates(subset_columns={subset_columns!r}, keep={keep!r})", 'remove_duplicates',
+                          subset_columns=subset_columns, keep=keep, n_jobs=n_jobs)
+
+    def extracting_ymd(self, column, format=None):
+        """
+        Records adding the year, month and day of a datetime column, as extracting_ymd does.
+
+        Parameters
+        ----------
+        column : str
+            The name of the datetime column to extract from.
+
+        format : str or None
+            The fixed-width format of a string column, as in extracting_ymd.
+
+        Raises
+        ------
+        KeyError :
+            If the input column is not a planned column.
+
+        ValueError :
+            If format is not supported.
+
+        Returns
+        -------
+        Pipeline :
+            A new Pipeline with the step appended.
+        """
+        return self._then(f"extracting_ymd({column!r})", 'extract', columns=[column], parts=['year', 'month', 'day'],
+                          format=format, tz=None, calendar_cache=False, compact=False)
+
+    def extracting_hms(self, column, format=None):
+        """
+        Records adding the hour, minute and second of a datetime column, as extracting_hms does.
+
+        Parameters
+        ----------
+        column : str
+            The name of the datetime column to extract from.
+
+        format : str or None
+            The fixed-width format of a string column, as in extracting_hms.
+
+        Raises
+        ------
+        KeyError :
+            If the input column is not a planned column.
+
+        ValueError :
+            If format is not supported.
+
+        Returns
+        -------
+        Pipeline :
+            A new Pipeline with the step appended.
+        """
+        return self._then(f"extracting_hms({column!r})", 'extract', columns=[column], parts=['hour', 'minute', 'second'],
+                          format=format, tz=None, calendar_cache=False, compact=False)
+
+    def extract_datetime_parts(self, column, parts=_DEFAULT_PARTS, tz=None, calendar_cache=False, format=None):
+        """
+        Records adding date and time components of one or more datetime columns, as extract_datetime_parts does.
+
+        Parameters
+        ----------
+        column : str or list of str
+            The name of the datetime column to extract from, or a list of datetime column names.
+
+        parts : list of str
+            Default is ('year', 'month', 'day', 'hour', 'minute', 'second')
+            The components to extract, as in extract_datetime_parts.
+
+        tz : str, datetime.tzinfo or None
+            The timezone to convert timezone-aware columns to, as in extract_datetime_parts.
+
+        calendar_cache : bool
+            Default is False
+            If True, the calendar components are computed once per distinct day, as in extract_datetime_parts.
+
+        format : str or None
+            The fixed-width format of string columns, as in extract_datetime_parts.
+
+        Raises
+        ------
+        KeyError :
+            If an input column is not a planned column.
+
+        ValueError :
+            If parts is empty or contains an unknown component, or format is not supported.
+
+        Returns
+        -------
+        Pipeline :
+            A new Pipeline with the step appended.
+        """
+        columns = [column] if isinstance(column, str) else list(column)
+        parts = _validate_parts(parts)
+        return self._then(f"extract_datetime_parts({column!r}, parts={parts!r})", 'extract', columns=columns,
+                          parts=parts, format=format, tz=tz, calendar_cache=calendar_cache, compact=True)
+
+    def select(self, columns):
+        """
+        Records keeping only columns, in the given order. Columns that are not selected
+        are never computed unless an earlier step needs their values.
+
+        Parameters
+        ----------
+        columns : list of str
+            The names of the columns to keep.
+
+        Raises
+        ------
+        KeyError :
+            If any column in columns is not a planned column.
+
+        Returns
+        -------
+        Pipeline :
+            A new Pipeline with the step appended.
+        """
+        columns = list(columns)
+        return self._then(f"select({columns!r})", 'select', columns=columns)
+
+    def explain(self):
+        """
+        Describes the plan: what each step reads and when the new columns are computed.
+
+        Returns
+        -------
+        str :
+            One line per step, followed by the columns collect() would return
+            if no column is dropped by column_drop_threshold.
+        """
+        n_rows, n_columns = self._df.shape
+        lines = [f"Pipeline over {n_rows} rows x {n_columns} columns"]
+        plan = _PlanState(self._df, static=True)
+        with warnings.catch_warnings():
+            # The warnings were already raised when the steps were added
+            warnings.simplefilter('ignore')
+            for number, (call, step, arguments) in enumerate(self._steps, start=1):
+                lines.append(f"  {number}. {call}: {_STEPS[step](plan, **arguments)}")
+        lines.append(f"  collect(): materializes {len(plan.columns)} columns once, on the remaining rows: "
+                     f"{plan.names}")
+        return "\n".join(lines)
+
+    @instrumented(source=lambda pipeline: pipeline._df)
+    def collect(self):
+        """
+        Runs the plan and returns the resulting DataFrame.
+
+        Raises
+        ------
+        KeyError :
+            If a step uses a column that an earlier column_drop_threshold step dropped.
+
+        TypeError :
+            If a column to extract from is not of datetime type (or of string type when format is given).
+
+        ValueError :
+            If a string does not match the format given to an extraction step,
+            or tz is given for a column that is not timezone-aware.
+
+        Returns
+        -------
+        pandas.DataFrame :
+            The same DataFrame as calling the recorded functions one after another.
+        """
+        state = _PlanState(self._df, static=False)
+        for _, step, arguments in self._steps:
+            _STEPS[step](state, **arguments)
+        index = self._df.index if state.rows is None else self._df.index[state.rows]
+        return state.frame(range(len(state.columns)), index=index)
+
+
+class _PlanState:
+    """
+    The columns and rows of a plan as it is being run. Each column is an object that can compute its values
+    for the current rows. When static, the steps only update the planned columns and do not read any data.
+    """
+
+    def __init__(self, df, static):
+        self.static = static
+        self.n_source_rows = len(df)
+        self.columns = [_SourceColumn(df, position) for position in range(df.shape[1])]
+        self.names = list(df.columns)
+        # Sorted positions of the remaining rows of df, or None for every row
+        self.rows = None
+
+    def copy(self):
+        state = _PlanState.__new__(_PlanState)
+        state.__dict__.update(self.__dict__)
+        state.columns, state.names = list(self.columns), list(self.names)
+        return state
+
+    @property
+    def n_rows(self):
+        return self.n_source_rows if self.rows is None else len(self.rows)
+
+    def positions(self, name):
+        """Returns the positions of the columns called name."""
+        return [position for position, column_name in enumerate(self.names) if column_name == name]
+
+    def frame(self, positions, index=None):
+        """Builds a DataFrame of the columns at positions for the remaining rows, computing them if needed."""
+        positions = list(positions)
+        frame = pd.DataFrame(
+            {i: self.columns[position].values(self.rows) for i, position in enumerate(positions)},
+            index=index if index is not None else pd.RangeIndex(self.n_rows), copy=False,
+        )
+        frame.columns = [self.names[position] for position in positions]
+        return frame
+
+    def add_column(self, name, column):
+        """Replaces the column called name if there is one, as df[name] = values does, or adds it at the end."""
+        positions = self.positions(name)
+        if positions:
+            self.columns[positions[0]] = column
+        else:
+            self.columns.append(column)
+            self.names.append(name)
+
+
+class _SourceColumn:
+    """A column of the input DataFrame, read without copying unless only some of its rows remain."""
+
+    parent = None
+
+    def __init__(self, df, position):
+        self.series = df.iloc[:, position]
+        self.dtype = self.series.dtype
+
+    def values(self, rows):
+        return self.series.array if rows is None else self.series.array.take(rows)
+
+    def isna(self, rows):
+        mask = self.series.isna().to_numpy()
+        return mask if rows is None else mask[rows]
+
+
+class _Derivation:
+    """
+    Computes a dict of arrays from the values of a parent column and keeps the result.
+    Rows are only ever removed while a plan runs, so a later request is answered by taking from the kept result.
+    """
+
+    def __init__(self, parent, function):
+        self.parent = parent
+        self.function = function
+        self.computed = False
+
+    def compute(self, rows):
+        if not self.computed:
+            self.result, self.rows = self.function(self.parent.values(rows)), rows
+            self.computed = True
+        if rows is self.rows:
+            return self.result
+        positions = rows if self.rows is None else np.searchsorted(self.rows, rows)
+        return {key: values.take(positions) for key, values in self.result.items()}
+
+
+class _DerivedColumn:
+    """A column computed from another column. Every derivation keeps missing values missing and nothing else."""
+
+    def __init__(self, derivation, key, dtype):
+        self.derivation = derivation
+        self.parent = derivation.parent
+        self.key = key
+        self.dtype = dtype
+
+    def values(self, rows):
+        return self.derivation.compute(rows)[self.key]
+
+    def isna(self, rows):
+        return self.parent.isna(rows)
+
+
+def _column_name_standardizer(state):
+    standardized = standardize_strings(state.names)
+    if state.static:
+        duplicates = resulting_duplicates(state.names, standardized)
+        if bool(duplicates):
+            warnings.warn(f"Duplicate column names found after standardization: {duplicates}")
+    n_renamed = sum(before != after for before, after in zip(state.names, standardized))
+    state.names = standardized
+    return f"renames {n_renamed} columns, no data is read"
+
+
+def _value_standardizer(state, columns):
+    if columns is None:
+        positions = [position for position, column in enumerate(state.columns) if _is_string_like_dtype(column.dtype)]
+    else:
+        missing = [col for col in columns if not state.positions(col)]
+        if missing:
+            raise KeyError(f"Columns {missing} do not exist in the DataFrame.")
+        positions = [position for col in columns for position in state.positions(col)]
+
+    for position in positions:
+        name, column = state.names[position], state.columns[position]
+
+        def standardize(values, name=name, categorical=isinstance(column.dtype, pd.CategoricalDtype)):
+            standardized, duplicates = (_standardize_categorical if categorical else _standardize_values)(
+                pd.Series(values)
+            )
+            if bool(duplicates):
+                warnings.warn(f"Duplicate values found in column '{name}' after standardization: {duplicates}")
+            return {'values': standardized.array}
+
+        state.columns[position] = _DerivedColumn(_Derivation(column, standardize), 'values', column.dtype)
+    return (f"standardizes the values of {[state.names[position] for position in positions]} "
+            "when they are first needed, on the rows remaining then")
+
+
+def _column_drop_threshold(state, threshold, variance):
+    if state.static:
+        read = f"reads the null counts of the {len(state.columns)} planned columns"
+        if variance is not None:
+            read += ", and the values of the numeric ones without missing values"
+        return read + "; the columns it keeps are only known at collect()"
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        null_count = np.array([column.isna(state.rows).sum() for column in state.columns], dtype=np.int64)
+        missingness = null_count / state.n_rows
+    cv = np.full(len(state.columns), np.nan)
+    if variance is not None and state.n_rows:
+        # The coefficient of variance is only defined for numeric columns without missing values
+        positions = [position for position, column in enumerate(state.columns)
+                     if _is_numeric_dtype(column.dtype) and null_count[position] == 0]
+        if positions:
+            cv[positions] = column_statistics(state.frame(positions))['cv'].to_numpy()
+
+    keep = ~_drop_mask(pd.DataFrame({'missingness': missingness, 'cv': cv}), threshold, variance)
+    state.columns = [column for column, kept in zip(state.columns, keep) if kept]
+    state.names = [name for name, kept in zip(state.names, keep) if kept]
+
+
+def _remove_duplicates(state, subset_columns, keep, n_jobs):
+    if subset_columns is None:
+        positions = list(range(len(state.columns)))
+    elif not all(state.positions(col) for col in subset_columns):
+        raise ValueError("Some columns in subset_columns are not present in the DataFrame")
+    else:
+        positions = [position for col in subset_columns for position in state.positions(col)]
+
+    # A column computed from another compared column is equal whenever that column is, so it is not compared
+    compared_columns = [state.columns[position] for position in positions]
+    compared = [position for position in positions if not any(
+        state.columns[position].parent is column for column in compared_columns
+    )]
+    if state.static:
+        return f"compares {[state.names[position] for position in compared]} on the remaining rows"
+
+    if not compared:
+        duplicated = np.zeros(state.n_rows, dtype=bool)
+    elif n_jobs is None or n_jobs == 1:
+        duplicated = state.frame(compared).duplicated(keep=keep).to_numpy()
+    else:
+        n_jobs = os.cpu_count() if n_jobs == -1 else n_jobs
+        duplicated = _duplicated_parallel(state.frame(compared), None, keep, n_jobs)
+
+    print(f"{int(duplicated.sum())} rows have been dropped.")
+    state.rows = np.flatnonzero(~duplicated) if state.rows is None else state.rows[~duplicated]
+
+
+def _extract(state, columns, parts, format, tz, calendar_cache, compact):
+    if format is not None:
+        _compile_format(format)
+    for col in columns:
+        if not state.positions(col):
+            raise KeyError(f"Column '{col}' does not exist in the DataFrame.")
+
+    new_names = []
+    for col in columns:
+        column = state.columns[state.positions(col)[0]]
+
+        def extract(values, col=col):
+            series = pd.Series(values, name=col)
+            _validate_column(series.to_frame(), col, format)
+            if tz is not None and not (pd.api.types.is_datetime64_any_dtype(series) and series.dt.tz is not None):
+                raise ValueError(f"Columns {[col]} must be timezone-aware to be converted to tz.")
+            components, mask = _column_components(series, parts, format, tz=tz, calendar_cache=calendar_cache)
+            if compact:
+                return {part: pd.arrays.IntegerArray(components[part], mask.copy()) for part in parts}
+            return {part: pd.arrays.IntegerArray(components[part].astype(np.int64), mask.copy()) for part in parts}
+
+        derivation = _Derivation(column, extract)
+        for part in parts:
+            state.add_column(f"{col}_{part}", _DerivedColumn(derivation, part, pd.Int64Dtype()))
+            new_names.append(f"{col}_{part}")
+    return f"adds {new_names}, computed when first needed, on the rows remaining then"
+
+
+def _select(state, columns):
+    missing = [col for col in columns if not state.positions(col)]
+    if missing:
+        raise KeyError(f"Columns {missing} do not exist in the DataFrame.")
+    positions = [position for col in columns for position in state.positions(col)]
+    state.columns = [state.columns[position] for position in positions]
+    state.names = [state.names[position] for position in positions]
+    return "keeps these columns, the others are never computed unless an earlier step read them"
+
+
+_STEPS = {
+    'column_name_standardizer': _column_name_standardizer,
+    'value_standardizer': _value_standardizer,
+    'column_drop_threshold': _column_drop_threshold,
+    'remove_duplicates': _remove_duplicates,
+    'extract': _extract,
+    'select': _select,
+}
@@ -0,0 +1,195 @@
+import warnings
+
+import numpy as np
+import polars as pl
+
+from wrangle_in_py.column_name_standardizer import resulting_duplicates, standardize_strings
+
+
+def column_names(df):
+    """Returns the column names of df."""
+    return df.columns
+
+
+def column_name_standardizer(df):
+    """
+    Returns the polars DataFrame with standardized column names, as column_name_standardizer does for pandas.
+    Only the names change, the column data is shared with df.
+
+    Parameters
+    ----------
+    df : polars.DataFrame
+        The input DataFrame whose column names need standardization.
+
+    Warnings
+    --------
+    UserWarning :
+        If any of the standardized column names are the same. polars does not allow duplicate column names,
+        so polars raises an error after the warning.
+
+    Returns
+    -------
+    polars.DataFrame :
+        A DataFrame with standardized column names.
+    """
+    original_columns = df.columns
+    standardized_columns = standardize_strings(original_columns)
+
+    duplicates = resulting_duplicates(original_columns, standardized_columns)
+    if bool(duplicates):
+        warnings.warn(f"Duplicate column names found after standardization: {duplicates}")
+
+    return df.rename(dict(zip(original_columns, standardized_columns)))
+
+
+def column_drop_threshold(df, threshold, variance=None):
+    """
+    Returns the polars DataFrame without the columns whose missingness is above threshold
+    or whose coefficient of variance is below variance, as column_drop_threshold does for pandas.
+
+    The null counts (with floating point NaN values counted as missing, as they are in pandas),
+    means and population standard deviations of every column are computed in a single polars query.
+
+    Parameters
+    ----------
+    df : polars.DataFrame
+        The input DataFrame whose columns need to be checked.
+
+    threshold : float
+        Must be 0 <= threshold <= 1
+        The threshold for the proportion of missing values to allow in each column.
+
+    variance : float
+        Default is None
+        The lowest coefficient of variance to allow in any one column.
+
+    Returns
+    -------
+    polars.DataFrame :
+        A DataFrame with only the columns that meet both thresholds.
+    """
+    schema = df.schema
+    numeric = [name for name, dtype in schema.items() if dtype.is_numeric()]
+    expressions = []
+    for i, (name, dtype) in enumerate(schema.items()):
+        missing = pl.col(name).null_count()
+        if dtype.is_float():
+            missing = missing + pl.col(name).is_nan().sum()
+        expressions.append(missing.alias(f"missing_{i}"))
+        if variance is not None and name in numeric:
+            expressions.append(pl.col(name).mean().alias(f"mean_{i}"))
+            expressions.append(pl.col(name).std(ddof=0).alias(f"std_{i}"))
+    stats = df.select(expressions).row(0, named=True) if expressions else {}
+
+    n_rows = df.height
+    keep = []
+    for i, name in enumerate(schema):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dropped = np.float64(stats[f"missing_{i}"]) / n_rows > threshold
+            if variance is not None and name in numeric and stats[f"missing_{i}"] == 0 and n_rows:
+                dropped |= np.float64(stats[f"std_{i}"]) / np.float64(stats[f"mean_{i}"]) < variance
+        keep.append(not dropped)
+
+    return df.select([name for name, kept in zip(schema, keep) if kept])
+
+
+def remove_duplicates(df, subset_columns=None, keep='first'):
+    """
+    Returns the polars DataFrame without duplicate rows, as remove_duplicates does for pandas.
+    The subset_columns of each row are hashed together as one struct, and the rows whose struct is the first
+    (or last, or only) occurrence of its value are kept in their original order. In floating point keys,
+    NaN and null are both missing and -0.0 equals 0.0, as they are in pandas.
+
+    Parameters
+    ----------
+    df : polars.DataFrame
+        The DataFrame to process.
+
+    subset_columns : list or None
+        List of column names to consider for identifying duplicates.
+        If None (default), consider all columns.
+
+    keep : {'first', 'last', False}
+        Default is 'first'
+        Which duplicate to keep, as in remove_duplicates.
+
+    Returns
+    -------
+    polars.DataFrame :
+        A DataFrame with duplicates removed. The number of dropped rows is printed.
+    """
+    if df.width == 0 or (subset_columns is not None and len(subset_columns) == 0):
+        result = df
+    else:
+        keys = df.columns if subset_columns is None else list(subset_columns)
+        schema = df.schema
+        # pandas stores null as NaN, and adding zero turns -0.0 into 0.0
+        row = pl.struct([pl.col(key).fill_nan(None) + 0.0 if schema[key].is_float() else pl.col(key) for key in keys])
+        if keep == 'first':
+            kept = row.is_first_distinct()
+        elif keep == 'last':
+            kept = row.is_last_distinct()
+        else:
+            kept = row.is_unique()
+        result = df.filter(kept)
+
+    print(f"{df.height - result.height} rows have been dropped.")
+    return result
+
+
+def extract_parts(df, column, parts, format=None):
+    """
+    Returns the polars DataFrame with one Int64 column '<column>_<part>' added for each of parts
+    (any of 'year', 'month', 'day', 'hour', 'minute', 'second'), computed with polars temporal expressions
+    in a single pass. Timezone-aware datetimes are decomposed in their own timezone. A string column is first
+    parsed with polars' strptime when format is given. Existing columns with the same names are replaced.
+
+    Parameters
+    ----------
+    df : polars.DataFrame
+        The DataFrame containing the datetime column.
+
+    column : str
+        The name of the datetime column to extract from.
+
+    parts : list of str
+        The components to extract.
+
+    format : str or None
+        The strptime format of a string column.
+
+    Raises
+    ------
+    KeyError :
+        If the input column is not a column in df.
+
+    TypeError :
+        If the input column is not of datetime type, or of string type when format is given.
+
+    ValueError :
+        If a string does not match format.
+
+    Returns
+    -------
+    polars.DataFrame :
+        The input DataFrame with the added columns.
+    """
+    if column not in df.columns:
+        raise KeyError(f"Column '{column}' does not exist in the DataFrame.")
+
+    dtype = df.schema[column]
+    values = pl.col(column)
+    if format is not None and dtype == pl.String:
+        strings = df.get_column(column)
+        try:
+            values = strings.str.strptime(pl.Datetime('us'), format=format, strict=True)
+        except pl.exceptions.InvalidOperationError as error:
+            raise ValueError(str(error)) from None
+        # strptime accepts fields without their leading zeros, formatting them back shows them
+        mismatched = strings.filter(values.dt.strftime(format) != strings)
+        if len(mismatched):
+            raise ValueError(f"time data \"{mismatched[0]}\" doesn't match format \"{format}\".")
+    elif not isinstance(dtype, pl.Datetime):
+        raise TypeError(f"Column '{column}' must be of datetime type.")
+
+    return df.with_columns(getattr(values.dt, part)().cast(pl.Int64).alias(f"{column}_{part}") for part in parts)
@@ -0,0 +1,176 @@
+import numpy as np
+import pandas as pd
+
+from wrangle_in_py.instrumentation import instrumented
+
+
+class Profile:
+    """
+    The statistics of a DataFrame that column_drop_threshold, remove_duplicates and column_name_standardizer
+    would otherwise each compute with their own scan, gathered by profile(df). Pass it to those functions
+    with profile= to reuse them. A profile is only valid for the DataFrame it was computed from, unchanged.
+    The functions reject a DataFrame with another shape or other columns, and compare the hashes of up to
+    64 evenly spaced rows with the profiled ones, so changes to the other rows go unnoticed.
+
+    Attributes
+    ----------
+    shape : tuple
+        The (rows, columns) shape of the profiled DataFrame.
+
+    columns : pd.Index
+        The column names of the profiled DataFrame.
+
+    statistics : pd.DataFrame
+        The output of column_statistics ('null_count', 'missingness', 'mean', 'std' and 'cv'),
+        with a 'cardinality' column counting the distinct non-missing values of each column.
+
+    row_hashes : np.ndarray
+        A 64-bit hash of every row over all columns, with numbers hashed by value (so 0.0 and -0.0 hash alike).
+
+    duplicate_rows : int
+        The number of rows that repeat an earlier row, which remove_duplicates would drop with keep='first'.
+
+    standardized_columns : list or None
+        The column names as column_name_standardizer would standardize them, or None if not every name is a string.
+
+    name_collisions : dict or None
+        The resulting_duplicates of the column names: the standardized names that several columns share.
+    """
+
+    def __init__(self, shape, columns, statistics, row_hashes, duplicate_rows, standardized_columns, name_collisions,
+                 fingerprint=None):
+        self.shape = shape
+        self.columns = columns
+        self.statistics = statistics
+        self.row_hashes = row_hashes
+        self.duplicate_rows = duplicate_rows
+        self.standardized_columns = standardized_columns
+        self.name_collisions = name_collisions
+        # The row hashes of the rows at _sample_positions(shape[0]) when the profile was computed
+        self._fingerprint = fingerprint
+
+    def __repr__(self):
+        return (f"Profile({self.shape[0]} rows x {self.shape[1]} columns, {self.duplicate_rows} duplicate rows, "
+                f"{len(self.name_collisions or {})} column name collisions)")
+
+    def _check(self, df):
+        """
+        Raises a ValueError unless df has the shape and columns this profile was computed from,
+        and the same values in a sample of its rows.
+        """
+        # Imported here because remove_duplicates imports this module
+        from wrangle_in_py.remove_duplicates import _canonical_hashes
+
+        if df.shape != self.shape or not df.columns.equals(self.columns):
+            raise ValueError("profile was computed for a different DataFrame.")
+        if self._fingerprint is not None:
+            positions = _sample_positions(self.shape[0])
+            if not np.array_equal(_canonical_hashes(df.iloc[positions], None), self._fingerprint):
+                raise ValueError("profile was computed for a different DataFrame.")
+
+
+@instrumented
+def profile(df):
+    """
+    Gathers the column statistics, distinct value counts, duplicate rows and column name collisions of a DataFrame
+    in one call, sharing the work between them. Each column is hashed once, and its hashes give both its number of
+    distinct values and its share of the row hashes, while the missing values are found once for every column
+    and used by both the statistics and the distinct counts. The numeric columns are read again for their means
+    and standard deviations, and the rows that share a hash are compared to confirm they are duplicates.
+
+    Pass the result to column_drop_threshold, remove_duplicates and column_name_standardizer with profile=
+    so they skip the scans it already made.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The DataFrame to profile.
+
+    Raises
+    ------
+    TypeError :
+        If the input for df is not a pandas DataFrame.
+
+    Returns
+    -------
+    Profile
+        The profile of df.
+
+    Example
+    -------
+    >>> df = pd.DataFrame({'Fruit Name': ['kiwi', 'kiwi', None], 'fruit-name': [1, 1, 2], 'Weight': [3.0, 3.0, 5.0]})
+    >>> report = profile(df)
+    >>> report
+    Profile(3 rows x 3 columns, 1 duplicate rows, 1 column name collisions)
+    >>> report.statistics[['null_count', 'cv', 'cardinality']]
+                null_count        cv  cardinality
+    Fruit Name           1       NaN            1
+    fruit-name           0  0.353553            2
+    Weight               0  0.257130            2
+    >>> remove_duplicates(df, profile=report)
+    1 rows have been dropped.
+      Fruit Name  fruit-name  Weight
+    0       kiwi           1     3.0
+    2       None           2     5.0
+    """
+    # Imported here because those modules import Profile themselves
+    from wrangle_in_py.column_drop_threshold import _column_statistics
+    from wrangle_in_py.column_name_standardizer import resulting_duplicates, standardize_strings
+    from wrangle_in_py.remove_duplicates import _column_value_hashes, _confirmed_duplicated, _hashes_match_values
+
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("The first argument must be a pandas DataFrame.")
+
+    n_rows, n_cols = df.shape
+    missing = df.isna().to_numpy()
+    statistics = _column_statistics(df, missing.sum(axis=0) if n_cols else np.zeros(0, dtype=np.int64))
+
+    cardinality = np.zeros(n_cols, dtype=np.int64)
+    column_hashes = []
+    for i, (_, series) in enumerate(df.items()):
+        # Numbers are hashed by value, so 0.0 and -0.0 count as one value and hash alike in the rows
+        hashes = _column_value_hashes(series)
+        cardinality[i] = len(pd.unique(hashes[~missing[:, i]]))
+        column_hashes.append(hashes)
+    statistics['cardinality'] = cardinality
+
+    names = df.columns.tolist()
+    standardized_columns, name_collisions = None, None
+    if all(isinstance(name, str) for name in names):
+        standardized_columns = standardize_strings(names)
+        name_collisions = resulting_duplicates(names, standardized_columns)
+
+    row_hashes = _combine_column_hashes(column_hashes, n_rows)
+    # Rows that share a hash are compared to confirm they are equal, and object columns,
+    # whose equal values can hash differently, are compared by pandas
+    if _hashes_match_values(df, None):
+        duplicated = _confirmed_duplicated(df, None, np.arange(n_rows), row_hashes, 'first')
+    else:
+        duplicated = df.duplicated().to_numpy()
+
+    return Profile(df.shape, df.columns, statistics, row_hashes, int(duplicated.sum()),
+                   standardized_columns, name_collisions, row_hashes[_sample_positions(n_rows)])
+
+
+def _sample_positions(n_rows):
+    """Returns the positions of up to 64 evenly spaced rows, whose hashes tell whether a DataFrame has changed."""
+    return np.linspace(0, n_rows - 1, min(n_rows, 64)).astype(np.int64)
+
+
+def _combine_column_hashes(column_hashes, n_rows):
+    """
+    Combines per-column hashes into row hashes the way pandas' hash_pandas_object does for a DataFrame
+    (a variant of Python's tuple hash), so combining pandas' column hashes gives hash_rows(df). This mirrors
+    pandas' own code, and test_profiling checks it against hash_pandas_object for every kind of column.
+    """
+    if not column_hashes:
+        return np.zeros(n_rows, dtype=np.uint64)
+    n_items = len(column_hashes)
+    multiplier = np.uint64(1000003)
+    combined = np.full(n_rows, 0x345678, dtype=np.uint64)
+    for i, hashes in enumerate(column_hashes):
+        combined ^= hashes
+        combined *= multiplier
+        multiplier += np.uint64(82520 + 2 * (n_items - i))
+    combined += np.uint64(97531)
+    return combined
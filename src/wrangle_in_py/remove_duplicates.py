@@ -1,13 +1,29 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pandas as pd
 
-def remove_duplicates(df, subset_columns=None, keep='first'):
+from wrangle_in_py.backends import _backend_for
+from wrangle_in_py.chunk_reader import iter_chunks
+from wrangle_in_py.hashing import BloomFilter, UInt64HashTable
+from wrangle_in_py.instrumentation import instrumented
+from wrangle_in_py.key_store import SeenKeyStore
+from wrangle_in_py.profiling import Profile, _combine_column_hashes
+
+@instrumented
+def remove_duplicates(df, subset_columns=None, keep='first', n_jobs=None, mode='exact', bloom_filter=None, profile=None,
+                      key_store=None):
     """
     Remove duplicate rows from a DataFrame based on specified columns.
 
     Parameters
     ----------
-    df : pd.DataFrame
+    df : pd.DataFrame, pyarrow.Table or polars.DataFrame
         The dataframe to process.
+        A pyarrow Table is deduplicated natively with Arrow's hash group-by, and a polars DataFrame
+        with polars' unique, keeping the original row order. Both are returned as the same type,
+        use their library's own threads (n_jobs does not apply) and only support mode='exact'.
         
     subset_columns : list or None
         List of column names to consider for identifying duplicates.
@@ -19,16 +35,64 @@ def remove_duplicates(df, subset_columns=None, keep='first'):
         - 'last': Keep the last occurrence.
         - False: Drop all duplicates.
 
+    n_jobs : int or None
+        The number of threads to spread the work over, or -1 to use every CPU.
+        If None (default), use pandas' single-threaded drop_duplicates.
+        Otherwise the rows are hashed on subset_columns in parallel, partitioned into n_jobs buckets by hash,
+        and each bucket is deduplicated on its own thread. The survivors keep their original order.
+        Rows that share a hash have their values compared, so a hash collision never drops a row.
+        When a compared column has object dtype, whose values are hashed through their strings,
+        pandas' drop_duplicates is used instead.
+
+    mode : str
+        Determines how duplicates are identified:
+        - 'exact': Compare the values of the rows (default).
+        - 'approximate': Look the row hashes up in bloom_filter, a fixed-size probabilistic set.
+          A row is dropped if its subset_columns values were seen earlier in df or in any earlier call
+          that used the same bloom_filter. A small share of unique rows (the false positive rate) is dropped too.
+          Only keep='first' is supported.
+        - 'persistent': Look the row hashes up in key_store, a set of keys kept on disk.
+          A row is dropped if its subset_columns values were seen earlier in df or in any earlier call,
+          in this run or an earlier one, that used the same key_store file and whose keys were not evicted.
+          The hashes of every row are then staged on key_store, and only written to disk by key_store.commit().
+          Persist the returned rows first and commit after, so a run that fails in between delivers
+          the same rows again when it is rerun instead of losing them. Only keep='first' is supported.
+
+    bloom_filter : BloomFilter or None
+        The filter used when mode is 'approximate'. Pass the same filter to successive calls
+        to drop rows that were already seen in earlier batches.
+        Numbers are hashed by value, so a key column may be int64 in one batch and float64 in another.
+        If None (default), a new filter sized for the rows of df is used.
+
+    profile : Profile or None
+        The profile(df) of df. If given and subset_columns is None, its row hashes are reused
+        and only the rows that share a hash are compared. It is not used when df has object columns,
+        whose equal values can hash differently.
+        Only used in 'exact' mode.
+
+    key_store : SeenKeyStore or None
+        The store used when mode is 'persistent', which is required in that mode.
+        Numbers are hashed by value, so a key column may be int64 in one batch and float64 in another.
+
     Raises
     ------
     ValueError :
-        If the input for df is not a pandas DataFrame.
+        If the input for df is not a pandas DataFrame, a pyarrow Table or a polars DataFrame.
         If any column in subset_columns is not a column in the input dataframe.
         If the input for keep is not 'first', 'last', or False.
+        If the input for n_jobs is not a positive integer, -1 or None.
+        If the input for mode is not 'exact', 'approximate' or 'persistent',
+        or mode is 'approximate' or 'persistent' and keep is not 'first'.
+        If the input for bloom_filter is not a BloomFilter or None.
+        If the input for key_store is not a SeenKeyStore or None, or mode is 'persistent' and key_store is None.
+        If the input for profile is not a Profile or None, or was computed for a different DataFrame.
+        If mode is 'approximate' or 'persistent' and df is a pyarrow Table or a polars DataFrame.
 
     Returns
     -------
-    pd.DataFrame: A DataFrame with duplicates removed.
+    pd.DataFrame, pyarrow.Table or polars.DataFrame: A DataFrame with duplicates removed.
+        The number of dropped rows is printed, along with the estimated false positive rate
+        of the filter in 'approximate' mode.
 
     Example
     -------
@@ -41,19 +105,49 @@ def remove_duplicates(df, subset_columns=None, keep='first'):
     3  4  8
     """
     # Validate input
-    if not isinstance(df, pd.DataFrame):
+    backend = _backend_for(df)
+    if backend is None and not isinstance(df, pd.DataFrame):
         raise ValueError("Input must be a pandas DataFrame")
 
-    if subset_columns is not None:
-        if not all(col in df.columns for col in subset_columns):
-            raise ValueError("Some columns in subset_columns are not present in the DataFrame")
-    
-    if keep not in ['first', 'last', False]: 
-         raise ValueError("Invalid value for 'keep'. Must be 'first', 'last', or False.")
+    if backend is not None:
+        _validate_subset_columns(backend.column_names(df), subset_columns)
+    else:
+        _validate_subset_columns(df.columns, subset_columns)
+    _validate_keep(keep)
+    _validate_n_jobs(n_jobs)
+    _validate_mode(mode, keep, bloom_filter, key_store)
+    if profile is not None:
+        if not isinstance(profile, Profile):
+            raise ValueError("profile must be a Profile or None.")
+        if backend is not None:
+            raise ValueError("profile is only supported for pandas DataFrames.")
+        profile._check(df)
+
+    if backend is not None:
+        if mode != 'exact':
+            raise ValueError(f"mode={mode!r} is only supported for pandas DataFrames.")
+        return backend.remove_duplicates(df, subset_columns, keep)
 
-    # Drop duplicates using pandas
     original_row_count = len(df)
-    result = df.drop_duplicates(subset=subset_columns, keep=keep)
+    if mode == 'approximate':
+        if bloom_filter is None:
+            bloom_filter = BloomFilter(capacity=max(original_row_count, 1))
+        result = df[~_duplicated_approximate(df, subset_columns, bloom_filter)]
+        dropped_rows = original_row_count - len(result)
+        print(f"{dropped_rows} rows have been dropped. "
+              f"Estimated false positive rate: {bloom_filter.false_positive_rate:.2e}")
+        return result
+    elif mode == 'persistent':
+        result = df[~_duplicated_persistent(df, subset_columns, key_store)]
+    elif profile is not None and subset_columns is None and len(df.columns) and _hashes_match_values(df, None):
+        # The profile already hashed every row, so only the rows that share a hash are compared
+        result = df[~_confirmed_duplicated(df, None, np.arange(original_row_count), profile.row_hashes, keep)]
+    elif n_jobs is None or n_jobs == 1 or len(df.columns) == 0:
+        # Drop duplicates using pandas
+        result = df.drop_duplicates(subset=subset_columns, keep=keep)
+    else:
+        n_jobs = os.cpu_count() if n_jobs == -1 else n_jobs
+        result = df[~_duplicated_parallel(df, subset_columns, keep, n_jobs)]
     dropped_rows = original_row_count - len(result)
 
     print(f"{dropped_rows} rows have been dropped.")
@@ -61,3 +155,245 @@ def remove_duplicates(df, subset_columns=None, keep='first'):
     return result
 
 
+# Not instrumented: it returns a generator, whose chunks are read and deduplicated while the caller iterates
+def remove_duplicates_chunked(source, subset_columns=None, keep='first', chunksize=100_000):
+    """
+    Remove duplicate rows from data that is read one chunk at a time, based on specified columns.
+    Each row is reduced to a 64-bit hash of its subset_columns values and only the set of hashes seen so far is kept,
+    so memory grows with the number of unique keys rather than with the number of rows.
+
+    Parameters
+    ----------
+    source : str, os.PathLike or iterable of pd.DataFrame
+        A path to a '.csv' or '.parquet' file, or an iterable of pandas DataFrame chunks.
+        Numbers are compared by value, so a key column may be int64 in one chunk and float64 in another,
+        as happens when a csv chunk has a missing value. Other columns should have the same dtype in every chunk.
+
+    subset_columns : list or None
+        List of column names to consider for identifying duplicates.
+        If None (default), consider all columns.
+
+    keep : str
+        Determines which duplicates to keep:
+        - 'first': Keep the first occurrence (default). The source is read once.
+        - 'last': Keep the last occurrence.
+        - False: Drop all duplicates.
+        'last' and False count every key in a first pass and filter the rows in a second pass,
+        so source must be a file path or a re-iterable collection of chunks.
+
+    chunksize : int
+        Default is 100_000
+        The number of rows read into each chunk when source is a file path.
+
+    Raises
+    ------
+    ValueError :
+        If any column in subset_columns is not a column in a chunk.
+        If the input for keep is not 'first', 'last', or False.
+        If keep is 'last' or False and source is a one-shot iterator that cannot be read twice.
+
+    Returns
+    -------
+    generator of pd.DataFrame
+        The chunks with duplicates removed, in order.
+        The number of dropped rows is printed once every chunk has been read.
+
+    Example
+    -------
+    >>> chunks = [pd.DataFrame({'A': [1, 2], 'B': [5, 6]}), pd.DataFrame({'A': [2, 4], 'B': [7, 8]})]
+    >>> pd.concat(remove_duplicates_chunked(chunks, subset_columns=['A']))
+    1 rows have been dropped.
+       A  B
+    0  1  5
+    1  2  6
+    1  4  8
+    """
+    _validate_keep(keep)
+    if keep != 'first' and not isinstance(source, (str, os.PathLike)) and iter(source) is source:
+        raise ValueError("keep='last' and keep=False read the source twice, so it must be a file path or a re-iterable collection of chunks.")
+
+    return _remove_duplicates_chunked(source, subset_columns, keep, chunksize)
+
+
+def _remove_duplicates_chunked(source, subset_columns, keep, chunksize):
+    """Generator behind remove_duplicates_chunked, kept separate so the arguments are validated on call."""
+    seen_keys = UInt64HashTable()
+    dropped_rows = 0
+
+    if keep == 'first':
+        for chunk in iter_chunks(source, chunksize):
+            _validate_subset_columns(chunk.columns, subset_columns)
+            seen = seen_keys.add(_canonical_hashes(chunk, subset_columns))
+            dropped_rows += int(seen.sum())
+            yield chunk[~seen]
+    else:
+        # First pass: count how many times every key occurs in the whole source
+        for chunk in iter_chunks(source, chunksize):
+            _validate_subset_columns(chunk.columns, subset_columns)
+            seen_keys.add(_canonical_hashes(chunk, subset_columns))
+
+        # Second pass: keep a row only if its key occurs once, or if it is the last occurrence of its key
+        for chunk in iter_chunks(source, chunksize):
+            hashes = _canonical_hashes(chunk, subset_columns)
+            remaining = seen_keys.counts(hashes)
+            if keep is False:
+                keep_mask = remaining == 1
+            else:
+                _, inverse, chunk_counts = np.unique(hashes, return_inverse=True, return_counts=True)
+                later_in_chunk = pd.Series(hashes).duplicated(keep='last').to_numpy()
+                keep_mask = ~later_in_chunk & (remaining == chunk_counts[inverse])
+                seen_keys.subtract(hashes)
+            dropped_rows += int((~keep_mask).sum())
+            yield chunk[keep_mask]
+
+    print(f"{dropped_rows} rows have been dropped.")
+
+
+def _canonical_hashes(chunk, subset_columns):
+    """
+    Returns one 64-bit hash per row of chunk, like hash_rows, but with numbers hashed by value rather than by dtype.
+    Each csv chunk infers its own dtypes, so a key column can be int64 in one chunk and float64 in the next
+    (when that chunk has a missing value); 1 and 1.0 then get the same hash, as they compare equal,
+    and so do 0.0 and -0.0.
+    """
+    subset = chunk if subset_columns is None else chunk[subset_columns]
+    return _combine_column_hashes([_column_value_hashes(series) for _, series in subset.items()], len(subset))
+
+
+def _column_value_hashes(series):
+    """Returns the hashes _canonical_hashes combines for one column: numbers by value, other values by pandas."""
+    if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype) \
+            and not pd.api.types.is_complex_dtype(series.dtype):
+        return _numeric_value_hashes(series)
+    return pd.util.hash_pandas_object(series, index=False).to_numpy()
+
+
+def _numeric_value_hashes(series):
+    """
+    Hashes whole numbers as int64, whatever the dtype they are stored in, and other numbers as float64,
+    with every missing value hashed as NaN.
+    """
+    if pd.api.types.is_integer_dtype(series.dtype) and not series.hasnans:
+        return pd.util.hash_array(series.to_numpy(dtype=np.int64))
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    hashes = pd.util.hash_array(values)
+    # -2**63 <= value < 2**63 is the range of int64
+    whole = np.isfinite(values) & (values == np.floor(values)) & (values >= -2.0**63) & (values < 2.0**63)
+    hashes[whole] = pd.util.hash_array(values[whole].astype(np.int64))
+    return hashes
+
+
+def _duplicated_parallel(df, subset_columns, keep, n_jobs):
+    """
+    Returns a boolean mask of the duplicate rows of df, hashing contiguous row ranges in parallel
+    and then deduplicating the rows of each hash-partitioned bucket in parallel.
+    """
+    if not _hashes_match_values(df, subset_columns):
+        # Equal values can land in different buckets, so those columns are compared by pandas instead
+        return df.duplicated(subset=subset_columns, keep=keep).to_numpy()
+
+    n_rows = len(df)
+    bounds = np.linspace(0, n_rows, n_jobs + 1).astype(np.int64)
+
+    with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+        hashes = np.concatenate(list(pool.map(
+            lambda start, stop: _canonical_hashes(df.iloc[start:stop], subset_columns), bounds[:-1], bounds[1:]
+        )))
+
+        # Numbers are hashed by value, so 0.0 and -0.0 hash alike, and without object columns
+        # equal rows have equal hashes: every group of duplicates lands in a single bucket.
+        # A stable sort keeps the rows of each bucket in their original order, which keep relies on.
+        buckets = hashes % np.uint64(n_jobs)
+        order = np.argsort(buckets, kind='stable')
+        splits = np.searchsorted(buckets[order], np.arange(1, n_jobs, dtype=np.uint64))
+        partitions = np.split(order, splits)
+
+        duplicated = np.zeros(n_rows, dtype=bool)
+        for positions, bucket_duplicated in pool.map(
+            lambda positions: (positions, _confirmed_duplicated(df, subset_columns, positions, hashes[positions], keep)),
+            partitions
+        ):
+            duplicated[positions] = bucket_duplicated
+
+    return duplicated
+
+
+def _hashes_match_values(df, subset_columns):
+    """
+    Returns True if equal rows of df always have equal _canonical_hashes hashes, which is not the case with object
+    columns: hash_pandas_object hashes object values through their strings, so 2 and 2.0 hash differently.
+    """
+    subset = df if subset_columns is None else df[subset_columns]
+    return not (subset.dtypes == object).any()
+
+
+def _confirmed_duplicated(df, subset_columns, positions, hashes, keep):
+    """
+    Returns a boolean mask of the duplicates among the rows of df at positions (in ascending order), given their hashes.
+    Equal rows have equal hashes when _hashes_match_values(df, subset_columns) holds and numbers are hashed by value,
+    as _canonical_hashes does, so only rows whose hash occurs more than once can be duplicates,
+    and their values are compared to confirm it, rather than trusting the 64-bit hashes.
+    """
+    candidates = pd.Series(hashes).duplicated(keep=False).to_numpy()
+    duplicated = np.zeros(len(positions), dtype=bool)
+    if candidates.any():
+        rows = df.iloc[np.asarray(positions)[candidates]]
+        duplicated[candidates] = rows.duplicated(subset=subset_columns, keep=keep).to_numpy()
+    return duplicated
+
+
+def _duplicated_approximate(df, subset_columns, bloom_filter):
+    """
+    Returns a boolean mask of the rows of df that repeat an earlier row of df or may be in bloom_filter,
+    then adds the remaining rows to bloom_filter.
+    """
+    hashes = _canonical_hashes(df, subset_columns)
+    # Repeats within the batch are found exactly, the filter only answers for earlier batches
+    duplicated = pd.Series(hashes).duplicated(keep='first').to_numpy() | bloom_filter.contains(hashes)
+    bloom_filter.add(hashes[~duplicated])
+    return duplicated
+
+
+def _validate_mode(mode, keep, bloom_filter, key_store=None):
+    """Checks that mode is 'exact', 'approximate' or 'persistent', and that the options of the mode fit together."""
+    if mode not in ['exact', 'approximate', 'persistent']:
+        raise ValueError("Invalid value for 'mode'. Must be 'exact', 'approximate' or 'persistent'.")
+    if mode in ['approximate', 'persistent'] and keep != 'first':
+        raise ValueError(f"mode={mode!r} only supports keep='first'.")
+    if bloom_filter is not None and not isinstance(bloom_filter, BloomFilter):
+        raise ValueError("bloom_filter must be a BloomFilter or None.")
+    if key_store is not None and not isinstance(key_store, SeenKeyStore):
+        raise ValueError("key_store must be a SeenKeyStore or None.")
+    if mode == 'persistent' and key_store is None:
+        raise ValueError("mode='persistent' requires a key_store.")
+
+
+def _duplicated_persistent(df, subset_columns, key_store):
+    """
+    Returns a boolean mask of the rows of df that repeat an earlier row of df or are in key_store,
+    then stages the keys of every row on key_store, for the caller to commit once the kept rows are persisted.
+    Committing refreshes the time the repeated keys were last seen.
+    """
+    hashes = _canonical_hashes(df, subset_columns)
+    duplicated = pd.Series(hashes).duplicated(keep='first').to_numpy() | key_store.contains(hashes)
+    key_store.stage(hashes)
+    return duplicated
+
+
+def _validate_n_jobs(n_jobs):
+    """Checks that n_jobs is a positive integer, -1 or None."""
+    if n_jobs is not None and not (isinstance(n_jobs, int) and not isinstance(n_jobs, bool) and (n_jobs >= 1 or n_jobs == -1)):
+        raise ValueError("n_jobs must be a positive integer, -1 or None.")
+
+
+def _validate_subset_columns(columns, subset_columns):
+    """Checks that every column in subset_columns is one of columns."""
+    if subset_columns is not None:
+        if not all(col in columns for col in subset_columns):
+            raise ValueError("Some columns in subset_columns are not present in the DataFrame")
+
+
+def _validate_keep(keep):
+    """Checks that keep is one of the options drop_duplicates understands."""
+    if keep not in ['first', 'last', False]:
+        raise ValueError("Invalid value for 'keep'. Must be 'first', 'last', or False.")
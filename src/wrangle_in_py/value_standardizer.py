@@ -0,0 +1,113 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from wrangle_in_py.column_name_standardizer import resulting_duplicates, standardize_strings
+from wrangle_in_py.instrumentation import instrumented
+
+@instrumented
+def value_standardizer(df, columns=None):
+    """
+    Returns a copy of the inputted dataframe with the string values of the chosen columns standardized.
+    Values will be converted to lowercase and
+    non-alphanumerics (including spaces and punctuation) will be replaced with underscores,
+    exactly as string_standardizer does for a single string.
+
+    Only the unique values of each column are standardized, and the rows are remapped through their codes,
+    so the work grows with the number of distinct values rather than with the number of rows.
+    A 'category' column keeps its dtype and has its categories standardized and merged where they collide.
+
+    If the standardization makes different values in a column the same, a warning will be raised.
+
+    Parameters
+    ----------
+    df : pandas DataFrame
+        The input pandas DataFrame whose values need standardization.
+
+    columns : list or None
+        List of column names whose values should be standardized.
+        If None (default), standardize every object, string and category column.
+
+    Warnings
+    --------
+    UserWarning :
+        If any of the standardized values in a column are the same.
+
+    Raises
+    ------
+    TypeError :
+        If the input dataframe is not a pandas DataFrame,
+        or if a chosen column contains non-missing values that are not strings.
+
+    KeyError :
+        If any column in columns is not a column in df.
+
+    Returns
+    -------
+    pandas.DataFrame :
+        A new DataFrame with standardized values. Columns that are not standardized share their data with df.
+
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> df = pd.DataFrame({'fruit': ['Jack Fruit', 'PINEAPPLE', 'jack-fruit'], 'weight_g': [110, 100, 105]})
+    >>> value_standardizer(df)
+    UserWarning: Duplicate values found in column 'fruit' after standardization: {'jack_fruit': ['Jack Fruit', 'jack-fruit']}
+            fruit  weight_g
+    0  jack_fruit       110
+    1   pineapple       100
+    2  jack_fruit       105
+    """
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("The input must be a pandas DataFrame.")
+
+    if columns is None:
+        columns = [col for col, dtype in df.dtypes.items() if _is_string_like_dtype(dtype)]
+    else:
+        missing = [col for col in columns if col not in df.columns]
+        if missing:
+            raise KeyError(f"Columns {missing} do not exist in the DataFrame.")
+
+    result = df.copy(deep=False)
+    for col in columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            result[col], duplicates = _standardize_categorical(df[col])
+        else:
+            result[col], duplicates = _standardize_values(df[col])
+
+        if bool(duplicates):
+            warnings.warn(f"Duplicate values found in column '{col}' after standardization: {duplicates}")
+
+    return result
+
+def _is_string_like_dtype(dtype):
+    """Returns True for the dtypes that can hold strings: object, string and category."""
+    return (pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype)
+            or isinstance(dtype, pd.CategoricalDtype))
+
+def _standardize_values(series):
+    """Standardizes the unique values of a non-categorical Series and broadcasts them back through the codes."""
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    original = list(uniques)
+    standardized = standardize_strings(original)
+    duplicates = resulting_duplicates(original, standardized)
+
+    # The sentinel code -1 picks the trailing None, so missing values stay missing
+    lookup = np.array(standardized + [None], dtype=object)
+    values = pd.Series(lookup[codes], index=series.index, name=series.name, dtype=object)
+    if isinstance(series.dtype, pd.StringDtype):
+        values = values.astype(series.dtype)
+    return values, duplicates
+
+def _standardize_categorical(series):
+    """Standardizes the categories of a 'category' Series and remaps its codes, merging categories that collide."""
+    original = list(series.cat.categories)
+    standardized = standardize_strings(original)
+    duplicates = resulting_duplicates(original, standardized)
+
+    category_codes, categories = pd.factorize(pd.Series(standardized, dtype=object))
+    # The missing code -1 picks the trailing -1, so missing values stay missing
+    new_codes = np.append(category_codes, -1)[series.cat.codes.to_numpy()]
+    values = pd.Categorical.from_codes(new_codes, categories=categories, ordered=series.cat.ordered)
+    return pd.Series(values, index=series.index, name=series.name), duplicates
@@ -0,0 +1,71 @@
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+feather = pytest.importorskip("pyarrow.feather")
+
+from wrangle_in_py.arrow_io import column_drop_threshold_ipc, column_name_standardizer_ipc, remove_duplicates_ipc
+from wrangle_in_py.column_drop_threshold import column_drop_threshold
+from wrangle_in_py.column_name_standardizer import column_name_standardizer
+from wrangle_in_py.remove_duplicates import remove_duplicates
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(0)
+    n = 1_000
+    return pd.DataFrame({
+        'Fruit Name': rng.choice(['kiwi', 'mango', None], n),
+        'Amount': rng.integers(0, 3, n),
+        'Mostly Null': np.where(rng.random(n) < 0.9, np.nan, 1.0),
+        'Constant': np.ones(n),
+    }, index=np.arange(n) * 10)
+
+
+@pytest.fixture
+def source(df, tmp_path):
+    path = tmp_path / 'source.arrow'
+    feather.write_feather(df, path, compression='uncompressed', chunksize=300)
+    return path
+
+
+def test_rename_matches_pandas_without_copying(df, source, tmp_path):
+    """Test that renaming matches column_name_standardizer, keeps the index, and allocates no Arrow memory."""
+    output = tmp_path / 'renamed.arrow'
+    allocated = pa.total_allocated_bytes()
+    names = column_name_standardizer_ipc(source, output)
+    assert pa.total_allocated_bytes() == allocated
+    assert names[:4] == ['fruit_name', 'amount', 'mostly_null', 'constant']
+    assert_frame_equal(feather.read_feather(output), column_name_standardizer(df))
+
+
+def test_drop_and_dedup_match_pandas(df, source, tmp_path):
+    """Test that dropping columns and removing duplicates give the same frames as the pandas functions."""
+    dropped = column_drop_threshold_ipc(source, tmp_path / 'dropped.arrow', 0.5, 0.1)
+    assert dropped == ['Mostly Null', 'Constant']
+    assert_frame_equal(feather.read_feather(tmp_path / 'dropped.arrow'), column_drop_threshold(df, 0.5, 0.1))
+
+    for keep in ['first', 'last', False]:
+        output = tmp_path / f'unique_{keep}.arrow'
+        n_rows = remove_duplicates_ipc(source, output, subset_columns=['Fruit Name', 'Amount'], keep=keep)
+        expected = remove_duplicates(df, subset_columns=['Fruit Name', 'Amount'], keep=keep)
+        assert n_rows == len(expected)
+        assert_frame_equal(feather.read_feather(output), expected)
+
+
+def test_invalid_inputs(source, tmp_path):
+    """Test that invalid arguments, non-IPC files and writing over the source are rejected."""
+    with pytest.raises(ValueError, match="must not be the source"):
+        column_name_standardizer_ipc(source, source)
+    not_ipc = tmp_path / 'data.csv'
+    not_ipc.write_text("a,b\n1,2\n")
+    with pytest.raises(ValueError, match="not an Arrow IPC"):
+        remove_duplicates_ipc(not_ipc, tmp_path / 'out.arrow')
+    with pytest.raises(ValueError):
+        remove_duplicates_ipc(source, tmp_path / 'out.arrow', subset_columns=['Missing'])
+    with pytest.raises(ValueError):
+        remove_duplicates_ipc(source, tmp_path / 'out.arrow', keep='middle')
+    with pytest.raises(ValueError):
+        column_drop_threshold_ipc(source, tmp_path / 'out.arrow', 2)
@@ -0,0 +1,167 @@
+from wrangle_in_py.column_name_standardizer import column_name_standardizer
+from wrangle_in_py.column_drop_threshold import column_drop_threshold
+from wrangle_in_py.remove_duplicates import remove_duplicates
+from wrangle_in_py.extracting_ymd_hms import extracting_ymd, extracting_hms
+import numpy as np
+import pytest
+import pandas as pd
+
+
+class ArrowTables:
+    """Builds and reads pyarrow Tables for the shared backend tests."""
+
+    def __init__(self):
+        self.pa = pytest.importorskip("pyarrow")
+        self.type = self.pa.Table
+
+    def from_pandas(self, df):
+        return self.pa.Table.from_pandas(df, preserve_index=False)
+
+    def from_dict(self, data):
+        return self.pa.table(data)
+
+    def columns(self, table):
+        return table.column_names
+
+    def to_list(self, table, name):
+        return table.column(name).to_pylist()
+
+    def is_int64(self, table, name):
+        return table.schema.field(name).type == self.pa.int64()
+
+
+class PolarsFrames:
+    """Builds and reads polars DataFrames for the shared backend tests."""
+
+    def __init__(self):
+        self.pl = pytest.importorskip("polars")
+        self.type = self.pl.DataFrame
+
+    def from_pandas(self, df):
+        return self.pl.from_pandas(df)
+
+    def from_dict(self, data):
+        return self.pl.DataFrame(data)
+
+    def columns(self, table):
+        return table.columns
+
+    def to_list(self, table, name):
+        return table[name].to_list()
+
+    def is_int64(self, table, name):
+        return table.schema[name] == self.pl.Int64
+
+
+@pytest.fixture(params=[ArrowTables, PolarsFrames], ids=['pyarrow', 'polars'])
+def backend(request):
+    return request.param()
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(0)
+    n = 1000
+    df = pd.DataFrame({
+        'Time Stamp': pd.to_datetime(rng.integers(0, 50, n) * 86_400 * 10**9 * 7 + rng.integers(0, 86_400, n) * 10**9),
+        'Fruit Name': rng.choice(['Apple', 'kiwi', None], n),
+        'Amount': rng.integers(0, 3, n),
+        'Mostly Null': np.where(rng.random(n) < 0.9, np.nan, 1.0),
+        'Constant': np.ones(n),
+        'Ratio': rng.choice([1.0, np.nan, 2.0], n),
+    })
+    df.loc[5, 'Time Stamp'] = pd.NaT
+    return df
+
+
+def test_column_name_standardizer(backend, df):
+    """Test that a Table or polars DataFrame gets the same standardized names and keeps its data."""
+    table = backend.from_pandas(df)
+    result = column_name_standardizer(table)
+    assert isinstance(result, backend.type)
+    assert backend.columns(result) == list(column_name_standardizer(df).columns)
+    assert backend.to_list(result, 'fruit_name') == backend.to_list(table, 'Fruit Name')
+
+
+@pytest.mark.parametrize("threshold, variance", [(0.5, None), (0.5, 0.1), (0.2, 0.6), (1.0, 0.0)])
+def test_column_drop_threshold(backend, df, threshold, variance):
+    """Test that the same columns are kept as for the pandas DataFrame, with NaN counted as missing."""
+    table = backend.from_pandas(df)
+    result = column_drop_threshold(table, threshold, variance)
+    assert isinstance(result, backend.type)
+    assert backend.columns(result) == list(column_drop_threshold(df, threshold, variance).columns)
+
+    # NaN values written as values rather than nulls still count as missing
+    nan_table = backend.from_dict({'a': [np.nan, np.nan, 1.0], 'b': [1.0, 2.0, 3.0]})
+    assert backend.columns(column_drop_threshold(nan_table, 0.5)) == ['b']
+
+
+@pytest.mark.parametrize("subset_columns", [None, ['Fruit Name'], ['Fruit Name', 'Ratio'], ['Amount', 'Ratio']])
+@pytest.mark.parametrize("keep", ['first', 'last', False])
+def test_remove_duplicates(backend, df, subset_columns, keep, capsys):
+    """Test that the same rows are kept, in the same order, as for the pandas DataFrame."""
+    table = backend.from_pandas(df)
+    result = remove_duplicates(table, subset_columns, keep)
+    expected = remove_duplicates(df, subset_columns, keep).reset_index(drop=True)
+    assert isinstance(result, backend.type)
+    pd.testing.assert_frame_equal(result.to_pandas(), expected)
+    output = capsys.readouterr().out.splitlines()
+    assert output[0] == output[1]
+
+
+@pytest.mark.parametrize("keep", ['first', 'last', False])
+def test_remove_duplicates_missing_values_and_signed_zeros(backend, keep):
+    """Test that NaN and null are the same missing value, and 0.0 and -0.0 the same number, as they are in pandas."""
+    data = {'a': [0.0, -0.0, np.nan, None, 1.0, np.nan], 'b': ['x', 'x', 'y', 'y', 'z', 'y']}
+    result = remove_duplicates(backend.from_dict(data), keep=keep)
+    expected = remove_duplicates(pd.DataFrame(data), keep=keep).reset_index(drop=True)
+    pd.testing.assert_frame_equal(result.to_pandas(), expected, check_dtype=False)
+
+
+def test_remove_duplicates_string_view():
+    """Test that string_view columns, which Arrow's group-by does not always accept, are deduplicated."""
+    pa = pytest.importorskip("pyarrow")
+    if not hasattr(pa, 'string_view'):
+        pytest.skip("pyarrow has no string_view type")
+    table = pa.table({'s': pa.array(['a', 'b', 'a', None, None], type=pa.string_view())})
+    result = remove_duplicates(table)
+    assert result.column('s').to_pylist() == ['a', 'b', None]
+    assert result.schema.field('s').type == pa.string_view()
+
+
+def test_remove_duplicates_invalid(backend, df):
+    """Test that unknown columns and the approximate mode are rejected."""
+    table = backend.from_pandas(df)
+    with pytest.raises(ValueError, match="Some columns in subset_columns are not present in the DataFrame"):
+        remove_duplicates(table, ['Missing'])
+    with pytest.raises(ValueError):
+        remove_duplicates(table, mode='approximate')
+
+
+@pytest.mark.parametrize("function", [extracting_ymd, extracting_hms])
+def test_extract(backend, df, function):
+    """Test that the same components are added as int64 columns, with nulls for missing timestamps."""
+    table = backend.from_pandas(df)
+    result = function(table, 'Time Stamp')
+    expected = function(df, 'Time Stamp')
+    assert isinstance(result, backend.type)
+    assert backend.columns(result) == list(expected.columns)
+    for name in expected.columns[-3:]:
+        assert backend.is_int64(result, name)
+        pd.testing.assert_series_equal(pd.Series(backend.to_list(result, name), dtype="Int64", name=name),
+                                       expected[name])
+
+
+def test_extract_strings(backend):
+    """Test that a string column is parsed with a format, and that impossible dates raise a ValueError."""
+    table = backend.from_dict({'t': ['2024-01-07 12:30:45', None]})
+    result = extracting_ymd(table, 't', format='%Y-%m-%d %H:%M:%S')
+    assert backend.to_list(result, 't_year') == [2024, None]
+    assert backend.to_list(result, 't_day') == [7, None]
+    for value in ['2024-02-30', '2024-1-7']:
+        with pytest.raises(ValueError):
+            extracting_ymd(backend.from_dict({'t': [value]}), 't', format='%Y-%m-%d')
+    with pytest.raises(TypeError):
+        extracting_hms(table, 't')
+    with pytest.raises(KeyError):
+        extracting_hms(table, 'missing')
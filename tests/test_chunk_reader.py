@@ -0,0 +1,59 @@
+import pandas as pd
+import pytest
+from wrangle_in_py.chunk_reader import iter_chunks, write_chunks
+
+df = pd.DataFrame({'fruit': ['apple', 'kiwi', 'mango', 'peach', 'plum'], 'weight_g': [110, 75, 200, 150, 60]})
+
+def test_iter_chunks_csv(tmp_path):
+    """
+    iter_chunks should read a csv file in chunks of at most chunksize rows.
+    """
+    path = tmp_path / "fruit.csv"
+    df.to_csv(path, index=False)
+    chunks = list(iter_chunks(path, chunksize=2))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), df)
+
+def test_iter_chunks_parquet(tmp_path):
+    """
+    iter_chunks should read a parquet file in chunks of at most chunksize rows.
+    """
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "fruit.parquet"
+    df.to_parquet(path, index=False)
+    chunks = list(iter_chunks(str(path), chunksize=3))
+    assert [len(chunk) for chunk in chunks] == [3, 2]
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), df, check_dtype=False)
+
+def test_iter_chunks_dataframes():
+    """
+    iter_chunks should pass an iterable of pandas DataFrames through unchanged.
+    """
+    chunks = [df.iloc[:2], df.iloc[2:]]
+    assert all(a is b for a, b in zip(iter_chunks(chunks), chunks))
+
+def test_write_chunks_round_trip(tmp_path):
+    """
+    write_chunks should write every chunk to a single file and return the number of rows written.
+    """
+    for name in ["fruit.csv", "fruit.parquet"]:
+        if name.endswith(".parquet"):
+            pytest.importorskip("pyarrow")
+        path = tmp_path / name
+        assert write_chunks([df.iloc[:2], df.iloc[2:]], path) == 5
+        assert list(iter_chunks(path))[0]['fruit'].tolist() == df['fruit'].tolist()
+
+def test_invalid_inputs(tmp_path):
+    """
+    iter_chunks and write_chunks should reject unsupported sources, chunk sizes and file extensions.
+    """
+    with pytest.raises(TypeError):
+        list(iter_chunks(df))
+    with pytest.raises(TypeError):
+        list(iter_chunks(42))
+    with pytest.raises(ValueError):
+        list(iter_chunks([df], chunksize=0))
+    with pytest.raises(ValueError):
+        list(iter_chunks(tmp_path / "fruit.json"))
+    with pytest.raises(ValueError):
+        write_chunks([df], tmp_path / "fruit.json")
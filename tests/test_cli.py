@@ -0,0 +1,128 @@
+from wrangle_in_py.cli import load_steps, main
+from wrangle_in_py.column_drop_threshold import column_drop_threshold
+from wrangle_in_py.column_name_standardizer import column_name_standardizer
+from wrangle_in_py.remove_duplicates import remove_duplicates
+import json
+import os
+import numpy as np
+import pytest
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    rng = np.random.default_rng(0)
+    frames = []
+    (tmp_path / 'in').mkdir()
+    for i in range(3):
+        n = 500
+        df = pd.DataFrame({
+            'Order ID': rng.integers(0, 200, n),
+            'Mostly Null': np.where(rng.random(n) < 0.9, np.nan, 1.0),
+            'Amount': rng.normal(10, 2, n),
+        })
+        df.to_csv(tmp_path / 'in' / f'part{i}.csv', index=False)
+        frames.append(pd.read_csv(tmp_path / 'in' / f'part{i}.csv'))
+    return frames
+
+
+@pytest.fixture
+def steps(tmp_path):
+    path = tmp_path / 'steps.json'
+    path.write_text(json.dumps([
+        'column_name_standardizer',
+        {'column_drop_threshold': {'threshold': 0.5}},
+        {'remove_duplicates': {'subset_columns': ['order_id'], 'keep': 'last'}},
+    ]))
+    return path
+
+
+def test_batch_matches_functions(tmp_path, inputs, steps, capsys):
+    """Test that every file is written with the result of the functions, read in small chunks."""
+    status = main([str(tmp_path / 'in' / '*.csv'), '--steps', str(steps), '--output-dir', str(tmp_path / 'out'),
+                   '--jobs', '2', '--chunksize', '64'])
+    assert status == 0
+    for i, df in enumerate(inputs):
+        expected = remove_duplicates(column_drop_threshold(column_name_standardizer(df), 0.5), ['order_id'], keep='last')
+        result = pd.read_csv(tmp_path / 'out' / f'part{i}.csv')
+        assert_frame_equal(result, expected.reset_index(drop=True))
+    output = capsys.readouterr().out
+    assert f"part0.csv: 500 rows in, {len(pd.read_csv(tmp_path / 'out' / 'part0.csv'))} rows x 2 columns out" in output
+    assert "3 written, 0 skipped (up to date), 0 failed, of 3 files." in output
+    assert sorted(os.listdir(tmp_path / 'out')) == ['part0.csv', 'part1.csv', 'part2.csv']
+
+
+def test_resume_skips_up_to_date_outputs(tmp_path, inputs, steps, capsys):
+    """Test that a second run skips the outputs that are newer than their inputs, and redoes the others."""
+    arguments = [str(tmp_path / 'in' / '*.csv'), '--steps', str(steps), '--output-dir', str(tmp_path / 'out'),
+                 '--format', 'parquet']
+    pytest.importorskip('pyarrow')
+    assert main(arguments) == 0
+    capsys.readouterr()
+
+    later = os.path.getmtime(tmp_path / 'out' / 'part1.parquet') + 10
+    os.utime(tmp_path / 'in' / 'part1.csv', (later, later))
+    assert main(arguments) == 0
+    assert "1 written, 2 skipped (up to date), 0 failed, of 3 files." in capsys.readouterr().out
+
+
+def test_failures_and_invalid_steps(tmp_path, inputs):
+    """Test that a file that fails gives exit status 1, and invalid steps are rejected before any file is read."""
+    steps = tmp_path / 'missing_column.json'
+    steps.write_text(json.dumps([{'remove_duplicates': {'subset_columns': ['Missing']}}]))
+    assert main([str(tmp_path / 'in' / 'part0.csv'), '--steps', str(steps), '--output-dir', str(tmp_path / 'out')]) == 1
+    assert not os.listdir(tmp_path / 'out')
+
+    for raw_steps in [[], ['remove_dupes'], [{'column_drop_threshold': {}}], [{'extracting_ymd': {'col': 'a'}}]]:
+        steps.write_text(json.dumps(raw_steps))
+        with pytest.raises(ValueError):
+            load_steps(steps)
+        with pytest.raises(SystemExit):
+            main([str(tmp_path / 'in' / 'part0.csv'), '--steps', str(steps), '--output-dir', str(tmp_path / 'out')])
+
+
+def test_yaml_steps(tmp_path):
+    """Test that YAML steps files are read like JSON ones."""
+    pytest.importorskip('yaml')
+    steps = tmp_path / 'steps.yaml'
+    steps.write_text("- column_name_standardizer\n- extracting_ymd: {column: date, format: '%Y-%m-%d'}\n")
+    assert load_steps(steps) == [('column_name_standardizer', {}),
+                                 ('extracting_ymd', {'column': 'date', 'format': '%Y-%m-%d'})]
+
+
+def test_duplicates_across_chunks_with_different_dtypes(tmp_path, capsys):
+    """Test that duplicates are found across csv chunks whose key column is read as int64 in one chunk
+    and float64 in another (because of a missing value), as when the whole file is read at once."""
+    (tmp_path / 'in').mkdir()
+    path = tmp_path / 'in' / 'orders.csv'
+    pd.DataFrame({'order_id': [1, 2, None, 1, 3], 'amount': [5, 6, 7, 8, 9]}).to_csv(path, index=False)
+    steps = tmp_path / 'steps.json'
+    steps.write_text(json.dumps([{'remove_duplicates': {'subset_columns': ['order_id']}}]))
+
+    assert main([str(path), '--steps', str(steps), '--output-dir', str(tmp_path / 'out'), '--chunksize', '2']) == 0
+    expected = pd.read_csv(path).drop_duplicates(subset=['order_id']).reset_index(drop=True)
+    assert_frame_equal(pd.read_csv(tmp_path / 'out' / 'orders.csv'), expected)
+
+
+def test_same_names_in_different_directories(tmp_path, capsys):
+    """Test that inputs with the same name in different directories keep their directories in the output,
+    and that inputs that would still share an output are rejected before any file is written."""
+    steps = tmp_path / 'steps.json'
+    steps.write_text(json.dumps(['column_name_standardizer']))
+    for year in ['2023', '2024']:
+        (tmp_path / 'in' / year).mkdir(parents=True)
+        pd.DataFrame({'Order ID': [int(year)]}).to_csv(tmp_path / 'in' / year / 'orders.csv', index=False)
+
+    assert main([str(tmp_path / 'in' / '*' / 'orders.csv'), '--steps', str(steps),
+                 '--output-dir', str(tmp_path / 'out')]) == 0
+    for year in ['2023', '2024']:
+        assert pd.read_csv(tmp_path / 'out' / year / 'orders.csv')['order_id'].tolist() == [int(year)]
+
+    # Not read, since the outputs are checked before any file is processed
+    (tmp_path / 'in' / '2023' / 'orders.parquet').write_bytes(b'')
+    with pytest.raises(SystemExit):
+        main([str(tmp_path / 'in' / '2023' / 'orders.*'), '--steps', str(steps), '--output-dir', str(tmp_path / 'x'),
+              '--format', 'csv'])
+    assert "several inputs would be written to each of" in capsys.readouterr().err
+    assert not (tmp_path / 'x').exists()
@@ -1,6 +1,8 @@
 import pandas as pd
 import pytest
-from wrangle_in_py.column_drop_threshold import column_drop_threshold
+import numpy as np
+from scipy.stats import variation
+from wrangle_in_py.column_drop_threshold import column_drop_threshold, column_drop_threshold_chunked, column_statistics
 
 #test data
 empty_df = pd.DataFrame()
@@ -112,3 +114,236 @@ def test_invalid_cv():
     for input in invalid_inputs:
         with pytest.raises(ValueError):  # Expect a ValueError for invalid cv
             column_drop_threshold(expected_df, 0.5, input)
+
+# column_statistics tests
+
+def test_column_statistics_matches_scipy():
+    """
+    column_statistics should report the same null counts and coefficient of variance
+    as counting nulls and calling scipy.stats.variation column by column.
+    """
+    df = pd.DataFrame({
+        'weight_g': [110, 100, 100, 105],
+        'length_cm': [1.5, np.nan, 2.5, 3.5],
+        'apple': ['red delicious', 'pink lady', None, 'gala'],
+    })
+    stats = column_statistics(df)
+    assert stats['null_count'].tolist() == [0, 1, 1]
+    assert stats.loc['weight_g', 'cv'] == pytest.approx(variation(df['weight_g']))
+    assert stats.loc['length_cm', 'mean'] == pytest.approx(2.5)
+    assert np.isnan(stats.loc['length_cm', 'cv']), "cv should propagate missing values like scipy.stats.variation"
+    assert np.isnan(stats.loc['apple', 'cv']), "Non-numeric columns have no cv"
+
+def test_column_statistics_empty():
+    """
+    column_statistics should return one row per column, with NaN statistics when the dataframe has no rows.
+    """
+    stats = column_statistics(pd.DataFrame({'a': pd.Series([], dtype=float)}))
+    assert stats.shape == (1, 5)
+    assert stats[['missingness', 'mean', 'std', 'cv']].isna().all(axis=None)
+    assert column_statistics(empty_df).shape == (0, 5)
+
+def test_wide_frame_matches_column_loop():
+    """
+    column_drop_threshold should keep exactly the columns a per-column loop over
+    isnull() and scipy.stats.variation keeps, including nullable integer columns and constant columns.
+    """
+    rng = np.random.default_rng(0)
+    values = rng.normal(loc=5, scale=rng.uniform(0.1, 5, 200), size=(50, 200))
+    values[rng.random(values.shape) < 0.05] = np.nan
+    df = pd.DataFrame(values, columns=[f'col_{i}' for i in range(200)])
+    df['count'] = pd.array([1, 2, None, 4] * 12 + [5, 6], dtype='Int64')
+    df['constant'] = 3
+
+    columns_to_drop = [col for col in df.columns if df[col].isnull().mean() > 0.05]
+    columns_to_drop += [col for col in df.select_dtypes(include=['number']).columns if variation(df[col]) < 0.4]
+    expected = df.drop(columns=columns_to_drop)
+    pd.testing.assert_frame_equal(column_drop_threshold(df, 0.05, 0.4), expected)
+
+def test_column_statistics_invalid_type():
+    """
+    column_statistics should raise a TypeError if the input for df is not a pandas DataFrame.
+    """
+    with pytest.raises(TypeError):
+        column_statistics([1, 2, 3])
+
+# column_drop_threshold_chunked tests
+
+def test_chunked_matches_in_memory():
+    """
+    column_drop_threshold_chunked should drop the same columns as column_drop_threshold
+    when the dataframe is fed in as a list of chunks.
+    """
+    rng = np.random.default_rng(1)
+    values = rng.normal(loc=5, scale=rng.uniform(0.1, 5, 20), size=(100, 20))
+    values[rng.random(values.shape) < 0.03] = np.nan
+    df = pd.DataFrame(values, columns=[f'col_{i}' for i in range(20)])
+    chunks = [df.iloc[start:start + 7] for start in range(0, len(df), 7)]
+
+    expected = [col for col in df.columns if col not in column_drop_threshold(df, 0.02, 0.3).columns]
+    assert column_drop_threshold_chunked(chunks, 0.02, 0.3) == expected
+
+def test_chunked_csv_output(tmp_path):
+    """
+    column_drop_threshold_chunked should read a csv file in chunks and write the remaining columns to the output file.
+    """
+    source = tmp_path / "fruit.csv"
+    output = tmp_path / "fruit_clean.csv"
+    expected_df.to_csv(source, index=False)
+    dropped = column_drop_threshold_chunked(source, 0.15, 0.3, chunksize=3, output=output)
+    assert dropped == ["weight_g", "height_cm"]
+    pd.testing.assert_frame_equal(pd.read_csv(output), new3_df)
+
+def test_chunked_parquet(tmp_path):
+    """
+    column_drop_threshold_chunked should read parquet files in chunks.
+    """
+    pytest.importorskip("pyarrow")
+    source = tmp_path / "fruit.parquet"
+    expected_df.astype({'height_cm': 'Float64'}).to_parquet(source)
+    assert column_drop_threshold_chunked(source, 0.15, chunksize=2) == ["height_cm"]
+
+def test_chunked_schema_drift():
+    """
+    column_drop_threshold_chunked should treat a column missing from a chunk as missing values for that chunk's rows.
+    """
+    chunks = [pd.DataFrame({'a': [1.0, 2.0]}), pd.DataFrame({'a': [3.0, 4.0], 'b': [1.0, 2.0]})]
+    assert column_drop_threshold_chunked(chunks, 0.4) == ['b']
+
+def test_chunked_empty_source():
+    """
+    column_drop_threshold_chunked should not drop anything when there are no chunks.
+    """
+    assert column_drop_threshold_chunked([], 0.5) == []
+
+def test_chunked_one_shot_iterator_output(tmp_path):
+    """
+    column_drop_threshold_chunked should raise a ValueError when asked to write an output from a one-shot iterator,
+    since the source needs to be read twice.
+    """
+    with pytest.raises(ValueError):
+        column_drop_threshold_chunked(iter([expected_df]), 0.5, output=tmp_path / "out.csv")
+
+def test_chunked_invalid_inputs():
+    """
+    column_drop_threshold_chunked should validate its thresholds and its source.
+    """
+    with pytest.raises(ValueError):
+        column_drop_threshold_chunked([expected_df], 1.5)
+    with pytest.raises(TypeError):
+        column_drop_threshold_chunked(123, 0.5)
+    with pytest.raises(TypeError):
+        column_drop_threshold_chunked([[1, 2, 3]], 0.5)
+    with pytest.raises(ValueError):
+        column_drop_threshold_chunked("fruit.txt", 0.5)
+
+def test_column_stats_updates_match_full_scan():
+    """
+    ColumnStats updated one partition at a time, or merged across workers, should give the statistics
+    and drop decisions of column_drop_threshold on the whole data, also after a JSON round trip.
+    """
+    import json
+    from wrangle_in_py.column_drop_threshold import ColumnStats
+    rng = np.random.default_rng(1)
+    full = pd.DataFrame({
+        'steady': rng.normal(100, 1, 300),
+        'noisy': rng.normal(5, 5, 300),
+        'gappy': np.where(rng.random(300) < 0.4, np.nan, 1.0),
+        'label': rng.choice(['a', 'b', None], 300),
+    })
+    partitions = [full.iloc[:100], full.iloc[100:250], full.iloc[250:]]
+
+    stats = ColumnStats()
+    for partition in partitions:
+        stats = ColumnStats.from_dict(json.loads(json.dumps(stats.to_dict()))).update(partition)
+    merged = ColumnStats(partitions[0]).merge(ColumnStats(partitions[1]).merge(ColumnStats(partitions[2])))
+
+    expected = column_statistics(full)
+    for state in [stats, merged]:
+        assert state.row_count == 300
+        pd.testing.assert_frame_equal(state.statistics(), expected, check_dtype=False)
+        assert state.columns_to_drop(0.37, 0.05) == ['steady', 'gappy']
+        pd.testing.assert_frame_equal(column_drop_threshold(full, 0.37, 0.05, column_stats=state),
+                                      column_drop_threshold(full, 0.37, 0.05))
+
+def test_column_stats_invalid_inputs():
+    """
+    ColumnStats should reject other inputs, and column_drop_threshold should reject stats that do not cover df.
+    """
+    from wrangle_in_py.column_drop_threshold import ColumnStats
+    with pytest.raises(TypeError):
+        ColumnStats([1, 2])
+    with pytest.raises(TypeError):
+        ColumnStats().merge({})
+    with pytest.raises(ValueError):
+        ColumnStats.from_dict({'columns': ['a']})
+    with pytest.raises(TypeError):
+        column_drop_threshold(expected_df, 0.5, column_stats=column_statistics(expected_df))
+    with pytest.raises(ValueError, match="does not cover"):
+        column_drop_threshold(expected_df, 0.5, column_stats=ColumnStats(expected_df[['apple']]))
+
+def test_n_jobs_matches_single_process():
+    """
+    column_drop_threshold with worker processes over shared memory should give the same statistics and result
+    as the single pass, including for nullable, non-numeric and empty inputs.
+    """
+    from wrangle_in_py.column_drop_threshold import _column_statistics_parallel
+    rng = np.random.default_rng(2)
+    df = pd.DataFrame(rng.normal(10, 2, (200, 9)), columns=[f'x{i}' for i in range(9)])
+    df.iloc[::5, ::2] = np.nan
+    df['steady'] = 7.0
+    df['count'] = pd.array(rng.integers(0, 5, 200), dtype='Int64')
+    df.loc[::3, 'count'] = pd.NA
+    df['label'] = rng.choice(['a', None], 200)
+
+    pd.testing.assert_frame_equal(_column_statistics_parallel(df, 3), column_statistics(df))
+    for n_jobs in [2, -1]:
+        pd.testing.assert_frame_equal(column_drop_threshold(df, 0.3, 0.1, n_jobs=n_jobs),
+                                      column_drop_threshold(df, 0.3, 0.1))
+    assert column_drop_threshold(empty_df, 0.5, n_jobs=2).shape == (0, 0)
+    assert column_drop_threshold(expected_df[['apple']], 0.5, n_jobs=2).shape == (4, 1)
+
+    for n_jobs in [0, -2, 1.5, True]:
+        with pytest.raises(ValueError):
+            column_drop_threshold(df, 0.5, n_jobs=n_jobs)
+
+def test_estimate_mode_matches_exact(monkeypatch):
+    """
+    The estimate mode should make the same decisions as the exact mode,
+    computing exact statistics only for the columns the sample cannot decide.
+    """
+    import wrangle_in_py.column_drop_threshold as module
+    rng = np.random.default_rng(3)
+    n = 20_000
+    df = pd.DataFrame({
+        'sparse': np.where(rng.random(n) < 0.9, np.nan, 1.0),
+        'full': rng.normal(10, 5, n),
+        'borderline': np.where(rng.random(n) < 0.5, np.nan, 1.0),
+        'steady': rng.normal(100, 0.1, n),
+        'constant': np.full(n, 2.0),
+        'negative': rng.normal(-10, 5, n),
+        'label': rng.choice(['a', 'b'], n),
+    })
+    exact_columns = []
+    statistics = module._statistics
+    monkeypatch.setattr(module, '_statistics',
+                        lambda frame, n_jobs: exact_columns.append(frame.columns.tolist()) or statistics(frame, n_jobs))
+
+    result = column_drop_threshold(df, 0.5, 0.1, mode='estimate', sample_size=2_000)
+    # Only the columns near a threshold, or that the variance rule might drop, are read in full
+    assert exact_columns == [['borderline', 'steady', 'constant', 'negative']]
+    pd.testing.assert_frame_equal(result, column_drop_threshold(df, 0.5, 0.1))
+
+    # Frames no larger than the sample are checked exactly
+    pd.testing.assert_frame_equal(column_drop_threshold(expected_df, 0.15, 0.3, mode='estimate'), new3_df)
+
+def test_estimate_mode_invalid_inputs():
+    """
+    column_drop_threshold should reject invalid estimate options.
+    """
+    with pytest.raises(ValueError):
+        column_drop_threshold(expected_df, 0.5, mode='sample')
+    with pytest.raises(ValueError):
+        column_drop_threshold(expected_df, 0.5, mode='estimate', sample_size=0)
+    with pytest.raises(ValueError):
+        column_drop_threshold(expected_df, 0.5, mode='estimate', confidence=1.0)
@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 import pandas as pd
 import warnings
 from wrangle_in_py.column_name_standardizer import column_name_standardizer, resulting_duplicates, string_standardizer
@@ -85,3 +86,27 @@ def test_error_wrong_type():
         column_name_standardizer("Not a dataframe")
     with pytest.raises(TypeError):
         column_name_standardizer([1, 2, 3])
+
+def test_no_copy_shares_data():
+    """
+    `column_name_standardizer` with copy=False should rebuild only the column names
+    and share the underlying data with the input dataframe, leaving the input's names unchanged.
+    """
+    df = pd.DataFrame({
+        'Jack Fruit 88': np.arange(5.0),
+        'PINE-APPLES': np.arange(5.0) * 2
+    })
+    standardized_df = column_name_standardizer(df, copy=False)
+    assert standardized_df.columns.tolist() == ['jack_fruit_88', 'pine_apples']
+    assert df.columns.tolist() == ['Jack Fruit 88', 'PINE-APPLES']
+    assert np.shares_memory(standardized_df['jack_fruit_88'].to_numpy(), df['Jack Fruit 88'].to_numpy())
+
+    copied_df = column_name_standardizer(df)
+    assert not np.shares_memory(copied_df['jack_fruit_88'].to_numpy(), df['Jack Fruit 88'].to_numpy())
+
+def test_error_copy_type():
+    """
+    `column_name_standardizer` should raise a ValueError if copy is not a boolean.
+    """
+    with pytest.raises(ValueError):
+        column_name_standardizer(pd.DataFrame({'A': [1]}), copy="no")
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+from wrangle_in_py.downcast import downcast_dtypes
+from wrangle_in_py.extracting_ymd_hms import extracting_hms, extracting_ymd
+
+rng = np.random.default_rng(0)
+df = pd.DataFrame({
+    'timestamp': pd.Series(pd.Timestamp('2020-01-01') + pd.to_timedelta(rng.integers(0, 10**8, 1000), unit='s')),
+    'city': rng.choice(['Vancouver', 'Toronto', 'Montreal'], 1000).astype(object),
+    'count': rng.integers(0, 1000, 1000),
+    'price': rng.integers(0, 400, 1000) / 4,
+    'ratio': rng.random(1000),
+    'flag': rng.random(1000) < 0.5,
+})
+
+# expected cases
+def test_expected_cases(capsys):
+    """
+    `downcast_dtypes` should store each column in the smallest dtype that keeps its values,
+    and print the bytes saved.
+    """
+    wide = extracting_hms(extracting_ymd(df, 'timestamp'), 'timestamp')
+    result = downcast_dtypes(wide)
+    assert result.dtypes.to_dict() == {
+        'timestamp': wide['timestamp'].dtype, 'city': 'category', 'count': np.int16, 'price': np.float32,
+        'ratio': np.float64, 'flag': bool, 'timestamp_year': 'Int16', 'timestamp_month': 'Int8',
+        'timestamp_day': 'Int8', 'timestamp_hour': 'Int8', 'timestamp_minute': 'Int8', 'timestamp_second': 'Int8',
+    }
+    pd.testing.assert_frame_equal(result, wide, check_dtype=False, check_categorical=False)
+    before, after = wide.memory_usage(deep=True).sum(), result.memory_usage(deep=True).sum()
+    assert capsys.readouterr().out == f"{before - after} bytes saved ({before} -> {after} bytes).\n"
+    assert after * 2 < before
+    assert wide['count'].dtype == np.int64, "The input dataframe should not be modified"
+
+def test_selected_columns_and_options(capsys):
+    """
+    `downcast_dtypes` should only downcast the chosen columns, and follow max_category_ratio and float32.
+    """
+    result = downcast_dtypes(df, columns=['count', 'price'])
+    assert result['count'].dtype == np.int16 and result['price'].dtype == np.float32
+    assert result['city'].dtype != 'category'
+    result = downcast_dtypes(df, max_category_ratio=0, float32=False)
+    assert result['city'].dtype != 'category' and result['price'].dtype == np.float64
+    assert result['count'].dtype == np.int16
+
+# edge cases
+def test_nullable_and_edge_values(capsys):
+    """
+    `downcast_dtypes` should keep nullable columns nullable, keep missing values,
+    and only shrink a column when every value fits.
+    """
+    edge = pd.DataFrame({
+        'nullable': pd.array([1, None, -300], dtype='Int64'),
+        'unsigned': np.array([0, 255, 3], dtype=np.uint64),
+        'big': [0, 2**40, 1],
+        'empty': pd.array([None, None, None], dtype='Int64'),
+        'float_nulls': pd.array([0.5, None, 0.1], dtype='Float64'),
+        'with_nan': [0.5, np.nan, 1e300],
+        'unique_strings': ['a', 'b', None],
+        'mixed': ['a', 1, 'a'],
+    })
+    result = downcast_dtypes(edge)
+    assert result['nullable'].dtype == 'Int16'
+    assert result['nullable'].isna().tolist() == [False, True, False]
+    assert result['unsigned'].dtype == np.uint8
+    assert result['big'].dtype == np.int64
+    assert result['empty'].dtype == 'Int8'
+    assert result['float_nulls'].dtype == 'Float64', "0.1 is not exact in float32"
+    assert result['with_nan'].dtype == np.float64, "1e300 overflows float32"
+    assert result['unique_strings'].dtype != 'category' and result['mixed'].dtype == object
+    assert downcast_dtypes(pd.DataFrame()).shape == (0, 0)
+
+# error cases
+def test_errors():
+    """
+    `downcast_dtypes` should raise errors for invalid inputs.
+    """
+    with pytest.raises(TypeError):
+        downcast_dtypes([1, 2])
+    with pytest.raises(KeyError):
+        downcast_dtypes(df, columns=['missing'])
+    for ratio in [-0.1, 1.5, '0.5', True]:
+        with pytest.raises(ValueError):
+            downcast_dtypes(df, max_category_ratio=ratio)
+    with pytest.raises(ValueError):
+        downcast_dtypes(df, float32='yes')
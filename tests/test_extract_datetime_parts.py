@@ -0,0 +1,190 @@
+from wrangle_in_py.extracting_ymd_hms import extract_datetime_parts, DATETIME_PARTS
+import numpy as np
+import pytest
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+
+def test_default_parts():
+    """Test that the year through second are extracted by default, as compact nullable integers."""
+    df = pd.DataFrame({'timestamp': pd.to_datetime(['2024-01-07 12:30:45', '2023-12-25 08:15:30'])})
+    expected = df.assign(
+        timestamp_year=pd.Series([2024, 2023], dtype="Int16"),
+        timestamp_month=pd.Series([1, 12], dtype="Int8"),
+        timestamp_day=pd.Series([7, 25], dtype="Int8"),
+        timestamp_hour=pd.Series([12, 8], dtype="Int8"),
+        timestamp_minute=pd.Series([30, 15], dtype="Int8"),
+        timestamp_second=pd.Series([45, 30], dtype="Int8"),
+    )
+    assert_frame_equal(extract_datetime_parts(df, 'timestamp'), expected)
+
+
+def test_all_parts_match_dt_accessor():
+    """Test that every component matches the pandas .dt accessor, including dates before 1970 and NaT values."""
+    rng = np.random.default_rng(0)
+    timestamps = pd.Series(pd.to_datetime(rng.integers(-5 * 10**18, 7 * 10**18, 5000)))
+    timestamps[::9] = pd.NaT
+    df = pd.DataFrame({'timestamp': timestamps})
+    result = extract_datetime_parts(df, 'timestamp', parts=DATETIME_PARTS)
+
+    expected = {
+        'year': timestamps.dt.year, 'month': timestamps.dt.month, 'day': timestamps.dt.day,
+        'hour': timestamps.dt.hour, 'minute': timestamps.dt.minute, 'second': timestamps.dt.second,
+        'millisecond': timestamps.dt.microsecond // 1000, 'weekday': timestamps.dt.weekday,
+        'quarter': timestamps.dt.quarter,
+    }
+    for part, values in expected.items():
+        pd.testing.assert_series_equal(result[f'timestamp_{part}'].astype("Int64"), values.astype("Int64"),
+                                       check_names=False)
+
+
+def test_timezone_aware_and_units():
+    """Test timezone-aware columns (decomposed in their own timezone) and second-resolution columns."""
+    aware = pd.DataFrame({'timestamp': pd.date_range('2024-03-09 22:00', periods=10, freq='h', tz='America/New_York')})
+    result = extract_datetime_parts(aware, 'timestamp', parts=['day', 'hour'])
+    assert result['timestamp_hour'].tolist() == aware['timestamp'].dt.hour.tolist()
+    assert result['timestamp_day'].tolist() == aware['timestamp'].dt.day.tolist()
+
+    # Built from NumPy, since pandas 2 parses strings to nanoseconds, which cannot hold the year 1600
+    seconds = pd.DataFrame({'timestamp': np.array(['1600-02-29T23:59:59'], dtype='datetime64[s]')})
+    result = extract_datetime_parts(seconds, 'timestamp', parts=['year', 'month', 'day', 'second'])
+    assert result.iloc[0, 1:].tolist() == [1600, 2, 29, 59]
+
+
+def test_no_deep_copy():
+    """Test that the existing columns are not copied and the input DataFrame is left unchanged."""
+    df = pd.DataFrame({'timestamp': pd.date_range('2024-01-01', periods=5, freq='D'), 'value': np.arange(5.0)})
+    result = extract_datetime_parts(df, 'timestamp', parts=['day'])
+    assert np.shares_memory(result['value'].to_numpy(), df['value'].to_numpy())
+    assert df.columns.tolist() == ['timestamp', 'value']
+
+
+def test_empty_dataframe():
+    """Test function with an empty DataFrame."""
+    df = pd.DataFrame({'timestamp': pd.Series([], dtype="datetime64[ns]")})
+    result = extract_datetime_parts(df, 'timestamp', parts=['year', 'second'])
+    assert result.columns.tolist() == ['timestamp', 'timestamp_year', 'timestamp_second']
+    assert len(result) == 0
+
+
+def test_invalid_inputs():
+    """Test that a missing column, non-datetime column, non-DataFrame or unknown part raises an error."""
+    df = pd.DataFrame({'timestamp': pd.to_datetime(['2024-01-07']), 'event': ['meeting']})
+    with pytest.raises(KeyError, match="Column 'created_at' does not exist in the DataFrame."):
+        extract_datetime_parts(df, 'created_at')
+    with pytest.raises(TypeError, match="Column 'event' must be of datetime type."):
+        extract_datetime_parts(df, 'event')
+    with pytest.raises(TypeError):
+        extract_datetime_parts([1, 2], 'timestamp')
+    with pytest.raises(ValueError):
+        extract_datetime_parts(df, 'timestamp', parts=['fortnight'])
+    with pytest.raises(ValueError):
+        extract_datetime_parts(df, 'timestamp', parts=[])
+
+
+def test_multiple_columns_threads():
+    """Test extracting from several datetime columns at once, sequentially and on a thread pool.
+    The result should match extracting one column at a time, and the input should not be copied."""
+    df = pd.DataFrame({
+        'created_at': pd.date_range('2024-01-01', periods=50, freq='37h'),
+        'shipped_at': pd.date_range('2024-02-01', periods=50, freq='11h'),
+        'amount': np.arange(50.0),
+    })
+    expected = extract_datetime_parts(extract_datetime_parts(df, 'created_at'), 'shipped_at')
+    for n_jobs in [None, 2, -1]:
+        result = extract_datetime_parts(df, ['created_at', 'shipped_at'], n_jobs=n_jobs)
+        assert_frame_equal(result, expected)
+        assert np.shares_memory(result['amount'].to_numpy(), df['amount'].to_numpy())
+
+
+def test_existing_output_column_replaced():
+    """Test that an existing '<column>_<part>' column is replaced rather than duplicated."""
+    df = pd.DataFrame({'timestamp': pd.to_datetime(['2024-01-07']), 'timestamp_year': [0]})
+    result = extract_datetime_parts(df, 'timestamp', parts=['year', 'month'])
+    assert result.columns.tolist() == ['timestamp', 'timestamp_year', 'timestamp_month']
+    assert result['timestamp_year'].tolist() == [2024]
+
+
+def test_invalid_n_jobs():
+    """Test that an invalid n_jobs raises a ValueError and a missing column in a list raises a KeyError."""
+    df = pd.DataFrame({'timestamp': pd.to_datetime(['2024-01-07'])})
+    with pytest.raises(ValueError, match="n_jobs must be a positive integer, -1 or None."):
+        extract_datetime_parts(df, ['timestamp'], n_jobs=0)
+    with pytest.raises(KeyError):
+        extract_datetime_parts(df, ['timestamp', 'shipped_at'])
+
+
+@pytest.mark.parametrize("calendar_cache", [False, True])
+def test_target_timezone(calendar_cache):
+    """Test converting tz-aware timestamps to a target timezone, across daylight saving transitions,
+    with and without the calendar cache. The result should match tz_convert followed by the .dt accessor."""
+    rng = np.random.default_rng(1)
+    utc = pd.Series(pd.to_datetime(rng.integers(1.70e18, 1.72e18, 3000)).tz_localize('UTC'))
+    utc[::17] = pd.NaT
+    df = pd.DataFrame({'timestamp': utc})
+    for tz in ['America/New_York', 'Australia/Lord_Howe']:
+        result = extract_datetime_parts(df, 'timestamp', parts=DATETIME_PARTS[:6] + ('weekday',), tz=tz,
+                                        calendar_cache=calendar_cache)
+        local = utc.dt.tz_convert(tz)
+        for part in ['year', 'month', 'day', 'hour', 'minute', 'second', 'weekday']:
+            pd.testing.assert_series_equal(result[f'timestamp_{part}'].astype("Int64"),
+                                           getattr(local.dt, part).astype("Int64"), check_names=False)
+
+
+def test_calendar_cache_naive():
+    """Test that the calendar cache gives the same result as decomposing every row on a naive column."""
+    df = pd.DataFrame({'timestamp': pd.date_range('1999-12-30', periods=500, freq='7h')})
+    assert_frame_equal(extract_datetime_parts(df, 'timestamp', parts=DATETIME_PARTS, calendar_cache=True),
+                       extract_datetime_parts(df, 'timestamp', parts=DATETIME_PARTS))
+
+
+def test_target_timezone_naive_column():
+    """Test that asking to convert a naive column to a timezone raises a ValueError."""
+    df = pd.DataFrame({'timestamp': pd.to_datetime(['2024-01-07'])})
+    with pytest.raises(ValueError):
+        extract_datetime_parts(df, 'timestamp', tz='UTC')
+
+
+@pytest.mark.parametrize("format", ['%Y-%m-%d %H:%M:%S', '%Y%m%dT%H%M%S', '%d/%m/%Y', '%H:%M', '%Y年%m月%d日'])
+def test_string_column_matches_to_datetime(format):
+    """Test that parsing strings with a format gives the same components as pd.to_datetime followed by extraction,
+    for object and string columns with missing values."""
+    rng = np.random.default_rng(2)
+    strings = pd.Series(pd.to_datetime(rng.integers(-2e18, 4e18, 2000))).dt.strftime(format).astype(object)
+    strings[::11] = None
+    expected = extract_datetime_parts(pd.DataFrame({'t': pd.to_datetime(strings, format=format)}), 't',
+                                      parts=DATETIME_PARTS)
+    for dtype in [object, "string"]:
+        df = pd.DataFrame({'t': strings.astype(dtype)})
+        result = extract_datetime_parts(df, 't', parts=DATETIME_PARTS, format=format)
+        assert_frame_equal(result.drop(columns='t'), expected.drop(columns='t'))
+
+
+@pytest.mark.parametrize("value", ['2024-1-07', '2024-01-077', '2024/01/07', '2023-13-01', '1900-02-29', ''])
+def test_string_not_matching_format(value):
+    """Test that strings with the wrong layout or an impossible date raise a ValueError."""
+    df = pd.DataFrame({'t': ['2000-02-29', value]})
+    with pytest.raises(ValueError, match="doesn't match format"):
+        extract_datetime_parts(df, 't', format='%Y-%m-%d')
+
+
+def test_unsupported_format():
+    """Test that formats with unsupported or repeated directives, or without directives, raise a ValueError,
+    and that a string column without a format or a non-string column with one raises a TypeError."""
+    df = pd.DataFrame({'t': ['2024-01-07'], 'n': [1]})
+    for format in ['%Y-%m-%d %f', '%Y-%Y', 'date', 7]:
+        with pytest.raises(ValueError):
+            extract_datetime_parts(df, 't', format=format)
+    with pytest.raises(TypeError, match="Column 't' must be of datetime type."):
+        extract_datetime_parts(df, 't')
+    with pytest.raises(TypeError, match="Column 'n' must be of datetime or string type."):
+        extract_datetime_parts(df, 'n', format='%Y')
+
+
+def test_new_columns_do_not_share_masks():
+    """Test that filling a missing value in one new column leaves the other new columns missing."""
+    df = pd.DataFrame({'ts': pd.to_datetime(['2024-01-07 12:30:45', None])})
+    result = extract_datetime_parts(df, 'ts')
+    result.loc[1, 'ts_year'] = 2000
+    assert result.loc[1, 'ts_year'] == 2000
+    assert result.loc[1, ['ts_month', 'ts_day', 'ts_hour', 'ts_minute', 'ts_second']].isna().all()
@@ -125,4 +125,14 @@ def test_large_dataframe():
     assert result.shape == (1000000, 4)  # Ensure the new columns are added
     assert result['timestamp_hour'].iloc[0] == 0
     assert result['timestamp_minute'].iloc[-1] == 46  # Last row's minute
-    assert result['timestamp_second'].iloc[-1] == 39  # Last row's second
\ No newline at end of file
+    assert result['timestamp_second'].iloc[-1] == 39  # Last row's second
+
+def test_string_column_with_format():
+    """Test that a string column is parsed with a format, and missing strings give missing values."""
+    df = pd.DataFrame({'timestamp': pd.Series(['20240107T123045', pd.NA], dtype="string")})
+    expected = df.assign(
+        timestamp_hour=pd.Series([12, None], dtype="Int64"),
+        timestamp_minute=pd.Series([30, None], dtype="Int64"),
+        timestamp_second=pd.Series([45, None], dtype="Int64"),
+    )
+    assert_frame_equal(extracting_hms(df, 'timestamp', format='%Y%m%dT%H%M%S'), expected)
@@ -122,4 +122,33 @@ def test_large_dataframe():
     result = extracting_ymd(df, 'timestamp')
     assert result.shape == (1000000, 4)  # Ensure the new columns are added
     assert result['timestamp_year'].iloc[0] == 2024
-    assert result['timestamp_month'].iloc[-1] == 1  # Dynamically compute the last row's month
\ No newline at end of file
+    assert result['timestamp_month'].iloc[-1] == 1  # Dynamically compute the last row's month
+
+def test_string_column_with_format():
+    """Test that a string column is parsed with a format, and missing strings give missing values."""
+    df = pd.DataFrame({'timestamp': ['2024-01-07 12:30:45', None, '2023-12-25 08:15:30']})
+    expected = df.assign(
+        timestamp_year=pd.Series([2024, None, 2023], dtype="Int64"),
+        timestamp_month=pd.Series([1, None, 12], dtype="Int64"),
+        timestamp_day=pd.Series([7, None, 25], dtype="Int64"),
+    )
+    assert_frame_equal(extracting_ymd(df, 'timestamp', format='%Y-%m-%d %H:%M:%S'), expected)
+
+
+def test_string_column_not_matching_format():
+    """Test that a string that does not match the format raises a ValueError."""
+    df = pd.DataFrame({'timestamp': ['2024-01-07', '2024-02-30']})
+    with pytest.raises(ValueError, match='time data "2024-02-30" doesn\'t match format'):
+        extracting_ymd(df, 'timestamp', format='%Y-%m-%d')
+
+
+@pytest.mark.parametrize("values", [[], [None, None]])
+def test_empty_string_column_with_format(values):
+    """Test that an empty or all-missing object column is accepted with a format and gives missing values."""
+    df = pd.DataFrame({'timestamp': pd.Series(values, dtype=object)})
+    expected = df.assign(
+        timestamp_year=pd.Series([None] * len(values), dtype="Int64"),
+        timestamp_month=pd.Series([None] * len(values), dtype="Int64"),
+        timestamp_day=pd.Series([None] * len(values), dtype="Int64"),
+    )
+    assert_frame_equal(extracting_ymd(df, 'timestamp', format='%Y-%m-%d'), expected)
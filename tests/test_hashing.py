@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+from wrangle_in_py.hashing import BloomFilter, UInt64HashTable, hash_rows
+
+def test_hash_rows():
+    """
+    hash_rows should give equal rows equal hashes, looking only at subset_columns when given.
+    """
+    df = pd.DataFrame({'A': [1, 2, 1], 'B': ['x', 'y', 'z']})
+    by_a = hash_rows(df, subset_columns=['A'])
+    assert by_a.dtype == np.uint64
+    assert by_a[0] == by_a[2] and by_a[0] != by_a[1]
+    assert len(set(hash_rows(df).tolist())) == 3
+
+def test_hash_table_add_and_counts():
+    """
+    UInt64HashTable.add should flag keys seen in earlier calls and earlier in the same call,
+    and counts should report how many times each key was added.
+    """
+    table = UInt64HashTable(capacity=2)
+    first = table.add(np.array([3, 0, 3], dtype=np.uint64))
+    second = table.add(np.arange(100, dtype=np.uint64))
+    assert first.tolist() == [False, False, True]
+    assert second[[0, 3]].all() and not second[[1, 2, 4]].any()
+    assert len(table) == 100
+    assert table.counts(np.array([3, 0, 99, 1000], dtype=np.uint64)).tolist() == [3, 2, 1, 0]
+
+def test_hash_table_subtract():
+    """
+    UInt64HashTable.subtract should decrement the counts of keys in the table and ignore unknown keys.
+    """
+    table = UInt64HashTable()
+    table.add(np.array([5, 5, 6], dtype=np.uint64))
+    table.subtract(np.array([5, 7], dtype=np.uint64))
+    assert table.counts(np.array([5, 6, 7], dtype=np.uint64)).tolist() == [1, 1, 0]
+
+def test_hash_table_matches_python_set():
+    """
+    UInt64HashTable should agree with a Python set on a long random sequence of colliding keys.
+    """
+    rng = np.random.default_rng(0)
+    table = UInt64HashTable(capacity=8)
+    reference = set()
+    for _ in range(20):
+        keys = (rng.integers(0, 2000, size=300).astype(np.uint64) * np.uint64(1024))
+        expected = []
+        for key in keys.tolist():
+            expected.append(key in reference)
+            reference.add(key)
+        assert table.add(keys).tolist() == expected
+    assert len(table) == len(reference)
+
+def test_hash_table_invalid_capacity():
+    """
+    UInt64HashTable should raise a ValueError for a capacity that is not a positive integer.
+    """
+    with pytest.raises(ValueError):
+        UInt64HashTable(capacity=0)
+
+def test_bloom_filter_no_false_negatives():
+    """
+    BloomFilter.contains should report every added key as present, and report about error_rate
+    of the keys that were never added as present once capacity keys have been added.
+    """
+    rng = np.random.default_rng(0)
+    keys = rng.integers(0, 2**63, size=20000, dtype=np.int64).astype(np.uint64)
+    bloom = BloomFilter(capacity=10000, error_rate=0.01)
+    bloom.add(keys[:10000])
+    assert bloom.contains(keys[:10000]).all()
+    assert bloom.contains(keys[10000:]).mean() < 0.02
+    assert 0.005 < bloom.false_positive_rate < 0.02
+    assert len(bloom) == 10000
+
+def test_bloom_filter_empty():
+    """
+    An empty BloomFilter should contain nothing and have a false positive rate of 0.
+    """
+    bloom = BloomFilter(capacity=10)
+    assert not bloom.contains(np.array([1, 2, 3], dtype=np.uint64)).any()
+    assert bloom.false_positive_rate == 0.0
+
+def test_bloom_filter_invalid_parameters():
+    """
+    BloomFilter should raise a ValueError for a capacity or error_rate outside their ranges.
+    """
+    for kwargs in [{'capacity': 0}, {'capacity': 1.5}, {'error_rate': 0.0}, {'error_rate': 1.0}, {'error_rate': 1}]:
+        with pytest.raises(ValueError):
+            BloomFilter(**kwargs)
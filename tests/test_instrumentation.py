@@ -0,0 +1,132 @@
+from wrangle_in_py.instrumentation import CallEvent, LoggingHook, MetricsCollector, add_hook, instrument, remove_hook
+from wrangle_in_py import instrumentation
+from wrangle_in_py.column_drop_threshold import column_drop_threshold, column_drop_threshold_chunked
+from wrangle_in_py.column_name_standardizer import column_name_standardizer
+from wrangle_in_py.extracting_ymd_hms import extracting_ymd
+from wrangle_in_py.pipeline import Pipeline
+from wrangle_in_py.profiling import profile
+from wrangle_in_py.remove_duplicates import remove_duplicates
+import logging
+import numpy as np
+import pytest
+import pandas as pd
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        'Fruit Name': ['apple', 'apple', 'kiwi', 'mango'],
+        'Amount': [1.0, 1.0, 2.0, 3.0],
+        'Notes': [None, None, None, 'ripe'],
+        'Bought': pd.to_datetime(['2024-01-07', '2024-01-07', '2023-12-25', '2024-02-29']),
+    })
+
+
+def test_events_describe_calls(df):
+    """Test that each call gives an event with its shapes, dropped counts and copied bytes."""
+    with instrument() as metrics:
+        remove_duplicates(df)
+        column_drop_threshold(df, 0.5)
+        extracting_ymd(df, 'Bought')
+
+    dedup, drop, extract = metrics.events
+    assert dedup.function == 'remove_duplicates'
+    assert (dedup.input_shape, dedup.output_shape, dedup.rows_dropped, dedup.columns_dropped) == ((4, 4), (3, 4), 1, 0)
+    assert dedup.bytes_copied > 0
+    assert (drop.function, drop.output_shape, drop.rows_dropped, drop.columns_dropped) == ('column_drop_threshold', (4, 3), 0, 1)
+    assert (extract.output_shape, extract.columns_dropped) == ((4, 7), 0)
+    assert all(event.seconds >= 0 and event.error is None for event in metrics.events)
+
+
+def test_bytes_copied_counts_only_new_data(df):
+    """Test that renaming without a copy copies no bytes, while a deep copy copies the column data."""
+    with instrument() as metrics:
+        column_name_standardizer(df, copy=False)
+        column_name_standardizer(df, copy=True)
+    assert metrics.events[0].bytes_copied == 0
+    assert metrics.events[1].bytes_copied >= df['Amount'].nbytes + df['Bought'].nbytes
+
+
+def test_errors_are_reported_and_raised(df):
+    """Test that a call that raises still reaches the hooks, and the error is raised to the caller."""
+    with instrument() as metrics:
+        with pytest.raises(TypeError):
+            extracting_ymd(df, 'Amount')
+    event, = metrics.events
+    assert isinstance(event.error, TypeError)
+    assert event.output_shape is None and event.rows_dropped is None
+
+
+def test_input_passed_by_keyword(df):
+    """Test that the input is found by its parameter name when every argument is passed by keyword, in any order."""
+    with instrument() as metrics:
+        remove_duplicates(keep='last', df=df)
+        column_drop_threshold(threshold=0.5, df=df)
+    assert [event.input_shape for event in metrics.events] == [(4, 4), (4, 4)]
+    assert [event.rows_dropped for event in metrics.events] == [1, 0]
+
+
+def test_profile_chunked_and_ipc_functions_are_reported(df, tmp_path):
+    """Test that profile, the chunked column_drop_threshold and the Arrow IPC functions give events too,
+    with unknown shapes where the input is a file or the result is not a DataFrame."""
+    path = tmp_path / 'data.csv'
+    df.to_csv(path, index=False)
+    with instrument() as metrics:
+        profile(df)
+        column_drop_threshold_chunked(str(path), 0.5)
+    report, chunked = metrics.events
+    assert (report.function, report.input_shape, report.rows_dropped) == ('profile', (4, 4), 0)
+    assert (chunked.function, chunked.input_shape, chunked.output_shape) == ('column_drop_threshold_chunked', None, None)
+
+    pytest.importorskip("pyarrow")
+    from wrangle_in_py.arrow_io import remove_duplicates_ipc
+    import pyarrow.feather as feather
+    feather.write_feather(df.drop(columns='Bought'), tmp_path / 'data.arrow')
+    with instrument() as metrics:
+        remove_duplicates_ipc(tmp_path / 'data.arrow', tmp_path / 'out.arrow')
+    assert metrics.events[0].function == 'remove_duplicates_ipc' and metrics.events[0].error is None
+
+
+def test_registry(df):
+    """Test adding and removing hooks, and that the context manager restores the registry."""
+    events = []
+    hook = add_hook(events.append)
+    try:
+        add_hook(events.append)
+        with instrument(events.append):
+            Pipeline(df).remove_duplicates().collect()
+        assert instrumentation._hooks == (events.append,)
+        remove_duplicates(df)
+    finally:
+        remove_hook(hook)
+    assert instrumentation._hooks == ()
+    assert [event.function for event in events] == ['Pipeline.collect', 'remove_duplicates']
+    assert events[0].input_shape == (4, 4) and events[0].rows_dropped == 1
+
+    remove_duplicates(df)
+    assert len(events) == 2
+    with pytest.raises(TypeError):
+        add_hook('not a hook')
+
+
+def test_logging_hook_and_summary(df, caplog):
+    """Test the logging adapter and the per-function summary of the metrics collector."""
+    metrics = MetricsCollector()
+    with caplog.at_level(logging.INFO, logger='wrangle_in_py'), instrument(LoggingHook(), metrics):
+        remove_duplicates(df)
+        remove_duplicates(df, subset_columns=['Fruit Name'])
+    assert "remove_duplicates: (4, 4) -> (3, 4)" in caplog.text
+    assert isinstance(caplog.records[0].event, CallEvent)
+
+    summary = metrics.summary()
+    assert summary.loc['remove_duplicates', 'calls'] == 2
+    assert summary.loc['remove_duplicates', 'rows_dropped'] == 2
+    metrics.clear()
+    assert metrics.summary().empty
+
+
+def test_byte_bounds_of_strided_arrays():
+    """Test that the byte bounds helper, which differs between NumPy 1 and 2, spans exactly the array's memory."""
+    values = np.arange(10, dtype=np.int64)
+    start, end = instrumentation._byte_bounds(values[2:8:2])
+    assert start == values.ctypes.data + 16 and end == values.ctypes.data + 7 * 8
@@ -0,0 +1,74 @@
+import datetime
+import numpy as np
+import pytest
+from wrangle_in_py.key_store import SeenKeyStore
+
+def test_key_store_add_and_contains(tmp_path):
+    """
+    SeenKeyStore should report the keys added to it, including in a later session on the same file,
+    and keep the full 64-bit range of the keys.
+    """
+    keys = np.array([0, 7, 2**63, 2**64 - 1, 7], dtype=np.uint64)
+    with SeenKeyStore(tmp_path / 'seen.sqlite', batch_size=2) as store:
+        assert not store.contains(keys).any()
+        store.add(keys)
+        assert len(store) == 4
+    with SeenKeyStore(tmp_path / 'seen.sqlite') as store:
+        assert store.contains(keys).all()
+        assert store.contains(np.array([1, 2**63 + 1, 7], dtype=np.uint64)).tolist() == [False, False, True]
+        assert store.contains(np.array([], dtype=np.uint64)).shape == (0,)
+
+def test_key_store_stage_and_commit(tmp_path):
+    """
+    SeenKeyStore should count staged keys as seen, write them only on commit, and drop them if closed first.
+    """
+    with SeenKeyStore(tmp_path / 'seen.sqlite') as store:
+        store.stage(np.array([1, 2, 2], dtype=np.uint64))
+        assert store.contains(np.array([1, 3], dtype=np.uint64)).tolist() == [True, False]
+        assert len(store) == 0
+    with SeenKeyStore(tmp_path / 'seen.sqlite') as store:
+        assert not store.contains(np.array([1, 2], dtype=np.uint64)).any()
+        store.stage(np.array([1, 2], dtype=np.uint64))
+        store.stage(np.array([2, 3], dtype=np.uint64))
+        assert store.commit() == 3
+        assert store.commit() == 0
+    with SeenKeyStore(tmp_path / 'seen.sqlite') as store:
+        assert store.contains(np.array([1, 2, 3], dtype=np.uint64)).all()
+
+def test_key_store_retention(tmp_path):
+    """
+    SeenKeyStore should evict the keys last seen longer than retention ago, counting the latest sighting,
+    both on evict() and when the store is opened.
+    """
+    with SeenKeyStore(tmp_path / 'seen.sqlite', retention=datetime.timedelta(days=1)) as store:
+        store.add(np.array([1, 2, 3], dtype=np.uint64), seen_at=0)
+        store.add(np.array([3], dtype=np.uint64), seen_at=50_000)
+        store.add(np.array([4], dtype=np.uint64))
+        assert store.evict(now=100_000) == 2
+        assert store.contains(np.array([1, 2, 3, 4], dtype=np.uint64)).tolist() == [False, False, True, True]
+    with SeenKeyStore(tmp_path / 'seen.sqlite', retention=3600) as store:
+        assert len(store) == 1
+    with SeenKeyStore(tmp_path / 'seen.sqlite') as store:
+        assert store.evict() == 0
+
+def test_key_store_invalid_parameters(tmp_path):
+    """
+    SeenKeyStore should raise a ValueError for an invalid retention or batch_size.
+    """
+    for retention in [-1, '1 day', True, datetime.timedelta(seconds=-1)]:
+        with pytest.raises(ValueError, match="retention must be"):
+            SeenKeyStore(tmp_path / 'seen.sqlite', retention=retention)
+    for batch_size in [0, 1.5, None]:
+        with pytest.raises(ValueError, match="batch_size must be"):
+            SeenKeyStore(tmp_path / 'seen.sqlite', batch_size=batch_size)
+
+def test_key_store_evicts_through_index(tmp_path):
+    """
+    SeenKeyStore should find the expired keys through an index on the time they were last seen,
+    rather than by reading the whole table.
+    """
+    with SeenKeyStore(tmp_path / 'seen.sqlite', retention=60) as store:
+        plan = store._connection.execute(
+            "EXPLAIN QUERY PLAN DELETE FROM seen_keys WHERE seen_at < ?", (0,)
+        ).fetchall()
+    assert any('seen_keys_seen_at' in row[-1] for row in plan)
@@ -0,0 +1,119 @@
+from wrangle_in_py.pipeline import Pipeline
+from wrangle_in_py import pipeline as pipeline_module
+from wrangle_in_py.column_name_standardizer import column_name_standardizer
+from wrangle_in_py.column_drop_threshold import column_drop_threshold
+from wrangle_in_py.remove_duplicates import remove_duplicates
+from wrangle_in_py.extracting_ymd_hms import extracting_ymd, extracting_hms, extract_datetime_parts
+from wrangle_in_py.value_standardizer import value_standardizer
+import numpy as np
+import pytest
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(0)
+    n = 500
+    return pd.DataFrame({
+        'Time Stamp': pd.to_datetime(rng.integers(0, 5, n) * 86_400 * 10**9 * 30 + 3_600 * 10**9),
+        'Fruit Name': rng.choice(['Apple', 'APPLE', 'kiwi', None], n),
+        'Amount': rng.integers(0, 3, n),
+        'Mostly Null': np.where(rng.random(n) < 0.9, np.nan, 1.0),
+        'Constant': np.ones(n),
+        'Grade': pd.Categorical(rng.choice(['A b', 'a-b', 'c'], n)),
+    })
+
+
+def test_chain_matches_eager(df):
+    """Test that the standardize, drop, deduplicate and extract chain gives the same result as the functions."""
+    expected = extracting_ymd(remove_duplicates(column_drop_threshold(column_name_standardizer(df), 0.5, 0.1)),
+                              'time_stamp')
+    result = (Pipeline(df).column_name_standardizer().column_drop_threshold(0.5, 0.1)
+              .remove_duplicates().extracting_ymd('time_stamp').collect())
+    assert_frame_equal(result, expected)
+
+
+@pytest.mark.filterwarnings("ignore:Duplicate values")
+def test_other_orders_match_eager(df):
+    """Test steps in other orders, where new columns are compared, dropped or kept."""
+    expected = column_drop_threshold(
+        remove_duplicates(
+            extract_datetime_parts(value_standardizer(df), 'Time Stamp', parts=['year', 'weekday']),
+            ['Fruit Name', 'Time Stamp_weekday'], keep='last'
+        ), 0.5, 0.5
+    )
+    result = (Pipeline(df).value_standardizer().extract_datetime_parts('Time Stamp', parts=['year', 'weekday'])
+              .remove_duplicates(['Fruit Name', 'Time Stamp_weekday'], keep='last')
+              .column_drop_threshold(0.5, 0.5).collect())
+    assert_frame_equal(result, expected)
+
+    expected = remove_duplicates(extracting_hms(column_drop_threshold(df, 0.5), 'Time Stamp'), keep=False)
+    result = Pipeline(df).column_drop_threshold(0.5).extracting_hms('Time Stamp').remove_duplicates(keep=False).collect()
+    assert_frame_equal(result, expected)
+
+
+def test_lazy_until_collect(df, monkeypatch):
+    """Test that nothing is computed until collect,
+    and that extracted columns that are not selected are never computed."""
+    calls = []
+    components = pipeline_module._column_components
+    monkeypatch.setattr(pipeline_module, '_column_components',
+                        lambda *args, **kwargs: calls.append(1) or components(*args, **kwargs))
+
+    pipeline = Pipeline(df).extracting_ymd('Time Stamp').remove_duplicates(['Amount']).select(['Amount'])
+    assert calls == []
+    result = pipeline.collect()
+    assert calls == []
+    assert_frame_equal(result, remove_duplicates(df, ['Amount'])[['Amount']])
+
+    Pipeline(df).extracting_ymd('Time Stamp').remove_duplicates(['Amount']).collect()
+    assert calls == [1]
+
+
+@pytest.mark.filterwarnings("ignore:Duplicate values")
+def test_input_not_modified(df):
+    """Test that collect does not change the input DataFrame."""
+    original = df.copy()
+    Pipeline(df).column_name_standardizer().value_standardizer().extracting_ymd('time_stamp').collect()
+    assert_frame_equal(df, original)
+
+
+def test_explain(df):
+    """Test that explain lists every step and the planned output columns."""
+    plan = Pipeline(df).column_name_standardizer().column_drop_threshold(0.5).extracting_ymd('time_stamp').explain()
+    assert plan.splitlines()[0] == "Pipeline over 500 rows x 6 columns"
+    assert "1. column_name_standardizer(): renames 6 columns, no data is read" in plan
+    assert "column_drop_threshold(0.5, variance=None)" in plan
+    assert "adds ['time_stamp_year', 'time_stamp_month', 'time_stamp_day']" in plan
+
+
+def test_invalid_steps(df):
+    """Test that unknown columns and invalid arguments are rejected when the step is added,
+    and errors that depend on the data when the pipeline is collected."""
+    with pytest.raises(TypeError):
+        Pipeline([1, 2])
+    with pytest.raises(KeyError):
+        Pipeline(df).column_name_standardizer().extracting_ymd('Time Stamp')
+    with pytest.raises(ValueError):
+        Pipeline(df).remove_duplicates(['Missing'])
+    with pytest.raises(ValueError):
+        Pipeline(df).column_drop_threshold(2)
+    with pytest.raises(KeyError):
+        Pipeline(df).select(['Missing'])
+
+    pipeline = Pipeline(df).extracting_ymd('Amount')
+    with pytest.raises(TypeError, match="Column 'Amount' must be of datetime type."):
+        pipeline.collect()
+    # The column is only dropped at collect, so using it afterwards fails then
+    pipeline = Pipeline(df).column_drop_threshold(0.5).extracting_ymd('Mostly Null')
+    with pytest.raises(KeyError):
+        pipeline.collect()
+
+
+def test_extracted_columns_do_not_share_masks():
+    """Test that filling a missing value in one extracted column leaves the other extracted columns missing."""
+    frame = pd.DataFrame({'ts': pd.to_datetime(['2024-01-07 12:30:45', None])})
+    result = Pipeline(frame).extract_datetime_parts('ts', parts=['year', 'month', 'hour']).collect()
+    result.loc[1, 'ts_year'] = 2000
+    assert result.loc[1, ['ts_month', 'ts_hour']].isna().all()
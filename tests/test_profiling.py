@@ -0,0 +1,127 @@
+from wrangle_in_py.profiling import Profile, _combine_column_hashes, profile
+from wrangle_in_py.column_drop_threshold import column_drop_threshold, column_statistics
+from wrangle_in_py.column_name_standardizer import column_name_standardizer
+from wrangle_in_py.remove_duplicates import _canonical_hashes, remove_duplicates
+import numpy as np
+import pytest
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(0)
+    n = 300
+    return pd.DataFrame({
+        # A string dtype on every pandas version: pandas 2 would make an object column, which profiles do not hash
+        'Fruit Name': pd.array(rng.choice(['kiwi', 'mango', None], n), dtype='string'),
+        'fruit-name': rng.integers(0, 3, n),
+        'Weight': rng.choice([1.5, 2.5, np.nan], n),
+        'Grade': pd.Categorical(rng.choice(['A', 'B'], n)),
+        'Constant': np.ones(n),
+    })
+
+
+def test_profile_contents(df):
+    """Test that the profile holds the statistics, distinct counts, row hashes and name collisions of df."""
+    report = profile(df)
+    assert report.shape == df.shape
+    assert_frame_equal(report.statistics.drop(columns='cardinality'), column_statistics(df))
+    assert report.statistics['cardinality'].tolist() == df.nunique().tolist()
+    assert (report.row_hashes == _canonical_hashes(df, None)).all()
+    assert report.duplicate_rows == df.duplicated().sum()
+    assert report.name_collisions == {'fruit_name': ['Fruit Name', 'fruit-name']}
+    assert repr(report).startswith("Profile(300 rows x 5 columns")
+
+
+@pytest.mark.filterwarnings("ignore:Duplicate column names")
+def test_functions_reuse_profile(df, monkeypatch):
+    """Test that the functions give the same results with a profile, without scanning df again."""
+    report = profile(df)
+    import wrangle_in_py.column_drop_threshold as drop_module
+    import wrangle_in_py.remove_duplicates as dedup_module
+    expected_drop = column_drop_threshold(df, 0.3, 0.1)
+    expected_dedup = remove_duplicates(df, keep='last')
+
+    def fail(*args, **kwargs):
+        raise AssertionError("df was scanned again")
+    monkeypatch.setattr(drop_module, 'column_statistics', fail)
+    monkeypatch.setattr(pd.DataFrame, 'drop_duplicates', fail)
+
+    assert_frame_equal(column_drop_threshold(df, 0.3, 0.1, profile=report), expected_drop)
+    assert_frame_equal(remove_duplicates(df, keep='last', profile=report), expected_dedup)
+    assert column_name_standardizer(df, profile=report).columns.tolist() == report.standardized_columns
+
+
+def test_profile_mismatch(df):
+    """Test that a profile of another DataFrame, or another object, is rejected."""
+    report = profile(df)
+    other = df.iloc[:10]
+    with pytest.raises(ValueError, match="different DataFrame"):
+        column_drop_threshold(other, 0.5, profile=report)
+    with pytest.raises(ValueError, match="different DataFrame"):
+        remove_duplicates(other, profile=report)
+    with pytest.raises(ValueError, match="different DataFrame"):
+        column_name_standardizer(df.rename(columns={'Weight': 'Mass'}), profile=report)
+    with pytest.raises(TypeError):
+        column_drop_threshold(df, 0.5, profile=report.statistics)
+    with pytest.raises(ValueError):
+        remove_duplicates(df, profile={})
+    with pytest.raises(TypeError):
+        profile([1, 2])
+    assert isinstance(profile(pd.DataFrame()), Profile)
+
+
+@pytest.mark.parametrize("columns", [
+    {'int': [1, 2, 1], 'float': [0.5, np.nan, 0.5], 'string': ['a', None, 'a']},
+    {'nullable': pd.array([1, None, 1], dtype='Int64'), 'bool': [True, False, True]},
+    {'category': pd.Categorical(['x', 'y', 'x']), 'datetime': pd.to_datetime(['2024-01-07', None, '2024-01-07'])},
+    {'object': pd.Series([1, 'a', 1], dtype=object)},
+    {'only': [3, 3, 3]},
+])
+def test_row_hashes_match_pandas(columns):
+    """Test that combining pandas' column hashes gives exactly pandas' row hashes, for every kind of column,
+    and that the profile's row hashes are the ones remove_duplicates computes."""
+    frame = pd.DataFrame(columns)
+    column_hashes = [pd.util.hash_pandas_object(series, index=False).to_numpy() for _, series in frame.items()]
+    expected = pd.util.hash_pandas_object(frame, index=False).to_numpy()
+    assert (_combine_column_hashes(column_hashes, len(frame)) == expected).all()
+    assert (profile(frame).row_hashes == _canonical_hashes(frame, None)).all()
+
+
+@pytest.mark.parametrize("keep", ['first', 'last', False])
+def test_profile_signed_zeros(keep):
+    """Test that 0.0 and -0.0, which are equal but stored differently, count as one value and as duplicate rows."""
+    frame = pd.DataFrame({'A': [0.0, -0.0, 1.0, 0.0, 2.0], 'B': [1, 1, 1, 1, 1]})
+    report = profile(frame)
+    assert report.duplicate_rows == frame.duplicated().sum() == 2
+    assert report.statistics['cardinality'].tolist() == frame.nunique().tolist()
+    assert_frame_equal(remove_duplicates(frame, keep=keep, profile=report), frame.drop_duplicates(keep=keep))
+
+
+def test_profile_of_changed_values(df):
+    """Test that a profile is rejected for a DataFrame whose values changed, in a row the profile samples."""
+    report = profile(df)
+    changed = df.copy()
+    changed.loc[0, 'Weight'] = 100.0
+    with pytest.raises(ValueError, match="different DataFrame"):
+        remove_duplicates(changed, profile=report)
+    with pytest.raises(ValueError, match="different DataFrame"):
+        column_drop_threshold(changed, 0.5, profile=report)
+
+
+@pytest.mark.parametrize("keep", ['first', 'last', False])
+def test_profile_mixed_type_keys(keep, capsys):
+    """Test that values that hash alike without being equal, such as 1 and '1', are not taken for duplicates,
+    and that equal values that hash differently, such as 2 and 2.0, are."""
+    frame = pd.DataFrame({'A': [1, '1', 2, 2.0, 1], 'B': [0] * 5})
+    report = profile(frame)
+    assert report.duplicate_rows == frame.duplicated().sum()
+    assert_frame_equal(remove_duplicates(frame, keep=keep, profile=report), remove_duplicates(frame, keep=keep))
+
+
+def test_profile_hash_collisions_are_confirmed(df):
+    """Test that rows that share a hash are only dropped if their values are equal."""
+    report = profile(df)
+    report.row_hashes = np.zeros(len(df), dtype=np.uint64)
+    assert_frame_equal(remove_duplicates(df, profile=report), remove_duplicates(df))
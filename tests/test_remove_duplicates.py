@@ -1,5 +1,8 @@
 from wrangle_in_py.remove_duplicates import remove_duplicates
+from wrangle_in_py.hashing import BloomFilter
+from wrangle_in_py.key_store import SeenKeyStore
 import pytest
+import numpy as np
 import pandas as pd
 from pandas.testing import assert_frame_equal
 
@@ -164,3 +167,141 @@ def test_remove_duplicates_large_dataframe():
     expected = pd.DataFrame({'A': list(range(1000)), 'B': list(range(1000))})
     pd.testing.assert_frame_equal(result.reset_index(drop=True), expected)
 
+
+@pytest.mark.parametrize("keep", ['first', 'last', False])
+def test_remove_duplicates_n_jobs_matches_single_threaded(keep):
+    """Test that hash-partitioned parallel deduplication keeps the same rows, in the same order, as drop_duplicates.
+    Expectation: The result should be identical for every keep option and several numbers of jobs."""
+    df = pd.DataFrame({'A': [i % 7 for i in range(200)], 'B': [str(i % 3) for i in range(200)], 'C': list(range(200))})
+    for n_jobs in [2, 3, -1]:
+        result = remove_duplicates(df, subset_columns=['A', 'B'], keep=keep, n_jobs=n_jobs)
+        pd.testing.assert_frame_equal(result, df.drop_duplicates(subset=['A', 'B'], keep=keep))
+
+@pytest.mark.parametrize("keep", ['first', 'last', False])
+def test_remove_duplicates_n_jobs_mixed_type_keys(keep):
+    """Test parallel deduplication of object keys whose values hash alike but are not equal, such as 1 and '1'.
+    Expectation: The result should be identical to the single-threaded result."""
+    df = pd.DataFrame({'A': [1, '1', 2, 2.0, '2.0', None, 'None'], 'B': [0] * 7})
+    expected = remove_duplicates(df, keep=keep)
+    for n_jobs in [2, 3]:
+        pd.testing.assert_frame_equal(remove_duplicates(df, keep=keep, n_jobs=n_jobs), expected)
+
+@pytest.mark.parametrize("keep", ['first', 'last', False])
+def test_remove_duplicates_n_jobs_signed_zeros(keep):
+    """Test parallel deduplication of 0.0 and -0.0, which compare equal but have different bit patterns.
+    Expectation: The result should be identical to drop_duplicates."""
+    df = pd.DataFrame({'A': [0.0, -0.0, 1.0, 0.0, 2.0, -0.0], 'B': [1, 1, 1, 1, 1, 1]})
+    for n_jobs in [2, 3]:
+        pd.testing.assert_frame_equal(remove_duplicates(df, keep=keep, n_jobs=n_jobs), df.drop_duplicates(keep=keep))
+
+def test_remove_duplicates_n_jobs_print(capsys):
+    """Test that the parallel path prints the number of dropped rows.
+    Expectation: The same message as the single-threaded path."""
+    df = pd.DataFrame({'A': [1, 1, 1], 'B': [2, 2, 2]})
+    result = remove_duplicates(df, n_jobs=2)
+    pd.testing.assert_frame_equal(result.reset_index(drop=True), pd.DataFrame({'A': [1], 'B': [2]}))
+    assert "2 rows have been dropped." in capsys.readouterr().out
+
+def test_invalid_n_jobs_parameter():
+    """Test handling of invalid n_jobs parameter.
+    Expectation: Function should raise a ValueError if n_jobs is not a positive integer, -1 or None."""
+    df = pd.DataFrame({'A': [1, 2, 3], 'B': [4, 5, 6]})
+    for n_jobs in [0, -2, 1.5, 'all', True]:
+        with pytest.raises(ValueError, match="n_jobs must be a positive integer, -1 or None."):
+            remove_duplicates(df, n_jobs=n_jobs)
+
+def test_remove_duplicates_approximate_across_batches(capsys):
+    """Test approximate mode with a Bloom filter that persists across calls.
+    Expectation: Rows repeated within a batch or seen in an earlier batch are dropped, and the
+    printed message reports the estimated false positive rate alongside the dropped count."""
+    bloom = BloomFilter(capacity=1000, error_rate=0.001)
+    first = remove_duplicates(pd.DataFrame({'A': [1, 2, 2], 'B': [5, 6, 7]}), subset_columns=['A'],
+                              mode='approximate', bloom_filter=bloom)
+    pd.testing.assert_frame_equal(first.reset_index(drop=True), pd.DataFrame({'A': [1, 2], 'B': [5, 6]}))
+    assert "1 rows have been dropped. Estimated false positive rate:" in capsys.readouterr().out
+
+    second = remove_duplicates(pd.DataFrame({'A': [2, 3], 'B': [8, 9]}), subset_columns=['A'],
+                               mode='approximate', bloom_filter=bloom)
+    pd.testing.assert_frame_equal(second.reset_index(drop=True), pd.DataFrame({'A': [3], 'B': [9]}))
+    assert "1 rows have been dropped." in capsys.readouterr().out
+    assert len(bloom) == 3
+
+def test_remove_duplicates_approximate_across_dtypes():
+    """Test approximate mode across batches whose key column is int64, then float64 with a missing value.
+    Expectation: Numbers seen in the first batch are dropped from the second, and the NaN row is kept."""
+    bloom = BloomFilter(capacity=1000, error_rate=0.001)
+    remove_duplicates(pd.DataFrame({'A': [1, 2, 3]}), mode='approximate', bloom_filter=bloom)
+    second = remove_duplicates(pd.DataFrame({'A': [1.0, 2.0, np.nan, 4.5]}), mode='approximate', bloom_filter=bloom)
+    pd.testing.assert_frame_equal(second.reset_index(drop=True), pd.DataFrame({'A': [np.nan, 4.5]}))
+
+def test_remove_duplicates_approximate_without_filter():
+    """Test approximate mode without a filter.
+    Expectation: Behaves like keep='first' within the single DataFrame."""
+    data = {'A': list(range(1000)) * 2, 'B': list(range(2000))}
+    result = remove_duplicates(pd.DataFrame(data), subset_columns=['A'], mode='approximate')
+    assert len(result) <= 1000 and len(result) > 990
+
+def test_invalid_mode_parameters():
+    """Test handling of invalid mode and bloom_filter parameters.
+    Expectation: Function should raise a ValueError for an unknown mode, for keep other than 'first'
+    in approximate mode, and for a bloom_filter that is not a BloomFilter."""
+    df = pd.DataFrame({'A': [1, 2, 3], 'B': [4, 5, 6]})
+    with pytest.raises(ValueError, match="Invalid value for 'mode'"):
+        remove_duplicates(df, mode='fuzzy')
+    with pytest.raises(ValueError, match="only supports keep='first'"):
+        remove_duplicates(df, keep='last', mode='approximate')
+    with pytest.raises(ValueError, match="bloom_filter must be a BloomFilter"):
+        remove_duplicates(df, mode='approximate', bloom_filter=set())
+
+def test_remove_duplicates_persistent_across_runs(tmp_path, capsys):
+    """Test persistent mode with a key store file that is reopened between runs.
+    Expectation: Rows repeated within a batch or seen in an earlier run are dropped,
+    the same as removing duplicates from all the batches at once."""
+    batches = [pd.DataFrame({'A': [1, 2, 2], 'B': [5, 6, 7]}), pd.DataFrame({'A': [2, 3, 1, 4], 'B': [8, 9, 1, 2]})]
+    results = []
+    for batch in batches:
+        with SeenKeyStore(tmp_path / 'seen.sqlite') as store:
+            results.append(remove_duplicates(batch, subset_columns=['A'], mode='persistent', key_store=store))
+            store.commit()
+    assert capsys.readouterr().out == "1 rows have been dropped.\n2 rows have been dropped.\n"
+    expected = remove_duplicates(pd.concat(batches), subset_columns=['A'])
+    assert_frame_equal(pd.concat(results), expected)
+
+def test_remove_duplicates_persistent_commits_after_output(tmp_path):
+    """Test that the keys of a persistent run are only written by commit, and count as seen until then.
+    Expectation: A run that fails before committing delivers the same rows again when it is rerun,
+    and later batches of the same run drop the rows staged by earlier ones."""
+    first, second = pd.DataFrame({'A': [1, 2]}), pd.DataFrame({'A': [2, 3]})
+    with SeenKeyStore(tmp_path / 'seen.sqlite') as store:
+        remove_duplicates(first, mode='persistent', key_store=store)
+        assert_frame_equal(remove_duplicates(second, mode='persistent', key_store=store), second.iloc[[1]])
+        # The output is not persisted and the run stops here, without committing
+    with SeenKeyStore(tmp_path / 'seen.sqlite') as store:
+        assert len(store) == 0
+        assert_frame_equal(remove_duplicates(first, mode='persistent', key_store=store), first)
+        assert store.commit() == 2
+    with SeenKeyStore(tmp_path / 'seen.sqlite') as store:
+        assert_frame_equal(remove_duplicates(second, mode='persistent', key_store=store), second.iloc[[1]])
+
+def test_remove_duplicates_persistent_across_dtypes(tmp_path):
+    """Test persistent mode across runs whose key column is int64, then float64 with a missing value.
+    Expectation: Numbers committed in the first run are dropped from the second, and the NaN row is kept."""
+    with SeenKeyStore(tmp_path / 'seen.sqlite') as store:
+        remove_duplicates(pd.DataFrame({'A': [1, 2, 3]}), mode='persistent', key_store=store)
+        store.commit()
+    with SeenKeyStore(tmp_path / 'seen.sqlite') as store:
+        result = remove_duplicates(pd.DataFrame({'A': [1.0, 2.0, np.nan]}), mode='persistent', key_store=store)
+    assert_frame_equal(result.reset_index(drop=True), pd.DataFrame({'A': [np.nan]}))
+
+def test_invalid_persistent_parameters(tmp_path):
+    """Test handling of invalid persistent mode parameters.
+    Expectation: Function should raise a ValueError without a key_store, for keep other than 'first',
+    and for a key_store that is not a SeenKeyStore."""
+    df = pd.DataFrame({'A': [1, 2, 3], 'B': [4, 5, 6]})
+    with pytest.raises(ValueError, match="requires a key_store"):
+        remove_duplicates(df, mode='persistent')
+    with SeenKeyStore(tmp_path / 'seen.sqlite') as store:
+        with pytest.raises(ValueError, match="only supports keep='first'"):
+            remove_duplicates(df, keep=False, mode='persistent', key_store=store)
+    with pytest.raises(ValueError, match="key_store must be a SeenKeyStore"):
+        remove_duplicates(df, mode='persistent', key_store=str(tmp_path / 'seen.sqlite'))
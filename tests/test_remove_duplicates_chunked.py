@@ -0,0 +1,56 @@
+from wrangle_in_py.remove_duplicates import remove_duplicates_chunked
+import pytest
+import pandas as pd
+
+df = pd.DataFrame({'A': [1, 2, 2, 4, 1, 5, 4], 'B': [5, 6, 7, 8, 9, 10, 11]})
+chunks = [df.iloc[:3], df.iloc[3:5], df.iloc[5:]]
+
+@pytest.mark.parametrize("keep", ['first', 'last', False])
+def test_matches_drop_duplicates(keep, capsys):
+    """Test that deduplicating the chunks gives the same rows, in the same order, as drop_duplicates on the whole frame."""
+    result = pd.concat(remove_duplicates_chunked(chunks, subset_columns=['A'], keep=keep))
+    expected = df.drop_duplicates(subset=['A'], keep=keep)
+    pd.testing.assert_frame_equal(result, expected)
+
+    captured = capsys.readouterr()
+    assert f"{len(df) - len(expected)} rows have been dropped." in captured.out
+
+def test_all_columns_csv(tmp_path, capsys):
+    """Test that a csv file is read in chunks and fully identical rows are removed when subset_columns is None."""
+    path = tmp_path / "events.csv"
+    pd.DataFrame({'A': [1, 2, 2, 1], 'B': [5, 6, 6, 5]}).to_csv(path, index=False)
+    result = pd.concat(remove_duplicates_chunked(path, chunksize=1), ignore_index=True)
+    pd.testing.assert_frame_equal(result, pd.DataFrame({'A': [1, 2], 'B': [5, 6]}))
+    assert "2 rows have been dropped." in capsys.readouterr().out
+
+def test_duplicates_across_many_chunks(capsys):
+    """Test that the seen-set keeps working as it grows past its initial capacity."""
+    large = pd.DataFrame({'A': list(range(5000)) * 2, 'B': list(range(10000))})
+    large_chunks = [large.iloc[start:start + 999] for start in range(0, len(large), 999)]
+    result = pd.concat(remove_duplicates_chunked(large_chunks, subset_columns=['A']))
+    pd.testing.assert_frame_equal(result, large.iloc[:5000])
+
+def test_one_shot_iterator_two_pass():
+    """Test that keep='last' and keep=False reject a one-shot iterator, since they read the source twice."""
+    for keep in ['last', False]:
+        with pytest.raises(ValueError):
+            remove_duplicates_chunked(iter(chunks), subset_columns=['A'], keep=keep)
+
+def test_invalid_inputs():
+    """Test that an invalid keep parameter or subset column raises a ValueError."""
+    with pytest.raises(ValueError, match="Invalid value for 'keep'. Must be 'first', 'last', or False."):
+        remove_duplicates_chunked(chunks, keep='invalid_option')
+    with pytest.raises(ValueError, match="Some columns in subset_columns are not present in the DataFrame"):
+        list(remove_duplicates_chunked(chunks, subset_columns=['C']))
+
+@pytest.mark.parametrize("keep", ['first', 'last', False])
+def test_csv_chunks_with_different_dtypes(tmp_path, keep, capsys):
+    """Test that a key column read as int64 in one csv chunk and float64 in another (because of a missing value)
+    still matches across chunks, as it does when the whole file is read at once."""
+    path = tmp_path / "events.csv"
+    pd.DataFrame({'A': [1, 2, None, 1, 2**60], 'B': [5, 6, 7, 8, 9]}).to_csv(path, index=False)
+    result = pd.concat(remove_duplicates_chunked(path, subset_columns=['A'], keep=keep, chunksize=2),
+                       ignore_index=True)
+    expected = pd.read_csv(path).drop_duplicates(subset=['A'], keep=keep).reset_index(drop=True)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+    assert f"{5 - len(expected)} rows have been dropped." in capsys.readouterr().out
@@ -77,3 +77,27 @@ def test_error_wrong_type():
         resulting_duplicates(['mango'], 2025)
     with pytest.raises(TypeError):
         resulting_duplicates(False, True)
+
+def test_generators():
+    """
+    `resulting_duplicates` should accept any iterables of strings, including generators,
+    and report the duplicates in the order their standardized strings first appeared.
+    """
+    original = ['mango', 'Kiwi', 'KIWI', 'Mango', 'kiwi!']
+    standardized = (string.lower().rstrip('!') for string in original)
+    expected = {'mango': ['mango', 'Mango'], 'kiwi': ['Kiwi', 'KIWI', 'kiwi!']}
+    result = resulting_duplicates(iter(original), standardized)
+    assert result == expected
+    assert list(result) == ['mango', 'kiwi']
+
+def test_error_generator_lengths_and_types():
+    """
+    `resulting_duplicates` should raise a ValueError for generators of different lengths
+    and a TypeError for a non-string element found while reading the inputs.
+    """
+    with pytest.raises(ValueError, match="Both inputs must be of the same length."):
+        resulting_duplicates((s for s in ['a', 'b']), (s for s in ['a']))
+    with pytest.raises(TypeError):
+        resulting_duplicates(('a', 2025), ('a', '2025'))
+    with pytest.raises(TypeError):
+        resulting_duplicates(['a', 'b'], ['a', None])
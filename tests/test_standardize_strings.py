@@ -0,0 +1,68 @@
+import pytest
+import pandas as pd
+from wrangle_in_py.column_name_standardizer import standardize_strings, string_standardizer
+
+messy = ['Jack Fruit 88', 'PINEAPPLES', 'Dragon (Fruit)', 'Jack Fruit 88', 'Mango@Steen!', 'Ünï Cödé', '']
+
+# expected cases
+def test_list_matches_scalar():
+    """
+    `standardize_strings` should give the same output as calling
+    `string_standardizer` on every string, for ASCII and non-ASCII strings.
+    """
+    assert standardize_strings(messy) == [string_standardizer(string) for string in messy]
+
+def test_series_keeps_index_and_name():
+    """
+    `standardize_strings` should return a Series with the same index and name
+    as the input Series, standardizing each unique value once.
+    """
+    series = pd.Series(messy, index=range(10, 17), name='fruit')
+    result = standardize_strings(series)
+    assert result.tolist() == [string_standardizer(string) for string in messy]
+    assert result.index.equals(series.index)
+    assert result.name == 'fruit'
+
+def test_arrow_array():
+    """
+    `standardize_strings` should return a pyarrow array when given a pyarrow Array or ChunkedArray.
+    """
+    pa = pytest.importorskip("pyarrow")
+    expected = [string_standardizer(string) for string in messy]
+    assert standardize_strings(pa.array(messy)).to_pylist() == expected
+    assert standardize_strings(pa.chunked_array([messy[:3], messy[3:]])).to_pylist() == expected
+
+# edge cases
+def test_edge_case_missing_values():
+    """
+    `standardize_strings` should keep missing values missing.
+    """
+    result = standardize_strings(['PINEAPPLES', None, float('nan'), pd.NA])
+    assert result[0] == 'pineapples'
+    assert all(pd.isna(value) for value in result[1:])
+    assert standardize_strings(pd.Series(['PINEAPPLES', None])).isna().tolist() == [False, True]
+
+def test_edge_case_small_cache():
+    """
+    `standardize_strings` should give the same output when the cache is too small to hold every value.
+    """
+    assert standardize_strings(messy * 3, cache_size=1) == [string_standardizer(string) for string in messy * 3]
+
+def test_edge_case_generator():
+    """
+    `standardize_strings` should accept any iterable of strings and return a list.
+    """
+    assert standardize_strings(string for string in ['A B', 'c']) == ['a_b', 'c']
+
+# error cases
+def test_error_wrong_type():
+    """
+    `standardize_strings` should raise a TypeError if a non-missing value is not a string,
+    and a ValueError if cache_size is not a positive integer.
+    """
+    with pytest.raises(TypeError):
+        standardize_strings(['mango', 2025])
+    with pytest.raises(TypeError):
+        standardize_strings(pd.Series(['mango', 2025]))
+    with pytest.raises(ValueError):
+        standardize_strings(['mango'], cache_size=0)
@@ -0,0 +1,73 @@
+import pytest
+import pandas as pd
+import warnings
+from wrangle_in_py.value_standardizer import value_standardizer
+
+df = pd.DataFrame({
+    'fruit': ['Jack Fruit 88', 'PINE-APPLES', None, 'Jack Fruit 88'],
+    'colour': pd.Categorical(['Dark Red', 'YELLOW', 'Dark Red', None]),
+    'weight_g': [110, 100, 100, 105],
+})
+
+# expected cases
+def test_expected_cases():
+    """
+    `value_standardizer` should standardize the values of every string and category column,
+    keep missing values missing, and leave other columns unchanged.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        result = value_standardizer(df)
+    assert result['fruit'].tolist()[:2] == ['jack_fruit_88', 'pine_apples']
+    assert result['fruit'].isna().tolist() == [False, False, True, False]
+    assert result['colour'].dtype == 'category'
+    assert list(result['colour'].cat.categories) == ['dark_red', 'yellow']
+    assert result['colour'].isna().tolist() == [False, False, False, True]
+    pd.testing.assert_series_equal(result['weight_g'], df['weight_g'])
+    assert df['fruit'][0] == 'Jack Fruit 88', "The input dataframe should not be modified"
+
+def test_selected_columns():
+    """
+    `value_standardizer` should only standardize the chosen columns.
+    """
+    result = value_standardizer(df, columns=['colour'])
+    pd.testing.assert_series_equal(result['fruit'], df['fruit'])
+    assert list(result['colour'].cat.categories) == ['dark_red', 'yellow']
+
+# edge cases
+def test_warning_on_duplicates():
+    """
+    `value_standardizer` should raise a warning naming the column when different values
+    become the same, and merge colliding categories into one.
+    """
+    colliding = pd.DataFrame({
+        'fruit': ['mango!', 'Mango.', 'kiwi'],
+        'colour': pd.Categorical(['Red', 'red', 'RED']),
+    })
+    with pytest.warns(UserWarning, match="column 'fruit'"):
+        with pytest.warns(UserWarning, match="column 'colour'"):
+            result = value_standardizer(colliding)
+    assert result['fruit'].tolist() == ['mango_', 'mango_', 'kiwi']
+    assert list(result['colour'].cat.categories) == ['red']
+    assert result['colour'].tolist() == ['red', 'red', 'red']
+
+def test_edge_case_empty_dataframe():
+    """
+    `value_standardizer` should return an empty dataframe if the input is an empty dataframe.
+    """
+    assert value_standardizer(pd.DataFrame()).shape == (0, 0)
+    empty_category = pd.DataFrame({'colour': pd.Categorical([None, None])})
+    assert value_standardizer(empty_category)['colour'].isna().all()
+
+# error cases
+def test_error_wrong_type():
+    """
+    `value_standardizer` should raise a TypeError if the input is not a pandas DataFrame
+    or a chosen column holds non-string values, and a KeyError for a column that does not exist.
+    """
+    with pytest.raises(TypeError):
+        value_standardizer("Not a dataframe")
+    with pytest.raises(TypeError):
+        value_standardizer(df, columns=['weight_g'])
+    with pytest.raises(KeyError):
+        value_standardizer(df, columns=['price'])